@@ -3,6 +3,19 @@
 This repo includes a minimal, runnable implementation of the multi-step lead
 pipeline (scrape -> enrich -> qualify -> outreach) with optional LangGraph and
 CrewAI integration.
+
+Public names are resolved lazily (PEP 562) so that ``import autoleadgen`` and
+CLI commands like ``--help`` don't pay for pydantic, ``requests`` or the LLM
+clients until a code path actually needs them.
 """
 
-from .pipeline import LeadGenerationPipeline  # noqa: F401
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from ._lazy import lazy_module
+
+if TYPE_CHECKING:
+    from .pipeline import LeadGenerationPipeline  # noqa: F401
+
+__all__, __getattr__, __dir__ = lazy_module(__name__, {"LeadGenerationPipeline": ".pipeline"})
@@ -0,0 +1,33 @@
+"""Lazy (PEP 562) re-exports for package ``__init__`` modules."""
+
+from __future__ import annotations
+
+import sys
+from importlib import import_module
+from typing import Any, Callable
+
+
+def lazy_module(
+    name: str, mapping: dict[str, str]
+) -> tuple[list[str], Callable[[str], Any], Callable[[], list[str]]]:
+    """``__all__``, ``__getattr__`` and ``__dir__`` for package `name`.
+
+    `mapping` maps each public name to the relative module defining it; the
+    module is imported on first access and the value cached on the package::
+
+        __all__, __getattr__, __dir__ = lazy_module(__name__, {"GroqChat": ".groq"})
+    """
+    exported = sorted(mapping)
+
+    def __getattr__(attr: str) -> Any:
+        module = mapping.get(attr)
+        if module is None:
+            raise AttributeError(f"module {name!r} has no attribute {attr!r}")
+        value = getattr(import_module(module, name), attr)
+        setattr(sys.modules[name], attr, value)
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted(set(vars(sys.modules[name])) | set(exported))
+
+    return exported, __getattr__, __dir__
@@ -1,4 +1,21 @@
-from .scraper import ScraperAgent  # noqa: F401
-from .enrichment import EnrichmentAgent  # noqa: F401
-from .qualification import QualificationAgent  # noqa: F401
-from .outreach import OutreachAgent  # noqa: F401
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_module
+
+if TYPE_CHECKING:
+    from .enrichment import EnrichmentAgent  # noqa: F401
+    from .outreach import OutreachAgent  # noqa: F401
+    from .qualification import QualificationAgent  # noqa: F401
+    from .scraper import ScraperAgent  # noqa: F401
+
+__all__, __getattr__, __dir__ = lazy_module(
+    __name__,
+    {
+        "ScraperAgent": ".scraper",
+        "EnrichmentAgent": ".enrichment",
+        "QualificationAgent": ".qualification",
+        "OutreachAgent": ".outreach",
+    },
+)
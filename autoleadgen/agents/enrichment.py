@@ -1,24 +1,105 @@
 from __future__ import annotations
 
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, TypeVar
 
 from ..config import Settings
 from ..models import EnrichedLead, Lead
+from ..pagestore import open_page_store
+from ..routing import open_router
+from ..tools.browser import open_browser_pool
 from ..tools.firecrawl import enrich_lead_contact_info
+from ..tools import http
+from ..tools.http import SingleFlight
+
+if TYPE_CHECKING:
+    from ..deadline import Deadline
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+BUDGET_EXHAUSTED_NOTE = "Not enriched: time budget exhausted"
 
 
 @dataclass
 class EnrichmentAgent:
     settings: Settings
 
-    def enrich_batch(self, leads: list[Lead]) -> list[EnrichedLead]:
-        enriched: list[EnrichedLead] = []
+    def enrich_batch(
+        self,
+        leads: list[Lead],
+        stats: dict[str, Any] | None = None,
+        *,
+        deadline: Deadline | None = None,
+    ) -> list[EnrichedLead]:
+        """Enrich `leads` concurrently, in input order.
+
+        With a `deadline`, in-flight requests are cut short when it passes and
+        no new lead is started afterwards; those leads come back unenriched
+        with a note and are counted as `enrich_budget_skipped`.
+        """
+        # Leads sharing a page (duplicate listings, mock defaults) enriched at the
+        # same time trigger a single fetch; later ones are served by the store.
+        pages = SingleFlight()
+        store = open_page_store(self.settings) if any(lead.website for lead in leads) else None
+        router = open_router(self.settings)
+        browser = open_browser_pool(self.settings)
+        browser_before = browser.stats() if browser is not None else {}
+        skipped = 0
+        skipped_lock = threading.Lock()
 
-        for lead in leads:
+        def enrich_one(lead: Lead) -> EnrichedLead:
+            nonlocal skipped
             e = EnrichedLead(**lead.model_dump())
             # If website missing, keep as-is.
-            if e.website:
-                e = enrich_lead_contact_info(e, api_key=self.settings.firecrawl_api_key)
-            enriched.append(e)
+            if not e.website:
+                return e
+            if deadline is not None and deadline.expired():
+                with skipped_lock:
+                    skipped += 1
+                return e.model_copy(update={"enrichment_notes": BUDGET_EXHAUSTED_NOTE})
+            with http.deadline(deadline.at if deadline is not None else None):
+                return enrich_lead_contact_info(
+                    e,
+                    api_key=self.settings.firecrawl_api_key,
+                    pages=pages,
+                    store=store,
+                    router=router,
+                    browser=browser,
+                )
 
+        workers = min(max(1, self.settings.enrich_concurrency), len(leads))
+        if workers <= 1:
+            enriched = [enrich_one(lead) for lead in leads]
+        else:
+            depth = max(workers, self.settings.enrich_queue_depth or 4 * workers)
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="autoleadgen-enrich") as pool:
+                enriched = _bounded_map(pool, enrich_one, leads, depth)
+
+        if skipped and stats is not None:
+            stats["enrich_budget_skipped"] = stats.get("enrich_budget_skipped", 0) + skipped
+        if router is not None:
+            # summary() reads this run's latencies, which flush() hands off to the history.
+            if stats is not None:
+                stats.update(router.summary())
+            router.flush()
+        if browser is not None and stats is not None:
+            # The pool outlives the batch, so report this batch's share of its counters.
+            after = browser.stats()
+            stats.update({k: after[k] - browser_before[k] for k in after if after[k] != browser_before[k]})
         return enriched
+
+
+def _bounded_map(pool: ThreadPoolExecutor, fn: Callable[[T], R], items: list[T], depth: int) -> list[R]:
+    """`pool.map` in order, with at most `depth` items submitted but not yet collected."""
+    out: list[R] = []
+    pending: deque[Future[R]] = deque()
+    for item in items:
+        if len(pending) >= depth:
+            out.append(pending.popleft().result())
+        pending.append(pool.submit(fn, item))
+    out.extend(f.result() for f in pending)
+    return out
@@ -1,65 +1,121 @@
 from __future__ import annotations
 
 import json
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from itertools import takewhile
+from typing import TYPE_CHECKING, Iterable
 
 from ..config import Settings
 from ..models import OutreachMessage, QualifiedLead
-from ..llms import GroqChat
+
+if TYPE_CHECKING:
+    from ..deadline import Deadline
+    from ..llms import GroqChat
+    from ..templating import TemplateSet
+
+# Bump when the Groq prompt changes meaningfully.
+_PROMPT_VERSION = 1
 
 
 @dataclass
 class OutreachAgent:
     settings: Settings
 
-    def generate(self, leads: list[QualifiedLead]) -> list[OutreachMessage]:
-        use_groq = (self.settings.outreach_llm or "template").strip().lower() == "groq"
-        groq = None
-        if use_groq:
-            if not self.settings.groq_api_key:
-                raise RuntimeError("OUTREACH_LLM=groq requires GROQ_API_KEY to be set")
-            groq = GroqChat(api_key=self.settings.groq_api_key, model=self.settings.groq_model)
-
-        messages: list[OutreachMessage] = []
-        for lead in leads:
-            to_email = lead.email
-            if groq is None:
-                subject = f"Quick question for {lead.company_name}"
-                opener = (
-                    f"Hi{(' ' + lead.owner_name) if lead.owner_name else ''}," if lead.owner_name else "Hi there,"
-                )
-                body = (
-                    f"{opener}\n\n"
-                    f"I’m reaching out because we work with senior care providers to help them capture more local demand "
-                    f"(without adding admin overhead).\n\n"
-                    f"If it’s useful, I can share 2–3 quick ideas tailored to {lead.company_name}. "
-                    f"Would you be open to a 10-minute call this week?\n\n"
-                    f"Best,\nAutoLeadGen"
-                )
-            else:
-                system = (
-                    "You write concise, professional B2B cold emails. "
-                    "Return JSON only with keys: subject, body. The body must be plain text with line breaks. "
-                    "Do not include markdown."
-                )
-                user = (
-                    "Write a short outreach email to a senior care provider.\n"
-                    f"Company: {lead.company_name}\n"
-                    f"Owner/Contact name (optional): {lead.owner_name or ''}\n"
-                    f"Location: {lead.location or ''}\n"
-                    "Goal: ask for a 10-minute call this week.\n"
-                    "Tone: friendly, direct, respectful.\n"
-                )
-                raw = groq.complete(system=system, user=user, temperature=0.2)
-                try:
-                    parsed = json.loads(raw)
-                    subject = str(parsed.get("subject") or f"Quick question for {lead.company_name}").strip()
-                    body = str(parsed.get("body") or "").strip()
-                    if not body:
-                        raise ValueError("empty body")
-                except Exception:
-                    subject = f"Quick question for {lead.company_name}"
-                    body = raw.strip()[:4000]
-
-            messages.append(OutreachMessage(company_name=lead.company_name, to_email=to_email, subject=subject, body=body))
-        return messages
+    def generate(self, leads: list[QualifiedLead], *, deadline: Deadline | None = None) -> list[OutreachMessage]:
+        """One message per lead, in order.
+
+        Template rendering ignores `deadline` (it costs microseconds per lead).
+        LLM generation runs `settings.outreach_concurrency` requests at once
+        and stops once `deadline` passes, so the result may cover only a
+        prefix of `leads`.
+        """
+        if not self._use_groq():
+            return self._templates().render_many(leads)
+
+        if not self.settings.groq_api_key:
+            raise RuntimeError("OUTREACH_LLM=groq requires GROQ_API_KEY to be set")
+        from ..llms import GroqChat
+
+        groq = GroqChat(api_key=self.settings.groq_api_key, model=self.settings.groq_model)
+        contexts = self._retrieve_context(leads)
+
+        def write(lead: QualifiedLead, context: list[str]) -> OutreachMessage | None:
+            if deadline is not None and deadline.expired():
+                return None
+            return self._groq_message(groq, lead, context)
+
+        workers = min(max(1, self.settings.outreach_concurrency), len(leads))
+        if workers <= 1:
+            drafts: Iterable[OutreachMessage | None] = (write(l, c) for l, c in zip(leads, contexts))
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="autoleadgen-outreach") as pool:
+                drafts = list(pool.map(write, leads, contexts))
+        # Stop at the first lead the deadline cut off, so the result stays an in-order prefix.
+        return [m for m in takewhile(lambda m: m is not None, drafts) if m is not None]
+
+    def _groq_message(self, groq: GroqChat, lead: QualifiedLead, context: list[str]) -> OutreachMessage:
+        system = (
+            "You write concise, professional B2B cold emails. "
+            "Return JSON only with keys: subject, body. The body must be plain text with line breaks. "
+            "Do not include markdown."
+        )
+        user = (
+            "Write a short outreach email to a senior care provider.\n"
+            f"Company: {lead.company_name}\n"
+            f"Owner/Contact name (optional): {lead.owner_name or ''}\n"
+            f"Location: {lead.location or ''}\n"
+            "Goal: ask for a 10-minute call this week.\n"
+            "Tone: friendly, direct, respectful.\n"
+        )
+        if context:
+            user += "Relevant case studies (reference at most one, only if it fits):\n"
+            user += "".join(f"- {snippet}\n" for snippet in context)
+        raw = groq.complete(system=system, user=user, temperature=0.2)
+        try:
+            parsed = json.loads(raw)
+            subject = str(parsed.get("subject") or f"Quick question for {lead.company_name}").strip()
+            body = str(parsed.get("body") or "").strip()
+            if not body:
+                raise ValueError("empty body")
+        except Exception:
+            subject = f"Quick question for {lead.company_name}"
+            body = raw.strip()[:4000]
+
+        return OutreachMessage(company_name=lead.company_name, to_email=lead.email, subject=subject, body=body)
+
+    def version(self) -> str:
+        """Identifies what generated the copy; changes invalidate incremental results."""
+        if self._use_groq():
+            return f"groq-v{_PROMPT_VERSION}:{self.settings.groq_model}"
+        return f"template:{self.settings.outreach_vertical}:{self._templates().version}"
+
+    def _use_groq(self) -> bool:
+        return (self.settings.outreach_llm or "template").strip().lower() == "groq"
+
+    def _templates(self) -> TemplateSet:
+        from ..templating import DEFAULT_TEMPLATES_DIR, load_template_set
+
+        templates_dir = self.settings.outreach_templates_dir or DEFAULT_TEMPLATES_DIR
+        return load_template_set(templates_dir / self.settings.outreach_vertical)
+
+    def _retrieve_context(self, leads: list[QualifiedLead]) -> list[list[str]]:
+        """Top case-study snippets per lead from the local BM25 index (empty without CASE_STUDIES_DIR)."""
+        if not self.settings.case_studies_dir or not leads:
+            return [[] for _ in leads]
+        from ..pagestore import open_page_store
+        from ..retrieval import load_or_build_snippet_index
+
+        index = load_or_build_snippet_index(
+            self.settings.case_studies_dir, self.settings.index_dir / "case_studies"
+        )
+        store = open_page_store(self.settings)
+
+        def query(lead: QualifiedLead) -> str:
+            # The lead's own stored site text (no refetch) says most about what they do.
+            page = store.page_text(lead.website) if store is not None and lead.website else None
+            parts = [lead.company_name, lead.location, lead.qualification_reason, (page or "")[:2000]]
+            return " ".join(p for p in parts if p)
+
+        queries = [query(lead) for lead in leads]
+        return [[hit.text for hit in hits] for hits in index.search_batch(queries, k=self.settings.rag_top_k)]
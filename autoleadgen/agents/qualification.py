@@ -4,7 +4,7 @@ from dataclasses import dataclass
 
 from ..config import Settings
 from ..models import EnrichedLead, QualifiedLead
-from ..utils import score_lead
+from ..utils import SCORING_VERSION, score_lead
 
 
 @dataclass
@@ -13,3 +13,7 @@ class QualificationAgent:
 
     def qualify(self, leads: list[EnrichedLead]) -> list[QualifiedLead]:
         return [score_lead(l) for l in leads]
+
+    def version(self) -> str:
+        """Identifies the scoring logic; changes invalidate incremental results."""
+        return f"score-v{SCORING_VERSION}"
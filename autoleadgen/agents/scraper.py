@@ -12,6 +12,11 @@ class ScraperAgent:
     settings: Settings
 
     def discover_leads(self, *, query: str, location: str, limit: int) -> list[Lead]:
+        if (self.settings.lead_source or "yelp").strip().lower() == "synthetic":
+            from ..synthetic import generate_leads
+
+            return generate_leads(limit, seed=self.settings.synthetic_seed, location=location)
+
         leads = []
         try:
             leads = search_yelp_businesses(
@@ -0,0 +1,149 @@
+"""Memory-bounded bulk enrichment of lead CSV files.
+
+`enrich_csv` streams the input in fixed-size chunks, enriches each chunk
+concurrently via `EnrichmentAgent`, and appends the results to the output
+file before reading the next chunk, so memory stays flat regardless of file
+size. Every input row produces exactly one output row (rows that fail
+validation are passed through with a note), which lets a rerun resume after
+the last fully written row.
+"""
+
+from __future__ import annotations
+
+import csv
+import os
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator
+
+from pydantic import ValidationError
+
+from .agents import EnrichmentAgent
+from .config import Settings
+from .models import EnrichedLead
+
+
+FIELDNAMES: list[str] = list(EnrichedLead.model_fields)
+
+
+@dataclass(frozen=True)
+class BulkEnrichResult:
+    rows_resumed: int
+    rows_enriched: int
+    rows_invalid: int
+
+    @property
+    def rows_written(self) -> int:
+        return self.rows_resumed + self.rows_enriched + self.rows_invalid
+
+
+def enrich_csv(
+    input_path: Path,
+    output_path: Path,
+    *,
+    settings: Settings,
+    chunk_size: int = 500,
+    max_rows: int | None = None,
+    resume: bool = True,
+) -> BulkEnrichResult:
+    """Enrich `input_path` into `output_path`, `chunk_size` rows at a time.
+
+    With `resume`, rows already present in `output_path` are skipped in the
+    input (a trailing partially written row is discarded first); otherwise the
+    output is overwritten. `max_rows` caps the total number of input rows
+    considered, including resumed ones.
+    """
+    input_path, output_path = Path(input_path), Path(output_path)
+    done = _prepare_output(output_path) if resume else 0
+    if not resume or done == 0:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with output_path.open("w", newline="", encoding="utf-8") as f:
+            csv.DictWriter(f, fieldnames=FIELDNAMES).writeheader()
+
+    agent = EnrichmentAgent(settings)
+    enriched_count = invalid_count = 0
+
+    with input_path.open(newline="", encoding="utf-8") as src:
+        rows: Iterator[dict[str, Any]] = csv.DictReader(src)
+        if max_rows:
+            rows = islice(rows, max_rows)
+        rows = islice(rows, done, None)
+
+        with output_path.open("a", newline="", encoding="utf-8") as out:
+            writer = csv.DictWriter(out, fieldnames=FIELDNAMES, extrasaction="ignore")
+            for chunk in _chunks(rows, max(1, chunk_size)):
+                out_rows, invalid = _enrich_chunk(agent, chunk)
+                writer.writerows(out_rows)
+                out.flush()
+                os.fsync(out.fileno())
+                enriched_count += len(out_rows) - invalid
+                invalid_count += invalid
+
+    return BulkEnrichResult(rows_resumed=done, rows_enriched=enriched_count, rows_invalid=invalid_count)
+
+
+def _chunks(rows: Iterator[dict[str, Any]], size: int) -> Iterator[list[dict[str, Any]]]:
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+def _enrich_chunk(agent: EnrichmentAgent, chunk: list[dict[str, Any]]) -> tuple[list[dict[str, Any]], int]:
+    """Enrich the valid rows of `chunk`, keeping input order and row count."""
+    slots: list[dict[str, Any] | EnrichedLead] = []
+    leads: list[EnrichedLead] = []
+    for raw in chunk:
+        row = {k: (v if v != "" else None) for k, v in raw.items() if k}
+        try:
+            lead = EnrichedLead(**row)
+        except ValidationError as e:
+            row["enrichment_notes"] = f"invalid input row: {e.error_count()} validation error(s)"
+            slots.append(row)
+            continue
+        leads.append(lead)
+        slots.append(lead)
+
+    enriched = iter(agent.enrich_batch(leads))  # type: ignore[arg-type]
+    out = [next(enriched).model_dump() if isinstance(s, EnrichedLead) else s for s in slots]
+    return out, len(chunk) - len(leads)
+
+
+def _prepare_output(path: Path) -> int:
+    """Return the number of complete data rows in `path`, trimming a torn tail.
+
+    Quoted fields may span lines, so the file is parsed to find where the
+    last complete record ends rather than cut at its last line break.
+    """
+    if not path.exists() or path.stat().st_size == 0:
+        return 0
+
+    consumed = 0  # bytes handed to the parser so far
+    line_ended = True
+
+    def lines(f: BinaryIO) -> Iterator[str]:
+        nonlocal consumed, line_ended
+        for line in f:
+            consumed += len(line)
+            line_ended = line.endswith(b"\n")
+            yield line.decode("utf-8", errors="replace")
+
+    with path.open("rb+") as f:
+        reader = csv.reader(lines(f))
+        header = next(reader, None)
+        if header is None or not line_ended:
+            return 0  # not even a complete header: the caller starts over
+        if header != FIELDNAMES:
+            raise ValueError(f"{path} has unexpected columns; refusing to resume into it")
+
+        # Crash mid-write: drop everything after the last complete record.
+        complete_end, rows = consumed, 0
+        try:
+            for record in reader:
+                if not line_ended or len(record) != len(header):
+                    break
+                complete_end, rows = consumed, rows + 1
+        except csv.Error:
+            pass  # the file ends inside a quoted field
+        if complete_end != f.seek(0, os.SEEK_END):
+            f.truncate(complete_end)
+    return rows
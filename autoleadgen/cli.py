@@ -2,9 +2,16 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
+import sys
 from dataclasses import replace
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
-from .pipeline import LeadGenerationPipeline
+from .config import Settings, parse_host_limits
+
+if TYPE_CHECKING:
+    from .pipeline import LeadGenerationPipeline
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -13,6 +20,13 @@ def build_parser() -> argparse.ArgumentParser:
     p.add_argument("--location", default=None, help="Location (e.g. 'Los Angeles, CA')")
     p.add_argument("--limit", type=int, default=None, help="Max results")
 
+    p.add_argument(
+        "--source",
+        choices=["yelp", "synthetic"],
+        default=None,
+        help="Lead source; 'synthetic' generates --limit deterministic leads offline (or LEAD_SOURCE env var)",
+    )
+
     p.add_argument("--no-enrich", action="store_true", help="Skip enrichment")
     p.add_argument("--no-qualify", action="store_true", help="Skip qualification")
     p.add_argument("--no-outreach", action="store_true", help="Skip outreach generation")
@@ -29,8 +43,149 @@ def build_parser() -> argparse.ArgumentParser:
         default=None,
         help="Groq model to use when --outreach-llm groq (or GROQ_MODEL env var)",
     )
+    p.add_argument(
+        "--outreach-vertical",
+        default=None,
+        help="Template set for template outreach, e.g. senior_care, generic (or OUTREACH_VERTICAL env var)",
+    )
+    p.add_argument(
+        "--processes",
+        type=int,
+        default=None,
+        help="Shard enrichment/qualification/outreach across N processes (or PIPELINE_PROCESSES env var)",
+    )
+    p.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only re-score / regenerate outreach for leads that changed since the last run",
+    )
+    p.add_argument(
+        "--prioritize",
+        action="store_true",
+        help="Enrich and write outreach for the most promising leads first (useful with --deadline)",
+    )
+    p.add_argument(
+        "--suppress-contacted",
+        action="store_true",
+        help="Skip leads whose email, domain or phone was emailed within the cooldown (or SUPPRESS_CONTACTED)",
+    )
+    p.add_argument(
+        "--cooldown-days",
+        type=float,
+        default=None,
+        help="Suppression cooldown in days (or CONTACT_COOLDOWN_DAYS env var, default 90)",
+    )
+    p.add_argument(
+        "--import-contacted",
+        nargs="+",
+        default=None,
+        metavar="CSV",
+        help="Record the recipients of earlier outreach_*.csv files as contacted and exit",
+    )
+    p.add_argument(
+        "--deadline",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="Finish the run within this many seconds, skipping enrichment/outreach that doesn't fit (or RUN_DEADLINE_S)",
+    )
+    p.add_argument(
+        "--enrich-budget",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="Time budget for the enrichment stage (or ENRICH_BUDGET_S env var)",
+    )
+    p.add_argument(
+        "--outreach-budget",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="Time budget for outreach generation (or OUTREACH_BUDGET_S env var)",
+    )
+    p.add_argument(
+        "--jsonl",
+        default=None,
+        metavar="PATH",
+        help="Stream qualified leads and outreach messages as JSON Lines to PATH ('-' for stdout)",
+    )
+    p.add_argument(
+        "--jsonl-compress",
+        choices=["gzip", "zstd"],
+        default=None,
+        help="Compress --jsonl output (default: from the file suffix, .gz / .zst)",
+    )
+    p.add_argument("--no-csv", action="store_true", help="Don't write the CSV outputs under data/")
+    p.add_argument(
+        "--config",
+        default=None,
+        metavar="PATH",
+        help="TOML file of settings (or AUTOLEADGEN_CONFIG); env vars and flags override it",
+    )
+    p.add_argument("--dry-run", action="store_true", help="Print the effective execution plan and exit")
     p.add_argument("--crewai-smoke", action="store_true", help="Run CrewAI smoke test and exit")
     p.add_argument("--json", action="store_true", help="Print result summary as JSON")
+
+    tuning = p.add_argument_group("throughput tuning")
+    tuning.add_argument(
+        "--enrich-concurrency",
+        type=int,
+        default=None,
+        help="Concurrent site fetches per process (or ENRICH_CONCURRENCY env var)",
+    )
+    tuning.add_argument(
+        "--enrich-queue-depth",
+        type=int,
+        default=None,
+        help="Leads queued ahead of the enrich threads (or ENRICH_QUEUE_DEPTH; default 4x concurrency)",
+    )
+    tuning.add_argument(
+        "--outreach-concurrency",
+        type=int,
+        default=None,
+        help="Concurrent LLM requests for --outreach-llm groq (or OUTREACH_CONCURRENCY env var)",
+    )
+    tuning.add_argument(
+        "--host-concurrency",
+        type=int,
+        default=None,
+        help="Max in-flight requests per external host (or HOST_CONCURRENCY env var)",
+    )
+    tuning.add_argument(
+        "--host-limit",
+        action="append",
+        default=None,
+        metavar="HOST=N",
+        help="Max in-flight requests to HOST, e.g. api.firecrawl.dev=4; repeatable (or HOST_LIMITS env var)",
+    )
+    tuning.add_argument(
+        "--output-batch-size",
+        type=int,
+        default=None,
+        help="Records per --jsonl write and flush (or OUTPUT_BATCH_SIZE env var)",
+    )
+
+    worker = p.add_argument_group("worker mode")
+    worker.add_argument(
+        "--enqueue",
+        action="store_true",
+        help="Add a job (query/location/limit/stage flags) to the worker queue and exit",
+    )
+    worker.add_argument("--worker", action="store_true", help="Run a long-lived worker that processes queued jobs")
+    worker.add_argument("--drain", action="store_true", help="With --worker, exit once the queue is empty")
+    worker.add_argument("--queue", default=None, help="Job queue database (default: data/jobs.sqlite3)")
+    worker.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Jobs processed concurrently by --worker (or WORKER_CONCURRENCY env var, default 4)",
+    )
+    worker.add_argument(
+        "--rate-limit",
+        type=float,
+        default=None,
+        help="Global cap on outbound HTTP requests per second across all jobs (or RATE_LIMIT_PER_S env var)",
+    )
     return p
 
 
@@ -38,29 +193,132 @@ def main(argv: list[str] | None = None) -> int:
     parser = build_parser()
     args = parser.parse_args(argv)
 
-    pipeline = LeadGenerationPipeline.from_env()
+    # Deferred so `--help` and argument errors don't pay for the pipeline imports.
+    from .pipeline import LeadGenerationPipeline
+
+    pipeline = LeadGenerationPipeline.from_env(args.config)
     if args.no_langgraph:
         pipeline.settings = replace(pipeline.settings, use_langgraph=False)
 
+    if args.source is not None:
+        pipeline.settings = replace(pipeline.settings, lead_source=args.source)
+
     if args.outreach_llm is not None:
         pipeline.settings = replace(pipeline.settings, outreach_llm=args.outreach_llm)
 
     if args.groq_model is not None:
         pipeline.settings = replace(pipeline.settings, groq_model=args.groq_model)
 
+    if args.outreach_vertical is not None:
+        pipeline.settings = replace(pipeline.settings, outreach_vertical=args.outreach_vertical)
+
+    if args.processes is not None:
+        pipeline.settings = replace(pipeline.settings, processes=args.processes)
+
+    if args.incremental:
+        pipeline.settings = replace(pipeline.settings, incremental=True)
+
+    if args.prioritize:
+        pipeline.settings = replace(pipeline.settings, prioritize=True)
+
+    if args.suppress_contacted:
+        pipeline.settings = replace(pipeline.settings, suppress_contacted=True)
+
+    if args.cooldown_days is not None:
+        pipeline.settings = replace(pipeline.settings, contact_cooldown_days=args.cooldown_days)
+
+    if args.deadline is not None:
+        pipeline.settings = replace(pipeline.settings, run_deadline_s=args.deadline)
+
+    if args.enrich_budget is not None:
+        pipeline.settings = replace(pipeline.settings, enrich_budget_s=args.enrich_budget)
+
+    if args.outreach_budget is not None:
+        pipeline.settings = replace(pipeline.settings, outreach_budget_s=args.outreach_budget)
+
+    if args.enrich_concurrency is not None:
+        pipeline.settings = replace(pipeline.settings, enrich_concurrency=args.enrich_concurrency)
+
+    if args.enrich_queue_depth is not None:
+        pipeline.settings = replace(pipeline.settings, enrich_queue_depth=args.enrich_queue_depth)
+
+    if args.outreach_concurrency is not None:
+        pipeline.settings = replace(pipeline.settings, outreach_concurrency=args.outreach_concurrency)
+
+    if args.host_concurrency is not None:
+        pipeline.settings = replace(pipeline.settings, host_concurrency=args.host_concurrency)
+
+    if args.host_limit:
+        limits = dict(pipeline.settings.host_limits) | dict(parse_host_limits(",".join(args.host_limit)))
+        pipeline.settings = replace(pipeline.settings, host_limits=tuple(sorted(limits.items())))
+
+    if args.output_batch_size is not None:
+        pipeline.settings = replace(pipeline.settings, output_batch_size=args.output_batch_size)
+
+    if args.concurrency is not None:
+        pipeline.settings = replace(pipeline.settings, worker_concurrency=args.concurrency)
+
+    if args.rate_limit is not None:
+        pipeline.settings = replace(pipeline.settings, rate_limit_per_s=args.rate_limit)
+
+    if args.dry_run:
+        plan = pipeline.execution_plan(
+            limit=args.limit,
+            enrich=not args.no_enrich,
+            qualify=not args.no_qualify,
+            generate_campaigns=not args.no_outreach,
+            queue=_queue_path(args, pipeline.settings),
+        )
+        print(json.dumps(plan, indent=2) if args.json else _format_plan(plan))
+        return 0
+
     if args.crewai_smoke:
         print(pipeline.crewai_smoke_test())
         return 0
 
-    result = pipeline.execute(
-        query=args.query,
-        location=args.location,
-        limit=args.limit,
-        enrich=not args.no_enrich,
-        qualify=not args.no_qualify,
-        generate_campaigns=not args.no_outreach,
-    )
+    if args.import_contacted:
+        from .suppression import open_contact_history
+
+        index = open_contact_history(pipeline.settings)
+        for path in args.import_contacted:
+            print(f"{path}: {index.import_outreach_csv(Path(path))} contact keys recorded")
+        return 0
+
+    if args.enqueue or args.worker:
+        return _run_queue_command(args, pipeline)
+
+    from .tools import http
+
+    http.set_rate_limit(pipeline.settings.rate_limit_per_s)
+    sink = None
+    if args.jsonl:
+        from .sink import JsonlSink
 
+        sink = JsonlSink.open(
+            args.jsonl, compression=args.jsonl_compress, batch_size=pipeline.settings.output_batch_size
+        )
+    try:
+        result = pipeline.execute(
+            query=args.query,
+            location=args.location,
+            limit=args.limit,
+            enrich=not args.no_enrich,
+            qualify=not args.no_qualify,
+            generate_campaigns=not args.no_outreach,
+            sink=sink,
+            write_csv=not args.no_csv,
+        )
+    except BrokenPipeError:
+        # The reader went away (e.g. `--jsonl - | head`): stop quietly, like other Unix tools.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    finally:
+        if sink is not None:
+            sink.close()
+        pipeline.close()
+
+    # Keep stdout clean for the record stream when it goes there.
+    out = sys.stderr if args.jsonl == "-" else sys.stdout
     if args.json:
         print(
             json.dumps(
@@ -69,16 +327,75 @@ def main(argv: list[str] | None = None) -> int:
                     "enriched_leads": len(result.enriched_leads),
                     "qualified_leads": len(result.qualified_leads),
                     "outreach": len(result.outreach),
+                    **result.stats,
                 },
                 indent=2,
-            )
+            ),
+            file=out,
         )
     else:
-        print(f"Leads: {len(result.leads)}")
-        print(f"Enriched: {len(result.enriched_leads)}")
-        print(f"Qualified: {len(result.qualified_leads)}")
-        print(f"Outreach messages: {len(result.outreach)}")
+        print(f"Leads: {len(result.leads)}", file=out)
+        print(f"Enriched: {len(result.enriched_leads)}", file=out)
+        print(f"Qualified: {len(result.qualified_leads)}", file=out)
+        print(f"Outreach messages: {len(result.outreach)}", file=out)
+        for key, value in result.stats.items():
+            print(f"{key.replace('_', ' ').capitalize()}: {value}", file=out)
+
+    return 0
+
+
+def _format_plan(plan: dict[str, Any], indent: int = 0) -> str:
+    lines = []
+    for key, value in plan.items():
+        label = " " * indent + key.replace("_", " ")
+        if isinstance(value, dict) and value:
+            lines.append(f"{label}:")
+            lines.append(_format_plan(value, indent + 2))
+        else:
+            lines.append(f"{label}: {'-' if value is None or value == {} else value}")
+    return "\n".join(lines)
 
+
+def _queue_path(args: argparse.Namespace, settings: Settings) -> Path:
+    return Path(args.queue) if args.queue else settings.data_dir / "jobs.sqlite3"
+
+
+def _run_queue_command(args: argparse.Namespace, pipeline: LeadGenerationPipeline) -> int:
+    import signal
+
+    from .worker import JobQueue, Worker
+
+    queue = JobQueue(_queue_path(args, pipeline.settings), lease_s=pipeline.settings.job_lease_s)
+
+    if args.enqueue:
+        job_id = queue.enqueue(
+            query=args.query,
+            location=args.location,
+            limit=args.limit,
+            enrich=not args.no_enrich,
+            qualify=not args.no_qualify,
+            generate_campaigns=not args.no_outreach,
+        )
+        print(json.dumps({"job_id": job_id}) if args.json else f"Queued job {job_id}")
+        return 0
+
+    worker = Worker(
+        pipeline=pipeline,
+        queue=queue,
+        concurrency=pipeline.settings.worker_concurrency,
+        rate_limit_per_s=pipeline.settings.rate_limit_per_s,
+    )
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: worker.stop())
+
+    try:
+        processed = worker.run(drain=args.drain)
+    finally:
+        pipeline.close()
+    if args.json:
+        print(json.dumps({"processed": processed, "queue": queue.counts()}, indent=2))
+    else:
+        print(f"Processed jobs: {processed}")
     return 0
 
 
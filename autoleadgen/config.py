@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass
+import tomllib
+import types
+from dataclasses import dataclass, fields
 from pathlib import Path
+from typing import Any, Union, get_args, get_origin, get_type_hints
 
 
 @dataclass(frozen=True)
@@ -18,6 +21,18 @@ class Settings:
     groq_model: str = "llama-3.1-8b-instant"
     outreach_llm: str = "template"  # 'template' | 'groq'
 
+    # outreach templates: <outreach_templates_dir or bundled>/<outreach_vertical>/*.txt
+    outreach_vertical: str = "senior_care"
+    outreach_templates_dir: Path | None = None
+
+    # RAG: *.txt/*.md case studies retrieved into LLM outreach prompts
+    case_studies_dir: Path | None = None
+    rag_top_k: int = 2
+
+    # lead source: 'yelp' (mock leads without a key) | 'synthetic' (see autoleadgen.synthetic)
+    lead_source: str = "yelp"
+    synthetic_seed: int = 0
+
     # defaults
     default_query: str = "nursing home"
     default_location: str = "Los Angeles, CA"
@@ -25,6 +40,42 @@ class Settings:
 
     # execution
     use_langgraph: bool = True
+    processes: int = 1  # >1 shards CPU-heavy stages across a process pool
+    enrich_concurrency: int = 8  # concurrent site fetches per enrichment batch
+    incremental: bool = False  # reuse qualify/outreach output for unchanged leads
+    prioritize: bool = False  # enrich/outreach most promising leads first (see autoleadgen.scheduling)
+
+    # skip leads already emailed within the cooldown (see autoleadgen.suppression)
+    suppress_contacted: bool = False
+    contact_cooldown_days: float = 90.0
+
+    # throughput tuning (see `autoleadgen --dry-run` for the resulting plan)
+    outreach_concurrency: int = 1  # concurrent LLM requests during outreach generation
+    enrich_queue_depth: int | None = None  # leads queued ahead of the enrich threads; None = 4 x enrich_concurrency
+    worker_concurrency: int = 4  # jobs processed at once by --worker
+    job_lease_s: float = 600.0  # a running job whose worker stops renewing it is requeued after this long
+    rate_limit_per_s: float | None = None  # process-wide cap on outbound HTTP requests
+    host_concurrency: int | None = None  # in-flight requests per external host; None = unlimited
+    host_limits: tuple[tuple[str, int], ...] = ()  # per-host overrides of host_concurrency
+    output_batch_size: int = 1000  # records per JSONL write/flush
+
+    # time limits in seconds (see autoleadgen.deadline); None = unbounded
+    run_deadline_s: float | None = None
+    enrich_budget_s: float | None = None
+    outreach_budget_s: float | None = None
+
+    # enrichment routing: try plain fetch before Firecrawl on likely-static domains
+    enrich_routing: bool = True
+    firecrawl_cost_usd: float = 0.005  # per scrape, for reporting savings
+
+    # headless browser for JavaScript-rendered sites (see autoleadgen.tools.browser)
+    use_browser: bool = True
+    browser_concurrency: int = 2  # reusable browser contexts / pages rendered at once
+    browser_page_budget_s: float = 15.0  # navigation-to-HTML budget per page
+
+    # scraped page cache (see autoleadgen.pagestore)
+    use_page_store: bool = True
+    page_ttl_s: int = 86400  # serve stored pages without revalidation for this long
 
     # IO
     project_root: Path = Path(__file__).resolve().parents[1]
@@ -33,15 +84,111 @@ class Settings:
     def data_dir(self) -> Path:
         return self.project_root / "data"
 
+    @property
+    def pages_dir(self) -> Path:
+        return self.data_dir / "pages"
+
+    @property
+    def index_dir(self) -> Path:
+        return self.data_dir / "index"
+
     @property
     def logs_dir(self) -> Path:
         return self.project_root / "logs"
 
 
-def load_settings() -> Settings:
-    """Load settings from environment.
+def parse_host_limits(raw: str | dict[str, Any] | None) -> tuple[tuple[str, int], ...]:
+    """``"api.firecrawl.dev=4,api.groq.com=2"`` (or a mapping) as sorted (host, limit) pairs."""
+    if not raw:
+        return ()
+    source = raw
+    if isinstance(raw, str):
+        pairs = [part.split("=", 1) for part in raw.split(",") if part.strip()]
+        if any(len(p) != 2 for p in pairs):
+            raise ValueError(f"Host limits must look like 'host=N,host=N', got {source!r}")
+        raw = {host: limit for host, limit in pairs}
+    limits = []
+    for host, limit in raw.items():
+        try:
+            if isinstance(limit, bool):
+                raise ValueError
+            limits.append((host.strip().lower(), int(limit)))
+        except (TypeError, ValueError):
+            raise ValueError(
+                f"Host limit for {host.strip()!r} must be an integer, got {limit!r} in {source!r}"
+            ) from None
+    return tuple(sorted(limits))
+
+
+def _coerce(key: str, value: Any, hint: Any) -> Any:
+    """`value` (as read from TOML) as a value of the `Settings` field type `hint`."""
+    options = get_args(hint) if get_origin(hint) in (Union, types.UnionType) else (hint,)
+    for option in options:
+        if option is type(None):
+            continue
+        if option is bool and isinstance(value, bool):
+            return value
+        if isinstance(value, bool):
+            continue  # bool is an int subclass, but `processes = true` is a mistake
+        if option is int and isinstance(value, int):
+            return value
+        if option is float and isinstance(value, (int, float)):
+            return float(value)
+        if option is str and isinstance(value, str):
+            return value
+        if option is Path and isinstance(value, str):
+            return Path(value)
+    expected = " or ".join(getattr(o, "__name__", str(o)) for o in options if o is not type(None))
+    raise ValueError(f"Setting {key!r} must be {expected}, got {type(value).__name__} {value!r}")
+
+
+def load_config_file(path: str | Path) -> dict[str, Any]:
+    """Settings overrides from a TOML file.
+
+    Keys are `Settings` field names, at the top level or inside any table
+    (``[execution]``, ``[outreach]``... are just for grouping)::
+
+        [execution]
+        processes = 4
+        enrich_concurrency = 32
+        host_limits = { "api.firecrawl.dev" = 4 }
+
+    Each value must match its field's type (``processes = "4"`` is an error,
+    ``contact_cooldown_days = 30`` is fine); the ValueError names the key.
+    """
+    with Path(path).open("rb") as f:
+        data = tomllib.load(f)
+    flat: dict[str, Any] = {}
+    for key, value in data.items():
+        if isinstance(value, dict) and key != "host_limits":
+            flat.update(value)
+        else:
+            flat[key] = value
+
+    known = {f.name for f in fields(Settings)}
+    unknown = sorted(set(flat) - known)
+    if unknown:
+        raise ValueError(f"Unknown setting(s) in {path}: {', '.join(unknown)}")
+    hints = get_type_hints(Settings)
+    for key, value in flat.items():
+        try:
+            if key == "host_limits":
+                if not isinstance(value, dict):
+                    raise ValueError(f"Setting 'host_limits' must be a table of host = N, got {value!r}")
+                flat[key] = parse_host_limits(value)
+            else:
+                flat[key] = _coerce(key, value, hints[key])
+        except ValueError as e:
+            raise ValueError(f"{e} in {path}") from None
+    return flat
+
+
+def load_settings(config_path: str | Path | None = None) -> Settings:
+    """Load settings from a config file and the environment.
 
-    If python-dotenv is installed, this will also load a .env file from the
+    Values come from `config_path` (or ``AUTOLEADGEN_CONFIG``) when given, see
+    `load_config_file`; environment variables override the file. If
+    python-dotenv is installed, this will also load a .env file from the
     project root when present.
     """
     try:
@@ -67,16 +214,83 @@ def load_settings() -> Settings:
         except ValueError:
             return default
 
+    def _get_float(name: str, default: float) -> float:
+        raw = os.getenv(name)
+        if raw is None:
+            return default
+        try:
+            return float(raw)
+        except ValueError:
+            return default
+
+    def _get_optional_float(name: str, default: float | None = None) -> float | None:
+        raw = os.getenv(name)
+        if not raw:
+            return default
+        try:
+            return float(raw)
+        except ValueError:
+            return default
+
+    def _get_optional_int(name: str, default: int | None = None) -> int | None:
+        raw = os.getenv(name)
+        if not raw:
+            return default
+        try:
+            return int(raw)
+        except ValueError:
+            return default
+
+    def _get_host_limits(name: str, default: tuple[tuple[str, int], ...]) -> tuple[tuple[str, int], ...]:
+        try:
+            return parse_host_limits(os.getenv(name)) or default
+        except ValueError:
+            return default
+
+    config_path = config_path or os.getenv("AUTOLEADGEN_CONFIG")
+    base = Settings(**load_config_file(config_path)) if config_path else Settings()
+
     return Settings(
-        yelp_api_key=os.getenv("YELP_API_KEY"),
-        firecrawl_api_key=os.getenv("FIRECRAWL_API_KEY"),
-        anthropic_api_key=os.getenv("ANTHROPIC_API_KEY"),
-        openai_api_key=os.getenv("OPENAI_API_KEY"),
-        groq_api_key=os.getenv("GROQ_API_KEY"),
-        groq_model=os.getenv("GROQ_MODEL", "llama-3.1-8b-instant"),
-        outreach_llm=os.getenv("OUTREACH_LLM", "template"),
-        default_query=os.getenv("DEFAULT_QUERY", "nursing home"),
-        default_location=os.getenv("DEFAULT_LOCATION", "Los Angeles, CA"),
-        default_limit=_get_int("DEFAULT_LIMIT", 25),
-        use_langgraph=_get_bool("USE_LANGGRAPH", True),
+        yelp_api_key=os.getenv("YELP_API_KEY") or base.yelp_api_key,
+        firecrawl_api_key=os.getenv("FIRECRAWL_API_KEY") or base.firecrawl_api_key,
+        anthropic_api_key=os.getenv("ANTHROPIC_API_KEY") or base.anthropic_api_key,
+        openai_api_key=os.getenv("OPENAI_API_KEY") or base.openai_api_key,
+        groq_api_key=os.getenv("GROQ_API_KEY") or base.groq_api_key,
+        groq_model=os.getenv("GROQ_MODEL", base.groq_model),
+        outreach_llm=os.getenv("OUTREACH_LLM", base.outreach_llm),
+        outreach_vertical=os.getenv("OUTREACH_VERTICAL", base.outreach_vertical),
+        outreach_templates_dir=Path(os.environ["OUTREACH_TEMPLATES_DIR"]) if os.getenv("OUTREACH_TEMPLATES_DIR") else base.outreach_templates_dir,
+        case_studies_dir=Path(os.environ["CASE_STUDIES_DIR"]) if os.getenv("CASE_STUDIES_DIR") else base.case_studies_dir,
+        rag_top_k=_get_int("RAG_TOP_K", base.rag_top_k),
+        lead_source=os.getenv("LEAD_SOURCE", base.lead_source),
+        synthetic_seed=_get_int("SYNTHETIC_SEED", base.synthetic_seed),
+        default_query=os.getenv("DEFAULT_QUERY", base.default_query),
+        default_location=os.getenv("DEFAULT_LOCATION", base.default_location),
+        default_limit=_get_int("DEFAULT_LIMIT", base.default_limit),
+        use_langgraph=_get_bool("USE_LANGGRAPH", base.use_langgraph),
+        processes=_get_int("PIPELINE_PROCESSES", base.processes),
+        enrich_concurrency=_get_int("ENRICH_CONCURRENCY", base.enrich_concurrency),
+        incremental=_get_bool("INCREMENTAL", base.incremental),
+        prioritize=_get_bool("PRIORITIZE", base.prioritize),
+        suppress_contacted=_get_bool("SUPPRESS_CONTACTED", base.suppress_contacted),
+        contact_cooldown_days=_get_float("CONTACT_COOLDOWN_DAYS", base.contact_cooldown_days),
+        run_deadline_s=_get_optional_float("RUN_DEADLINE_S", base.run_deadline_s),
+        enrich_budget_s=_get_optional_float("ENRICH_BUDGET_S", base.enrich_budget_s),
+        outreach_budget_s=_get_optional_float("OUTREACH_BUDGET_S", base.outreach_budget_s),
+        enrich_routing=_get_bool("ENRICH_ROUTING", base.enrich_routing),
+        firecrawl_cost_usd=_get_float("FIRECRAWL_COST_USD", base.firecrawl_cost_usd),
+        use_browser=_get_bool("USE_BROWSER", base.use_browser),
+        browser_concurrency=_get_int("BROWSER_CONCURRENCY", base.browser_concurrency),
+        browser_page_budget_s=_get_float("BROWSER_PAGE_BUDGET_S", base.browser_page_budget_s),
+        use_page_store=_get_bool("USE_PAGE_STORE", base.use_page_store),
+        page_ttl_s=_get_int("PAGE_TTL_S", base.page_ttl_s),
+        outreach_concurrency=_get_int("OUTREACH_CONCURRENCY", base.outreach_concurrency),
+        enrich_queue_depth=_get_optional_int("ENRICH_QUEUE_DEPTH", base.enrich_queue_depth),
+        worker_concurrency=_get_int("WORKER_CONCURRENCY", base.worker_concurrency),
+        job_lease_s=_get_float("JOB_LEASE_S", base.job_lease_s),
+        rate_limit_per_s=_get_optional_float("RATE_LIMIT_PER_S", base.rate_limit_per_s),
+        host_concurrency=_get_optional_int("HOST_CONCURRENCY", base.host_concurrency),
+        host_limits=_get_host_limits("HOST_LIMITS", base.host_limits),
+        output_batch_size=_get_int("OUTPUT_BATCH_SIZE", base.output_batch_size),
+        project_root=base.project_root,
     )
@@ -0,0 +1,61 @@
+"""Run-level deadline and per-stage time budgets.
+
+A run gets an overall `deadline_s`; the slow, per-lead stages (``enrich``,
+``outreach``) can additionally get a budget that starts when the stage does.
+A stage runs until the earlier of the two. Enrichment stops starting new
+fetches once it expires and passes the remaining leads through with a note;
+outreach stops calling the LLM and leaves the remaining leads without a
+message. Scraping and qualification always run to completion.
+
+Deadlines are wall-clock timestamps (not monotonic), so they mean the same
+thing inside sharded worker processes.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Mapping
+
+
+BUDGETED_STAGES = ("enrich", "outreach")
+
+
+@dataclass(frozen=True)
+class Deadline:
+    at: float  # epoch seconds
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        return cls(time.time() + seconds)
+
+    def remaining(self) -> float:
+        return self.at - time.time()
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+
+def earliest(*deadlines: Deadline | None) -> Deadline | None:
+    present = [d for d in deadlines if d is not None]
+    return min(present, key=lambda d: d.at) if present else None
+
+
+@dataclass(frozen=True)
+class RunBudget:
+    deadline: Deadline | None = None
+    stage_budgets_s: Mapping[str, float] = field(default_factory=dict)
+
+    @classmethod
+    def start(cls, deadline_s: float | None, stage_budgets_s: Mapping[str, float] | None = None) -> "RunBudget":
+        """Start the run clock now."""
+        budgets = dict(stage_budgets_s or {})
+        unknown = set(budgets) - set(BUDGETED_STAGES)
+        if unknown:
+            raise ValueError(f"Stage budgets are supported for {', '.join(BUDGETED_STAGES)}; got {sorted(unknown)}")
+        return cls(Deadline.after(deadline_s) if deadline_s is not None else None, budgets)
+
+    def for_stage(self, stage: str) -> Deadline | None:
+        """Deadline for `stage`, starting its budget now; None when unbounded."""
+        budget = self.stage_budgets_s.get(stage)
+        return earliest(self.deadline, Deadline.after(budget) if budget is not None else None)
@@ -0,0 +1,144 @@
+"""Incremental qualification/outreach for repeatedly processed leads.
+
+Each lead's stage input is fingerprinted (SHA-256 of the stage version plus
+the lead's JSON). Outputs are remembered per lead in
+``<data_dir>/incremental.sqlite3``; on the next run a lead whose fingerprint
+is unchanged reuses its stored output instead of being re-scored or getting a
+new outreach message. Bumping `utils.SCORING_VERSION`, editing a template file
+or changing the outreach LLM/model changes the version and so invalidates
+every stored output of that stage.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Iterator, Sequence
+
+from pydantic import BaseModel
+
+from .config import Settings
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stage_outputs (
+    stage TEXT NOT NULL,
+    lead_key TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    output TEXT NOT NULL,
+    PRIMARY KEY (stage, lead_key)
+) WITHOUT ROWID;
+"""
+_BATCH = 500
+
+
+def lead_key(lead: Any) -> str:
+    """Stable identity of a lead across runs (same normalization as dedupe)."""
+    return f"{(lead.company_name or '').strip().lower()}|{(lead.phone or '').strip()}"
+
+
+def fingerprint(version: str, item: BaseModel) -> str:
+    h = hashlib.sha256(version.encode("utf-8"))
+    h.update(b"\0")
+    h.update(item.model_dump_json().encode("utf-8"))
+    return h.hexdigest()
+
+
+@dataclass(frozen=True)
+class StageRun:
+    outputs: list[Any]
+    skipped: int
+
+
+class IncrementalCache:
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+        finally:
+            conn.close()
+
+    def run(
+        self,
+        stage: str,
+        version: str,
+        items: Sequence[BaseModel],
+        compute: Callable[[list[Any]], list[Any]],
+        output_model: type[BaseModel],
+    ) -> StageRun:
+        """Return outputs for `items` in order, calling `compute` only for changed ones.
+
+        `compute` may return fewer outputs than it was given (a stage cut short
+        by its time budget): outputs for a prefix of its input, in order. Items
+        it didn't reach are left out of the result and not cached.
+        """
+        keys = [lead_key(item) for item in items]
+        prints = [fingerprint(version, item) for item in items]
+        stored = self._lookup(stage, keys)
+
+        outputs: list[Any] = [None] * len(items)
+        misses: list[int] = []
+        seen: set[str] = set()
+        for i, (key, fp) in enumerate(zip(keys, prints)):
+            hit = stored.get(key)
+            # Two inputs sharing a key in one run (no dedupe) can't both be served from one row.
+            if hit is not None and hit[0] == fp and key not in seen:
+                outputs[i] = output_model.model_validate_json(hit[1])
+            else:
+                misses.append(i)
+            seen.add(key)
+
+        if misses:
+            computed = compute([items[i] for i in misses])
+            rows = []
+            for i, out in zip(misses, computed):
+                # Never cache one lead's output under another's key: stop at the
+                # first output that isn't for the input in its position.
+                if out.company_name != items[i].company_name:
+                    break
+                outputs[i] = out
+                rows.append((stage, keys[i], prints[i], out.model_dump_json()))
+            with self._connect() as conn:
+                conn.execute("BEGIN")
+                conn.executemany(
+                    "INSERT OR REPLACE INTO stage_outputs (stage, lead_key, fingerprint, output) VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+                conn.execute("COMMIT")
+
+        return StageRun(outputs=[o for o in outputs if o is not None], skipped=len(items) - len(misses))
+
+    def _lookup(self, stage: str, keys: list[str]) -> dict[str, tuple[str, str]]:
+        found: dict[str, tuple[str, str]] = {}
+        unique = list(dict.fromkeys(keys))
+        with self._connect() as conn:
+            for start in range(0, len(unique), _BATCH):
+                batch = unique[start : start + _BATCH]
+                marks = ",".join("?" * len(batch))
+                for key, fp, output in conn.execute(
+                    f"SELECT lead_key, fingerprint, output FROM stage_outputs WHERE stage = ? AND lead_key IN ({marks})",
+                    (stage, *batch),
+                ):
+                    found[key] = (fp, output)
+        return found
+
+
+@lru_cache(maxsize=None)
+def _open(path: Path) -> IncrementalCache:
+    return IncrementalCache(path)
+
+
+def open_incremental_cache(settings: Settings) -> IncrementalCache:
+    return _open(settings.data_dir / "incremental.sqlite3")
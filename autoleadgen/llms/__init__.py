@@ -1,3 +1,10 @@
-from .groq import GroqChat
+from __future__ import annotations
 
-__all__ = ["GroqChat"]
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_module
+
+if TYPE_CHECKING:
+    from .groq import GroqChat  # noqa: F401
+
+__all__, __getattr__, __dir__ = lazy_module(__name__, {"GroqChat": ".groq"})
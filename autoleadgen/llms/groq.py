@@ -3,7 +3,7 @@ from __future__ import annotations
 import json
 from dataclasses import dataclass
 
-import requests
+from ..tools import http
 
 
 @dataclass(frozen=True)
@@ -28,7 +28,7 @@ class GroqChat:
             "Content-Type": "application/json",
         }
 
-        resp = requests.post(self.base_url, headers=headers, json=payload, timeout=self.timeout_s)
+        resp = http.post(self.base_url, headers=headers, json=payload, timeout=self.timeout_s)
         resp.raise_for_status()
         data = resp.json()
 
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-from typing import Literal
+from typing import Any, Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_serializer
 
 
 class Lead(BaseModel):
@@ -40,7 +40,24 @@ class OutreachMessage(BaseModel):
 
 
 class PipelineResult(BaseModel):
+    """A run's output at each stage.
+
+    `leads` are the scraped leads as found (before dedupe and suppression);
+    the later lists hold the deduplicated leads, so lead data is still kept
+    twice: once raw in `leads` and once in the enriched/qualified objects.
+    `enriched_leads` is filled with the qualified leads themselves (a
+    QualifiedLead is an EnrichedLead) rather than a third copy; it still
+    serializes with only the EnrichedLead fields.
+    """
+
     leads: list[Lead]
     enriched_leads: list[EnrichedLead]
     qualified_leads: list[QualifiedLead]
     outreach: list[OutreachMessage]
+    # Run counters, e.g. qualify_skipped / outreach_skipped for incremental runs.
+    stats: dict[str, Any] = Field(default_factory=dict)
+
+    @field_serializer("enriched_leads")
+    def _dump_enriched(self, leads: list[EnrichedLead]) -> list[dict[str, Any]]:
+        fields = set(EnrichedLead.model_fields)
+        return [lead.model_dump(include=fields) for lead in leads]
@@ -0,0 +1,156 @@
+"""Content-addressed store for scraped pages.
+
+Enrichment used to fetch a site, regex out emails and throw the text away,
+so every later consumer had to fetch it again. `PageStore` keeps it instead:
+
+- ``pages.sqlite3`` maps a key (the URL, ``firecrawl:<url>`` for Firecrawl
+  responses or ``rendered:<url>`` for headless-browser HTML) to the SHA-256
+  of its content plus fetch time, ETag and Last-Modified.
+- ``blobs/<hh>/<sha256>.z`` holds the zlib-compressed content, written once
+  per distinct content no matter how many URLs serve it.
+
+Reads within `ttl_s` of the last fetch need no network at all; older entries
+are revalidated with If-None-Match / If-Modified-Since, so an unchanged page
+costs a 304 instead of a full download (see `tools.firecrawl._simple_fetch`).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import time
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator
+
+from .config import Settings
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    key TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    etag TEXT,
+    last_modified TEXT
+);
+"""
+
+_TAG_RE = re.compile(r"<(script|style)\b.*?</\1\s*>|<[^>]+>", re.IGNORECASE | re.DOTALL)
+_SPACE_RE = re.compile(r"\s+")
+
+
+@dataclass(frozen=True)
+class StoredPage:
+    key: str
+    content_hash: str
+    fetched_at: float
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def age_s(self, now: float | None = None) -> float:
+        return (now if now is not None else time.time()) - self.fetched_at
+
+
+class PageStore:
+    def __init__(self, root: Path, *, ttl_s: float = 86400.0) -> None:
+        self.root = Path(root)
+        self.ttl_s = ttl_s
+        (self.root / "blobs").mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.root / "pages.sqlite3", timeout=30, isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+        finally:
+            conn.close()
+
+    def _blob_path(self, content_hash: str) -> Path:
+        return self.root / "blobs" / content_hash[:2] / f"{content_hash}.z"
+
+    def get(self, key: str) -> StoredPage | None:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT key, content_hash, fetched_at, etag, last_modified FROM pages WHERE key = ?", (key,)
+            ).fetchone()
+        return StoredPage(*row) if row is not None else None
+
+    def is_fresh(self, page: StoredPage) -> bool:
+        return page.age_s() < self.ttl_s
+
+    def read_text(self, page: StoredPage) -> str | None:
+        try:
+            return zlib.decompress(self._blob_path(page.content_hash).read_bytes()).decode("utf-8")
+        except (OSError, zlib.error):
+            return None
+
+    def get_text(self, key: str) -> str | None:
+        page = self.get(key)
+        return self.read_text(page) if page is not None else None
+
+    def page_text(self, url: str) -> str | None:
+        """Readable text for `url`: Firecrawl markdown if stored, else tag-stripped (rendered) HTML."""
+        raw = self.get_text(f"firecrawl:{url}")
+        if raw is not None:
+            markdown = (json.loads(raw).get("data") or {}).get("markdown")
+            if markdown:
+                return markdown
+        html = self.get_text(f"rendered:{url}") or self.get_text(url)
+        if html is None:
+            return None
+        return _SPACE_RE.sub(" ", _TAG_RE.sub(" ", html)).strip()
+
+    def put(
+        self,
+        key: str,
+        text: str,
+        *,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> StoredPage:
+        data = text.encode("utf-8")
+        content_hash = hashlib.sha256(data).hexdigest()
+        blob = self._blob_path(content_hash)
+        if not blob.exists():
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=blob.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(zlib.compress(data, 6))
+            os.replace(tmp, blob)
+
+        page = StoredPage(key, content_hash, time.time(), etag, last_modified)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO pages (key, content_hash, fetched_at, etag, last_modified)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (page.key, page.content_hash, page.fetched_at, page.etag, page.last_modified),
+            )
+        return page
+
+    def touch(self, key: str) -> None:
+        """Record a successful revalidation (HTTP 304) without rewriting content."""
+        with self._connect() as conn:
+            conn.execute("UPDATE pages SET fetched_at = ? WHERE key = ?", (time.time(), key))
+
+
+@lru_cache(maxsize=None)
+def _open(root: Path, ttl_s: float) -> PageStore:
+    return PageStore(root, ttl_s=ttl_s)
+
+
+def open_page_store(settings: Settings) -> PageStore | None:
+    """The page store configured by `settings`, shared per process; None when disabled."""
+    if not settings.use_page_store:
+        return None
+    return _open(settings.pages_dir, float(settings.page_ttl_s))
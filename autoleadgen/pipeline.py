@@ -1,33 +1,56 @@
 from __future__ import annotations
 
 import csv
-from dataclasses import dataclass
+import operator
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import Any, TypedDict
+from typing import TYPE_CHECKING, Annotated, Any, Callable, Mapping, Sequence, TypedDict
+
+from pydantic import BaseModel
 
 from .agents import EnrichmentAgent, OutreachAgent, QualificationAgent, ScraperAgent
 from .config import Settings, load_settings
-from .models import EnrichedLead, Lead, PipelineResult, QualifiedLead
-from .utils import dedupe_by_company_and_phone
+from .deadline import Deadline, RunBudget
+from .models import EnrichedLead, Lead, OutreachMessage, PipelineResult, QualifiedLead
+from .suppression import open_suppression_index
+from .tools.browser import playwright_available
+from .tools import http
+from .utils import L, dedupe_by_company_and_phone
+
+if TYPE_CHECKING:
+    from .sharding import ProcessSharder
+    from .sink import JsonlSink
 
 
 class LeadState(TypedDict, total=False):
+    """LangGraph state. Nodes return only the keys they produce.
+
+    Each stage's output list is stored once; `stats` entries from different
+    nodes are merged rather than the dict being copied forward.
+    """
+
     query: str
     location: str
     limit: int
+    enrich: bool
+    qualify: bool
     leads: list[Lead]
     enriched_leads: list[EnrichedLead]
     qualified_leads: list[QualifiedLead]
+    stats: Annotated[dict[str, Any], operator.or_]
+    budget: RunBudget
 
 
 @dataclass
 class LeadGenerationPipeline:
     settings: Settings
+    _graph_cache: tuple[Settings, Any] | None = field(default=None, init=False, repr=False, compare=False)
+    _sharder: ProcessSharder | None = field(default=None, init=False, repr=False, compare=False)
 
     @classmethod
-    def from_env(cls) -> "LeadGenerationPipeline":
-        return cls(load_settings())
+    def from_env(cls, config_path: str | Path | None = None) -> "LeadGenerationPipeline":
+        return cls(load_settings(config_path))
 
     def execute(
         self,
@@ -39,14 +62,31 @@ class LeadGenerationPipeline:
         qualify: bool = True,
         generate_campaigns: bool = True,
         output_dir: Path | None = None,
+        deadline_s: float | None = None,
+        stage_budgets_s: Mapping[str, float] | None = None,
+        sink: JsonlSink | None = None,
+        write_csv: bool = True,
     ) -> PipelineResult:
+        """Run the pipeline and write its CSV outputs (unless `write_csv` is False).
+
+        `deadline_s` bounds the whole run and `stage_budgets_s` the enrich /
+        outreach stages (defaults: `settings.run_deadline_s`,
+        `settings.enrich_budget_s`, `settings.outreach_budget_s`). Leads the
+        budget didn't cover pass through unenriched or without a message, and
+        are counted in `result.stats` (see `autoleadgen.deadline`).
+
+        With a `sink`, qualified leads and outreach messages are also streamed
+        as JSON Lines while the run progresses (see `autoleadgen.sink`).
+        """
+        http.set_host_limits(self.settings.host_concurrency, self.settings.host_limits)
+        budget = RunBudget.start(
+            deadline_s if deadline_s is not None else self.settings.run_deadline_s,
+            {**self._default_stage_budgets(), **(stage_budgets_s or {})},
+        )
         query = query or self.settings.default_query
         location = location or self.settings.default_location
         limit = limit or self.settings.default_limit
 
-        output_dir = output_dir or self.settings.data_dir
-        output_dir.mkdir(parents=True, exist_ok=True)
-
         if self.settings.use_langgraph:
             result = self._execute_with_langgraph(
                 query=query,
@@ -55,6 +95,8 @@ class LeadGenerationPipeline:
                 enrich=enrich,
                 qualify=qualify,
                 generate_campaigns=generate_campaigns,
+                budget=budget,
+                sink=sink,
             )
         else:
             result = self._execute_sequential(
@@ -64,11 +106,82 @@ class LeadGenerationPipeline:
                 enrich=enrich,
                 qualify=qualify,
                 generate_campaigns=generate_campaigns,
+                budget=budget,
+                sink=sink,
             )
 
-        self._write_outputs(result, output_dir=output_dir)
+        if write_csv:
+            output_dir = output_dir or self.settings.data_dir
+            output_dir.mkdir(parents=True, exist_ok=True)
+            self._write_outputs(result, output_dir=output_dir)
         return result
 
+    def execution_plan(
+        self,
+        *,
+        limit: int | None = None,
+        enrich: bool = True,
+        qualify: bool = True,
+        generate_campaigns: bool = True,
+        deadline_s: float | None = None,
+        stage_budgets_s: Mapping[str, float] | None = None,
+        queue: Path | None = None,
+    ) -> dict[str, Any]:
+        """What `execute` would run with these arguments, without running it.
+
+        Lists each stage with its workers and limits, then the HTTP limits,
+        output batching, and the ``--worker`` job concurrency and `queue`
+        (default ``data_dir/jobs.sqlite3``). Browser pages are only counted
+        when Playwright is installed, as `open_browser_pool` needs it. Used by
+        ``autoleadgen --dry-run``.
+        """
+        s = self.settings
+        budgets = {**self._default_stage_budgets(), **(stage_budgets_s or {})}
+        groq = (s.outreach_llm or "template").strip().lower() == "groq"
+        enrich_threads = max(1, s.enrich_concurrency)
+        return {
+            "engine": "langgraph" if s.use_langgraph else "sequential",
+            "processes": s.processes,
+            "run_deadline_s": deadline_s if deadline_s is not None else s.run_deadline_s,
+            "stages": {
+                "scrape": {"source": s.lead_source, "limit": limit or s.default_limit},
+                "enrich": {
+                    "enabled": enrich,
+                    "threads_per_process": enrich_threads,
+                    "queue_depth": max(enrich_threads, s.enrich_queue_depth or 4 * enrich_threads),
+                    "firecrawl": bool(s.firecrawl_api_key),
+                    "browser_pages": s.browser_concurrency if s.use_browser and playwright_available() else 0,
+                    "suppress_contacted": s.suppress_contacted,
+                    "prioritize": s.prioritize,
+                    "budget_s": budgets.get("enrich"),
+                },
+                "qualify": {"enabled": qualify, "incremental": s.incremental},
+                "outreach": {
+                    "enabled": generate_campaigns,
+                    "generator": f"groq:{s.groq_model}" if groq else f"template:{s.outreach_vertical}",
+                    "llm_concurrency": max(1, s.outreach_concurrency) if groq else 0,
+                    "incremental": s.incremental,
+                    "prioritize": s.prioritize,
+                    "budget_s": budgets.get("outreach"),
+                },
+            },
+            "http": {
+                "rate_limit_per_s": s.rate_limit_per_s,
+                "host_concurrency": s.host_concurrency,
+                "host_limits": dict(s.host_limits),
+            },
+            "output": {"csv_dir": str(s.data_dir), "jsonl_batch_size": s.output_batch_size},
+            "worker": {
+                "concurrency": max(1, s.worker_concurrency),
+                "queue": str(queue or s.data_dir / "jobs.sqlite3"),
+                "job_lease_s": s.job_lease_s,
+            },
+        }
+
+    def _default_stage_budgets(self) -> dict[str, float]:
+        budgets = {"enrich": self.settings.enrich_budget_s, "outreach": self.settings.outreach_budget_s}
+        return {stage: s for stage, s in budgets.items() if s is not None}
+
     def _execute_sequential(
         self,
         *,
@@ -78,19 +191,31 @@ class LeadGenerationPipeline:
         enrich: bool,
         qualify: bool,
         generate_campaigns: bool,
+        budget: RunBudget | None = None,
+        sink: JsonlSink | None = None,
     ) -> PipelineResult:
         scraper = ScraperAgent(self.settings)
-        enricher = EnrichmentAgent(self.settings)
-        qualifier = QualificationAgent(self.settings)
-        outreach = OutreachAgent(self.settings)
+        stats: dict[str, Any] = {}
 
         leads = scraper.discover_leads(query=query, location=location, limit=limit)
-        enriched = enricher.enrich_batch(leads) if enrich else [EnrichedLead(**l.model_dump()) for l in leads]
-        enriched = dedupe_by_company_and_phone(enriched)
-        qualified = qualifier.qualify(enriched) if qualify else [QualifiedLead(**e.model_dump()) for e in enriched]
-        messages = outreach.generate(qualified) if generate_campaigns else []
+        # Dedupe before enrichment so duplicates never cost a fetch.
+        unique = self._drop_suppressed(dedupe_by_company_and_phone(leads), stats)
+        enriched = (
+            self._run_stage("enrich", unique, stats, budget)
+            if enrich
+            else [EnrichedLead(**l.model_dump()) for l in unique]
+        )
+        qualified = (
+            self._run_stage("qualify", enriched, stats) if qualify else [QualifiedLead(**e.model_dump()) for e in enriched]
+        )
+        # Qualified leads carry every enriched field (and stand in for the
+        # enriched list in the result); free the enriched copies before outreach.
+        del enriched
+        if sink is not None:
+            sink.write("qualified_lead", qualified)
+        messages = self._run_outreach(qualified, stats, budget, sink) if generate_campaigns else []
 
-        return PipelineResult(leads=leads, enriched_leads=enriched, qualified_leads=qualified, outreach=messages)
+        return _result(leads, qualified, messages, stats)
 
     def _execute_with_langgraph(
         self,
@@ -101,10 +226,13 @@ class LeadGenerationPipeline:
         enrich: bool,
         qualify: bool,
         generate_campaigns: bool,
+        budget: RunBudget | None = None,
+        sink: JsonlSink | None = None,
     ) -> PipelineResult:
+        budget = budget or RunBudget()
         try:
-            from langgraph.graph import StateGraph
-        except Exception:
+            app = self._compiled_graph()
+        except ImportError:
             # Fallback if LangGraph isn't installed.
             return self._execute_sequential(
                 query=query,
@@ -113,35 +241,73 @@ class LeadGenerationPipeline:
                 enrich=enrich,
                 qualify=qualify,
                 generate_campaigns=generate_campaigns,
+                budget=budget,
+                sink=sink,
             )
 
+        final_state: LeadState = app.invoke(
+            {
+                "query": query,
+                "location": location,
+                "limit": limit,
+                "enrich": enrich,
+                "qualify": qualify,
+                "budget": budget,
+            }
+        )
+
+        leads = final_state.get("leads", [])
+        qualified_leads = final_state.get("qualified_leads", [])
+        stats = dict(final_state.get("stats", {}))
+        del final_state
+
+        if sink is not None:
+            sink.write("qualified_lead", qualified_leads)
+        messages = self._run_outreach(qualified_leads, stats, budget, sink) if generate_campaigns else []
+        return _result(leads, qualified_leads, messages, stats)
+
+    def _compiled_graph(self) -> Any:
+        """Build and compile the LangGraph app once per `settings` value.
+
+        Per-run options travel in the state rather than in node closures, so a
+        long-lived pipeline (see `autoleadgen.worker`) reuses one compiled graph
+        across jobs. Replacing `self.settings` invalidates the cache.
+        """
+        cached = self._graph_cache
+        if cached is not None and cached[0] is self.settings:
+            return cached[1]
+
+        from langgraph.graph import StateGraph
+
         scraper = ScraperAgent(self.settings)
-        enricher = EnrichmentAgent(self.settings)
-        qualifier = QualificationAgent(self.settings)
-        outreach = OutreachAgent(self.settings)
 
         def scrape_node(state: LeadState) -> LeadState:
             leads = scraper.discover_leads(query=state["query"], location=state["location"], limit=state["limit"])
-            return {**state, "leads": leads}
+            return {"leads": leads}
 
         def enrich_node(state: LeadState) -> LeadState:
-            if not enrich:
-                enriched_leads = [EnrichedLead(**l.model_dump()) for l in state.get("leads", [])]
+            stats: dict[str, Any] = {}
+            # Dedupe before enrichment so duplicates never cost a fetch.
+            unique = self._drop_suppressed(dedupe_by_company_and_phone(state.get("leads", [])), stats)
+            if not state.get("enrich", True):
+                enriched_leads = [EnrichedLead(**l.model_dump()) for l in unique]
             else:
-                enriched_leads = enricher.enrich_batch(state.get("leads", []))
-            enriched_leads = dedupe_by_company_and_phone(enriched_leads)
-            return {**state, "enriched_leads": enriched_leads}
+                enriched_leads = self._run_stage("enrich", unique, stats, state.get("budget"))
+            return {"enriched_leads": enriched_leads, "stats": stats}
 
         def qualify_node(state: LeadState) -> LeadState:
-            if not qualify:
+            stats: dict[str, Any] = {}
+            if not state.get("qualify", True):
                 qualified_leads = [QualifiedLead(**e.model_dump()) for e in state.get("enriched_leads", [])]
             else:
-                qualified_leads = qualifier.qualify(state.get("enriched_leads", []))
-            return {**state, "qualified_leads": qualified_leads}
+                qualified_leads = self._run_stage("qualify", state.get("enriched_leads", []), stats)
+            # Qualified leads carry every enriched field; replacing the enriched
+            # list lets those objects be freed.
+            return {"qualified_leads": qualified_leads, "enriched_leads": qualified_leads, "stats": stats}
 
         def outreach_node(state: LeadState) -> LeadState:
             # Outreach isn't stored in LeadState to keep it simple; pipeline builds it after invoke.
-            return state
+            return {}
 
         graph = StateGraph(LeadState)
         graph.add_node("scrape", scrape_node)
@@ -155,19 +321,172 @@ class LeadGenerationPipeline:
         graph.add_edge("qualify", "outreach")
 
         app = graph.compile()
-        final_state: LeadState = app.invoke({"query": query, "location": location, "limit": limit})
+        self._graph_cache = (self.settings, app)
+        return app
+
+    def _drop_suppressed(self, leads: list[L], stats: dict[str, Any]) -> list[L]:
+        """Leave out leads contacted within the cooldown, counting them as `suppressed`."""
+        index = open_suppression_index(self.settings)
+        if index is None or not leads:
+            return leads
+        flags = index.suppressed(leads)
+        stats["suppressed"] = stats.get("suppressed", 0) + sum(flags)
+        return [lead for lead, hit in zip(leads, flags) if not hit]
+
+    def _run_outreach(
+        self,
+        leads: list[QualifiedLead],
+        stats: dict[str, Any],
+        budget: RunBudget | None,
+        sink: JsonlSink | None = None,
+    ) -> list[OutreachMessage]:
+        """The outreach stage, bracketed by the contact-suppression check and record.
+
+        Leads are checked again here because enrichment may have found an
+        email that was already contacted. Messages go to `sink`, and emailed
+        leads are recorded, batch by batch while the stage runs.
+        """
+        # The pre-enrichment check already covered website and phone; this catches found emails.
+        leads = self._drop_suppressed(leads, stats)
+        index = open_suppression_index(self.settings)
+        # Each message is addressed to its lead's email, so (name, email) pairs it with
+        # exactly one lead even when businesses share a name.
+        by_contact = {(lead.company_name, lead.email): lead for lead in leads if lead.email} if index else {}
+
+        def emit(batch: list[OutreachMessage]) -> None:
+            if sink is not None:
+                sink.write("outreach", batch)
+            if index is not None:
+                # Messages without an address can't be sent, so they don't count as contact.
+                emailed = (by_contact.get((m.company_name, m.to_email)) for m in batch if m.to_email)
+                index.record(lead for lead in emailed if lead is not None)
+
+        on_output = emit if sink is not None or index is not None else None
+        return self._run_stage("outreach", leads, stats, budget, on_output)
+
+    def _run_stage(
+        self,
+        stage: str,
+        items: list[Any],
+        stats: dict[str, Any] | None = None,
+        budget: RunBudget | None = None,
+        on_output: Callable[[list[Any]], None] | None = None,
+    ) -> list[Any]:
+        """Run the enrich/qualify/outreach stage.
+
+        With `settings.incremental`, qualify/outreach reuse stored outputs for
+        leads whose fingerprint is unchanged and record `<stage>_skipped` in
+        `stats`; the rest are computed (sharded across processes if configured).
+        A `budget` bounds the stage; its clock starts here. With
+        `settings.prioritize`, enrich/outreach take leads in priority order
+        (see `autoleadgen.scheduling`).
+
+        With `on_output`, the stage runs in batches of
+        `settings.output_batch_size` and each batch's outputs are passed to
+        `on_output` as soon as they exist (reused incremental outputs at the end).
+        """
+        deadline = budget.for_stage(stage) if budget is not None else None
+        if self.settings.prioritize:
+            from .scheduling import run_prioritized
 
-        leads = final_state.get("leads", [])
-        enriched_leads = final_state.get("enriched_leads", [])
-        qualified_leads = final_state.get("qualified_leads", [])
+            return run_prioritized(
+                stage, items, lambda ordered: self._run_stage_items(stage, ordered, stats, deadline, on_output)
+            )
+        return self._run_stage_items(stage, items, stats, deadline, on_output)
 
-        messages = outreach.generate(qualified_leads) if generate_campaigns else []
-        return PipelineResult(
-            leads=leads,
-            enriched_leads=enriched_leads,
-            qualified_leads=qualified_leads,
-            outreach=messages,
-        )
+    def _run_stage_items(
+        self,
+        stage: str,
+        items: list[Any],
+        stats: dict[str, Any] | None,
+        deadline: Deadline | None,
+        on_output: Callable[[list[Any]], None] | None = None,
+    ) -> list[Any]:
+        if self.settings.incremental and stage in ("qualify", "outreach"):
+            from .incremental import open_incremental_cache
+
+            agent = QualificationAgent(self.settings) if stage == "qualify" else OutreachAgent(self.settings)
+            output_model = QualifiedLead if stage == "qualify" else OutreachMessage
+            emitted: set[int] = set()
+
+            def emit(batch: list[Any]) -> None:
+                emitted.update(map(id, batch))
+                if on_output is not None:
+                    on_output(batch)
+
+            run = open_incremental_cache(self.settings).run(
+                stage,
+                agent.version(),
+                items,
+                lambda misses: self._compute_stage(stage, misses, stats, deadline, emit if on_output else None),
+                output_model,
+            )
+            if stats is not None:
+                stats[f"{stage}_skipped"] = run.skipped
+            reused = [out for out in run.outputs if id(out) not in emitted]
+            if on_output is not None and reused:
+                on_output(reused)
+            return run.outputs
+        return self._compute_stage(stage, items, stats, deadline, on_output)
+
+    def _compute_stage(
+        self,
+        stage: str,
+        items: list[Any],
+        stats: dict[str, Any] | None = None,
+        deadline: Deadline | None = None,
+        on_output: Callable[[list[Any]], None] | None = None,
+    ) -> list[Any]:
+        if on_output is None:
+            return self._compute_batch(stage, items, stats, deadline)
+        out: list[Any] = []
+        size = max(1, self.settings.output_batch_size)
+        for start in range(0, len(items), size):
+            batch = items[start : start + size]
+            done = self._compute_batch(stage, batch, stats, deadline)
+            if done:
+                on_output(done)
+            out.extend(done)
+            if len(done) < len(batch):
+                # Cut short by the deadline; the remaining batches would come back empty.
+                if stats is not None and stage == "outreach":
+                    skipped = len(items) - start - len(batch)
+                    stats["outreach_budget_skipped"] = stats.get("outreach_budget_skipped", 0) + skipped
+                break
+        return out
+
+    def _compute_batch(
+        self,
+        stage: str,
+        items: list[Any],
+        stats: dict[str, Any] | None,
+        deadline: Deadline | None,
+    ) -> list[Any]:
+        if self.settings.processes > 1:
+            out = self._get_sharder().run(stage, self.settings, items, stats, deadline)
+        elif stage == "enrich":
+            out = EnrichmentAgent(self.settings).enrich_batch(items, stats, deadline=deadline)
+        elif stage == "qualify":
+            out = QualificationAgent(self.settings).qualify(items)
+        else:
+            out = OutreachAgent(self.settings).generate(items, deadline=deadline)
+        if stage == "outreach" and stats is not None and len(out) < len(items):
+            stats["outreach_budget_skipped"] = stats.get("outreach_budget_skipped", 0) + len(items) - len(out)
+        return out
+
+    def _get_sharder(self) -> ProcessSharder:
+        from .sharding import ProcessSharder
+
+        if self._sharder is None or self._sharder.processes != self.settings.processes:
+            self.close()
+            self._sharder = ProcessSharder(processes=self.settings.processes)
+        return self._sharder
+
+    def close(self) -> None:
+        """Release the worker process pool, if one was started."""
+        if self._sharder is not None:
+            self._sharder.close()
+            self._sharder = None
 
     def _write_outputs(self, result: PipelineResult, *, output_dir: Path) -> None:
         ts = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
@@ -177,10 +496,10 @@ class LeadGenerationPipeline:
         qualified_csv = output_dir / f"qualified_leads_{ts}.csv"
         outreach_csv = output_dir / f"outreach_{ts}.csv"
 
-        _write_csv(leads_csv, [l.model_dump() for l in result.leads])
-        _write_csv(enriched_csv, [l.model_dump() for l in result.enriched_leads])
-        _write_csv(qualified_csv, [l.model_dump() for l in result.qualified_leads])
-        _write_csv(outreach_csv, [m.model_dump() for m in result.outreach])
+        _write_csv(leads_csv, result.leads, Lead)
+        _write_csv(enriched_csv, result.enriched_leads, EnrichedLead)
+        _write_csv(qualified_csv, result.qualified_leads, QualifiedLead)
+        _write_csv(outreach_csv, result.outreach, OutreachMessage)
 
     def crewai_smoke_test(self) -> str:
         """Small, deterministic CrewAI run to verify installation.
@@ -222,15 +541,25 @@ class LeadGenerationPipeline:
         return str(out)
 
 
-def _write_csv(path: Path, rows: list[dict[str, Any]]) -> None:
+def _result(
+    leads: list[Lead], qualified: list[QualifiedLead], outreach: list[OutreachMessage], stats: dict[str, Any]
+) -> PipelineResult:
+    # The lists are already validated stage outputs; skip re-checking every item.
+    return PipelineResult.model_construct(
+        leads=leads, enriched_leads=qualified, qualified_leads=qualified, outreach=outreach, stats=stats
+    )
+
+
+def _write_csv(path: Path, items: Sequence[BaseModel], model: type[BaseModel]) -> None:
+    """Write `items` as `model`'s columns, dumping one row at a time."""
     path.parent.mkdir(parents=True, exist_ok=True)
-    if not rows:
+    if not items:
         path.write_text("", encoding="utf-8")
         return
 
-    fieldnames: list[str] = sorted({k for r in rows for k in r.keys()})
+    fields = set(model.model_fields)
     with path.open("w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=fieldnames)
+        w = csv.DictWriter(f, fieldnames=sorted(fields))
         w.writeheader()
-        for r in rows:
-            w.writerow(r)
+        for item in items:
+            w.writerow(item.model_dump(include=fields))
@@ -0,0 +1,247 @@
+"""Local BM25 retrieval for RAG-personalized outreach.
+
+`BM25Index` is a compact, dependency-light (NumPy only) keyword index over
+short documents such as case-study snippets or a lead's scraped page text. BM25
+weights are precomputed per posting at build time, so a query is a handful of
+vectorized adds over the postings of its terms followed by an
+`argpartition` for the top k. Indexes persist to a directory of ``.npy``
+arrays and are loaded memory-mapped, so opening even a large index is
+near-instant and only the postings a query touches are paged in.
+
+No embedding model, vector database or network call is involved.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import shutil
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Sequence
+
+import numpy as np
+
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have in is it its of on or our that the their this to was we were "
+    "with you your".split()
+)
+_FORMAT_VERSION = 1
+
+
+def tokenize(text: str) -> list[str]:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS and len(t) > 1]
+
+
+@dataclass(frozen=True)
+class Hit:
+    doc_id: str
+    score: float
+    text: str
+
+
+class BM25Index:
+    def __init__(
+        self,
+        *,
+        vocab: dict[str, int],
+        doc_ids: list[str],
+        term_ptr: np.ndarray,
+        post_doc: np.ndarray,
+        post_weight: np.ndarray,
+        text_offsets: np.ndarray,
+        texts: np.ndarray | bytes,
+    ) -> None:
+        self.vocab = vocab
+        self.doc_ids = doc_ids
+        self._term_ptr = term_ptr
+        self._post_doc = post_doc
+        self._post_weight = post_weight
+        self._text_offsets = text_offsets
+        self._texts = texts
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+    @classmethod
+    def build(cls, docs: Iterable[tuple[str, str]], *, k1: float = 1.2, b: float = 0.75) -> "BM25Index":
+        """Build an index from ``(doc_id, text)`` pairs."""
+        vocab: dict[str, int] = {}
+        doc_ids: list[str] = []
+        encoded: list[bytes] = []
+        postings: list[list[tuple[int, int]]] = []
+        doc_len: list[int] = []
+
+        for doc_id, text in docs:
+            d = len(doc_ids)
+            doc_ids.append(doc_id)
+            encoded.append(text.encode("utf-8"))
+            tokens = tokenize(text)
+            doc_len.append(len(tokens))
+            for term, tf in Counter(tokens).items():
+                t = vocab.setdefault(term, len(vocab))
+                if t == len(postings):
+                    postings.append([])
+                postings[t].append((d, tf))
+
+        n_docs = len(doc_ids)
+        lengths = np.asarray(doc_len, dtype=np.float32)
+        avgdl = float(lengths.mean()) if n_docs else 0.0
+        avgdl = avgdl or 1.0
+
+        term_ptr = np.zeros(len(vocab) + 1, dtype=np.int64)
+        term_ptr[1:] = np.cumsum([len(p) for p in postings], dtype=np.int64)
+        post_doc = np.empty(int(term_ptr[-1]), dtype=np.int32)
+        tf = np.empty(int(term_ptr[-1]), dtype=np.float32)
+        idf = np.empty(len(vocab), dtype=np.float32)
+        for t, plist in enumerate(postings):
+            lo, hi = term_ptr[t], term_ptr[t + 1]
+            post_doc[lo:hi] = [d for d, _ in plist]
+            tf[lo:hi] = [c for _, c in plist]
+            df = len(plist)
+            idf[t] = np.log1p((n_docs - df + 0.5) / (df + 0.5))
+
+        term_of_posting = np.repeat(np.arange(len(vocab)), np.diff(term_ptr))
+        norm = k1 * (1 - b + b * lengths[post_doc] / avgdl)
+        post_weight = (idf[term_of_posting] * tf * (k1 + 1) / (tf + norm)).astype(np.float32)
+
+        text_offsets = np.zeros(n_docs + 1, dtype=np.int64)
+        text_offsets[1:] = np.cumsum([len(e) for e in encoded], dtype=np.int64)
+
+        return cls(
+            vocab=vocab,
+            doc_ids=doc_ids,
+            term_ptr=term_ptr,
+            post_doc=post_doc,
+            post_weight=post_weight,
+            text_offsets=text_offsets,
+            texts=b"".join(encoded),
+        )
+
+    def text(self, doc: int) -> str:
+        lo, hi = int(self._text_offsets[doc]), int(self._text_offsets[doc + 1])
+        return bytes(self._texts[lo:hi]).decode("utf-8")
+
+    def search(self, query: str, k: int = 3) -> list[Hit]:
+        return self.search_batch([query], k=k)[0]
+
+    def search_batch(self, queries: Sequence[str], k: int = 3) -> list[list[Hit]]:
+        """Top-k hits per query; queries with no matching terms return []."""
+        n_docs = len(self.doc_ids)
+        scores = np.zeros(n_docs, dtype=np.float32)
+        out: list[list[Hit]] = []
+        for query in queries:
+            terms = {self.vocab[t] for t in tokenize(query) if t in self.vocab}
+            if not terms or not n_docs:
+                out.append([])
+                continue
+            scores.fill(0)
+            for t in terms:
+                lo, hi = self._term_ptr[t], self._term_ptr[t + 1]
+                # Each doc appears at most once per term, so fancy-index add is safe.
+                scores[self._post_doc[lo:hi]] += self._post_weight[lo:hi]
+            top = min(k, n_docs)
+            idx = np.argpartition(-scores, top - 1)[:top]
+            idx = idx[np.argsort(-scores[idx], kind="stable")]
+            out.append([Hit(self.doc_ids[i], float(scores[i]), self.text(int(i))) for i in idx if scores[i] > 0])
+        return out
+
+    def save(self, directory: Path, *, source: dict | None = None) -> None:
+        """Persist the index; `source` describes what it was built from (see `load_or_build_snippet_index`)."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        np.save(directory / "term_ptr.npy", self._term_ptr)
+        np.save(directory / "post_doc.npy", self._post_doc)
+        np.save(directory / "post_weight.npy", self._post_weight)
+        np.save(directory / "text_offsets.npy", self._text_offsets)
+        (directory / "texts.bin").write_bytes(bytes(self._texts))
+        meta = {"version": _FORMAT_VERSION, "vocab": self.vocab, "doc_ids": self.doc_ids, "source": source}
+        (directory / "meta.json").write_text(json.dumps(meta), encoding="utf-8")
+
+    @classmethod
+    def load(cls, directory: Path) -> "BM25Index":
+        """Open a saved index with its arrays memory-mapped read-only."""
+        directory = Path(directory)
+        meta = json.loads((directory / "meta.json").read_text(encoding="utf-8"))
+        if meta.get("version") != _FORMAT_VERSION:
+            raise ValueError(f"Unsupported index format in {directory}: {meta.get('version')!r}")
+        texts_path = directory / "texts.bin"
+        texts: np.ndarray | bytes = (
+            np.memmap(texts_path, dtype=np.uint8, mode="r") if texts_path.stat().st_size else b""
+        )
+        return cls(
+            vocab=meta["vocab"],
+            doc_ids=meta["doc_ids"],
+            term_ptr=np.load(directory / "term_ptr.npy", mmap_mode="r"),
+            post_doc=np.load(directory / "post_doc.npy", mmap_mode="r"),
+            post_weight=np.load(directory / "post_weight.npy", mmap_mode="r"),
+            text_offsets=np.load(directory / "text_offsets.npy", mmap_mode="r"),
+            texts=texts,
+        )
+
+
+def iter_snippets(directory: Path) -> Iterable[tuple[str, str]]:
+    """Yield ``(doc_id, paragraph)`` for every paragraph of ``*.txt``/``*.md`` files in `directory`."""
+    for path in sorted(Path(directory).glob("*")):
+        if path.suffix.lower() not in {".txt", ".md"}:
+            continue
+        paragraphs = [p.strip() for p in re.split(r"\n\s*\n", path.read_text(encoding="utf-8"))]
+        for i, para in enumerate(p for p in paragraphs if p):
+            yield f"{path.stem}#{i}", para
+
+
+def _source_fingerprint(source_dir: Path) -> dict:
+    """The source directory plus ``[name, size, mtime_ns]`` of each file `iter_snippets` reads."""
+    files = [
+        [p.name, st.st_size, st.st_mtime_ns]
+        for p in sorted(source_dir.glob("*"))
+        if p.suffix.lower() in {".txt", ".md"}
+        for st in [p.stat()]
+    ]
+    return {"dir": str(source_dir.resolve()), "files": files}
+
+
+def load_or_build_snippet_index(source_dir: Path, index_dir: Path) -> BM25Index:
+    """Load the persisted index for `source_dir`, rebuilding it when the source files differ.
+
+    The index records the source directory and each file's name, size and
+    mtime; any difference (a file added, removed, edited, or restored from an
+    older copy, or a different directory) triggers a rebuild.
+
+    Indexes may be memory-mapped by other jobs, so a rebuild never touches the
+    files in use: it is saved to a new ``index_dir/<generation>/`` directory,
+    and the ``CURRENT`` file is atomically switched to it. The replaced
+    generation is then unlinked; existing mappings keep their data.
+    """
+    source_dir, index_dir = Path(source_dir), Path(index_dir)
+    fingerprint = _source_fingerprint(source_dir)
+    current = _current_generation(index_dir)
+    if current is not None:
+        try:
+            meta = json.loads((current / "meta.json").read_text(encoding="utf-8"))
+            if meta.get("version") == _FORMAT_VERSION and meta.get("source") == fingerprint:
+                return BM25Index.load(current)
+        except (OSError, ValueError):
+            pass  # replaced and removed by a concurrent rebuild, or unreadable: build anew
+
+    generation = index_dir / uuid.uuid4().hex
+    BM25Index.build(iter_snippets(source_dir)).save(generation, source=fingerprint)
+    pointer = index_dir / f"CURRENT.{generation.name}.tmp"
+    pointer.write_text(generation.name, encoding="utf-8")
+    os.replace(pointer, index_dir / "CURRENT")
+    if current is not None and current != generation:
+        shutil.rmtree(current, ignore_errors=True)
+    return BM25Index.load(generation)
+
+
+def _current_generation(index_dir: Path) -> Path | None:
+    try:
+        name = (index_dir / "CURRENT").read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+    return index_dir / name if name else None
@@ -0,0 +1,270 @@
+"""Cost- and latency-aware routing between plain fetch and Firecrawl.
+
+Firecrawl is slow and paid; a plain GET finds the email on many simple
+sites. When a Firecrawl key is configured, `EnrichmentRouter` decides per
+domain which path to try first:
+
+- unknown domains, and domains where plain fetch has worked, go cheap-first
+  and only escalate to Firecrawl when the page yields no email or looks
+  JavaScript-rendered;
+- domains where plain fetch keeps coming back empty (or JS-rendered) while
+  Firecrawl succeeds go straight to Firecrawl, except that every
+  `_REPROBE_EVERY`-th Firecrawl attempt tries the cheap fetch again, so a
+  site that has since become static (or started showing its email) is
+  noticed and its JS-rendered flag cleared.
+
+Outcomes are aggregated per domain during a run and persisted to
+``<data_dir>/routing.sqlite3`` by `flush()`, so routing improves across runs.
+`summary()` reports Firecrawl calls avoided and the estimated cost and
+latency saved.
+"""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterator, TypeVar
+
+from .config import Settings
+
+
+T = TypeVar("T")
+
+FETCH = "fetch"
+FIRECRAWL = "firecrawl"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS domain_outcomes (
+    domain TEXT PRIMARY KEY,
+    fetch_attempts INTEGER NOT NULL DEFAULT 0,
+    fetch_hits INTEGER NOT NULL DEFAULT 0,
+    firecrawl_attempts INTEGER NOT NULL DEFAULT 0,
+    firecrawl_hits INTEGER NOT NULL DEFAULT 0,
+    js_rendered INTEGER NOT NULL DEFAULT 0,
+    fetch_latency_s REAL,
+    firecrawl_latency_s REAL,
+    updated_at REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+# Used until a run has actually measured a Firecrawl call.
+_DEFAULT_FIRECRAWL_LATENCY_S = 8.0
+# Smoothing for latency moving averages.
+_EWMA = 0.3
+# A Firecrawl-routed domain retries the cheap fetch once per this many Firecrawl attempts.
+_REPROBE_EVERY = 10
+
+_TAG_RE = re.compile(r"<(script|style)\b.*?</\1\s*>|<[^>]+>", re.IGNORECASE | re.DOTALL)
+_SPA_MARKERS = re.compile(
+    r'<div id="(?:root|app|__next|__nuxt)"\s*>\s*</div>|window\.__(?:NUXT|INITIAL_STATE|APOLLO_STATE)__'
+    r"|enable javascript to|requires javascript",
+    re.IGNORECASE,
+)
+
+
+def looks_js_rendered(html: str | None) -> bool:
+    """Heuristic: the page needs a browser (SPA shell or almost no server-rendered text)."""
+    if not html:
+        return False
+    if _SPA_MARKERS.search(html):
+        return True
+    visible = " ".join(_TAG_RE.sub(" ", html).split())
+    return len(visible) < 200 and "<script" in html.lower()
+
+
+@dataclass
+class DomainOutcome:
+    domain: str
+    fetch_attempts: int = 0
+    fetch_hits: int = 0
+    firecrawl_attempts: int = 0
+    firecrawl_hits: int = 0
+    js_rendered: bool = False
+    fetch_latency_s: float | None = None
+    firecrawl_latency_s: float | None = None
+
+
+class RoutingHistory:
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+        finally:
+            conn.close()
+
+    def get(self, domain: str) -> DomainOutcome | None:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT domain, fetch_attempts, fetch_hits, firecrawl_attempts, firecrawl_hits, js_rendered,"
+                " fetch_latency_s, firecrawl_latency_s FROM domain_outcomes WHERE domain = ?",
+                (domain,),
+            ).fetchone()
+        if row is None:
+            return None
+        return DomainOutcome(*row[:5], bool(row[5]), *row[6:])
+
+    def merge(self, runs: list[DomainOutcome]) -> None:
+        """Add one run's per-domain outcomes to the stored totals."""
+        if not runs:
+            return
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for r in runs:
+                conn.execute(
+                    """
+                    INSERT INTO domain_outcomes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(domain) DO UPDATE SET
+                        fetch_attempts = fetch_attempts + excluded.fetch_attempts,
+                        fetch_hits = fetch_hits + excluded.fetch_hits,
+                        firecrawl_attempts = firecrawl_attempts + excluded.firecrawl_attempts,
+                        firecrawl_hits = firecrawl_hits + excluded.firecrawl_hits,
+                        js_rendered = CASE WHEN excluded.fetch_attempts > 0
+                                           THEN excluded.js_rendered ELSE js_rendered END,
+                        fetch_latency_s = COALESCE(
+                            ? * excluded.fetch_latency_s + (1 - ?) * fetch_latency_s,
+                            excluded.fetch_latency_s, fetch_latency_s),
+                        firecrawl_latency_s = COALESCE(
+                            ? * excluded.firecrawl_latency_s + (1 - ?) * firecrawl_latency_s,
+                            excluded.firecrawl_latency_s, firecrawl_latency_s),
+                        updated_at = excluded.updated_at
+                    """,
+                    (
+                        r.domain,
+                        r.fetch_attempts,
+                        r.fetch_hits,
+                        r.firecrawl_attempts,
+                        r.firecrawl_hits,
+                        int(r.js_rendered),
+                        r.fetch_latency_s,
+                        r.firecrawl_latency_s,
+                        time.time(),
+                        _EWMA,
+                        _EWMA,
+                        _EWMA,
+                        _EWMA,
+                    ),
+                )
+            conn.execute("COMMIT")
+
+
+@dataclass
+class EnrichmentRouter:
+    history: RoutingHistory | None = None
+    firecrawl_cost_usd: float = 0.0
+    _known: dict[str, DomainOutcome | None] = field(default_factory=dict, init=False, repr=False)
+    _run: dict[str, DomainOutcome] = field(default_factory=dict, init=False, repr=False)
+    _avoided: set[str] = field(default_factory=set, init=False, repr=False)
+    _escalated: set[str] = field(default_factory=set, init=False, repr=False)
+    _direct: set[str] = field(default_factory=set, init=False, repr=False)
+    _reprobed: set[str] = field(default_factory=set, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def _past(self, domain: str) -> DomainOutcome | None:
+        with self._lock:
+            if domain in self._known:
+                return self._known[domain]
+        past = self.history.get(domain) if self.history is not None else None
+        with self._lock:
+            self._known[domain] = past
+        return past
+
+    def plan(self, domain: str) -> str:
+        """Which path to try first for `domain`: FETCH (cheap) or FIRECRAWL."""
+        past = self._past(domain)
+        if past is None or not past.fetch_attempts:
+            return FETCH
+        fetch_rate = (past.fetch_hits + 1) / (past.fetch_attempts + 2)
+        firecrawl_rate = (past.firecrawl_hits + 1) / (past.firecrawl_attempts + 2)
+        if past.js_rendered or (fetch_rate < 0.3 and firecrawl_rate > fetch_rate):
+            # Attempts are counted once per run, so this re-probes every Nth run of the domain.
+            if past.firecrawl_attempts and past.firecrawl_attempts % _REPROBE_EVERY == 0:
+                with self._lock:
+                    self._reprobed.add(domain)
+                return FETCH
+            with self._lock:
+                self._direct.add(domain)
+            return FIRECRAWL
+        return FETCH
+
+    def timed(self, path: str, domain: str, fn: Callable[[], T]) -> T:
+        """Run one fetch/Firecrawl call for `domain`, recording its latency."""
+        started = time.perf_counter()
+        try:
+            return fn()
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                out = self._run.setdefault(domain, DomainOutcome(domain))
+                setattr(out, f"{path}_attempts", 1)
+                setattr(out, f"{path}_latency_s", elapsed)
+
+    def record(self, path: str, domain: str, *, found: bool, js_rendered: bool = False) -> None:
+        with self._lock:
+            out = self._run.setdefault(domain, DomainOutcome(domain))
+            setattr(out, f"{path}_attempts", 1)
+            if found:
+                setattr(out, f"{path}_hits", 1)
+            if path == FETCH:
+                out.js_rendered = out.js_rendered or js_rendered
+
+    def resolved_cheaply(self, domain: str) -> None:
+        with self._lock:
+            self._avoided.add(domain)
+
+    def escalated(self, domain: str) -> None:
+        with self._lock:
+            self._escalated.add(domain)
+
+    def summary(self) -> dict[str, Any]:
+        with self._lock:
+            firecrawl_latencies = [o.firecrawl_latency_s for o in self._run.values() if o.firecrawl_latency_s]
+            avg_firecrawl_s = (
+                sum(firecrawl_latencies) / len(firecrawl_latencies)
+                if firecrawl_latencies
+                else _DEFAULT_FIRECRAWL_LATENCY_S
+            )
+            saved_s = sum(
+                max(0.0, avg_firecrawl_s - (self._run[d].fetch_latency_s or 0.0)) for d in self._avoided if d in self._run
+            )
+            return {
+                "firecrawl_calls_avoided": len(self._avoided),
+                "firecrawl_escalations": len(self._escalated),
+                "firecrawl_direct": len(self._direct),
+                "fetch_reprobes": len(self._reprobed),
+                "est_cost_saved_usd": round(len(self._avoided) * self.firecrawl_cost_usd, 4),
+                "est_latency_saved_s": round(saved_s, 2),
+            }
+
+    def flush(self) -> None:
+        """Persist this run's per-domain outcomes to the history.
+
+        This starts a new run: take `summary()` first.
+        """
+        with self._lock:
+            runs = list(self._run.values())
+            self._run.clear()
+        if self.history is not None:
+            self.history.merge(runs)
+
+
+def open_router(settings: Settings) -> EnrichmentRouter | None:
+    """A run-scoped router when routing applies (Firecrawl key set and routing enabled)."""
+    if not settings.firecrawl_api_key or not settings.enrich_routing:
+        return None
+    return EnrichmentRouter(
+        history=RoutingHistory(settings.data_dir / "routing.sqlite3"),
+        firecrawl_cost_usd=settings.firecrawl_cost_usd,
+    )
@@ -0,0 +1,75 @@
+"""Priority scheduling for budget-limited runs.
+
+By default enrichment and outreach process leads in the order the scraper
+returned them. When a deadline, stage budget or rate limit cuts a stage short,
+the work is then spent on whoever Yelp listed first.
+
+With `Settings.prioritize`, each stage takes its leads from a priority queue
+instead:
+
+- enrichment is ordered by `utils.prescore_lead`, the best score a lead can
+  reach with the `score_lead` weights, from scrape-time fields only. Leads
+  that can still become High tier are fetched first, and among those the
+  better-rated and more-reviewed ones;
+- outreach is ordered by the real qualification score, verified emails first.
+
+With `Settings.processes > 1` the ordered leads are dealt round-robin
+across process shards (see `autoleadgen.sharding`), so each shard works
+through its share best-first. Enriched leads are returned in input order,
+since enrichment yields one output per lead. Outreach messages come out
+highest-priority first, so a run cut short keeps its best messages at the top.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Sequence, TypeVar
+
+from .models import Lead, QualifiedLead
+from .utils import prescore_lead
+
+
+T = TypeVar("T")
+
+
+def enrich_priority(lead: Lead) -> tuple[float, ...]:
+    # prescore is capped at 100, so break ties between strong leads on the raw signals.
+    return (prescore_lead(lead), lead.rating or 0.0, lead.review_count or 0)
+
+
+def outreach_priority(lead: QualifiedLead) -> tuple[float, ...]:
+    return (lead.quality_score, int(lead.email_verified))
+
+
+PRIORITIES: dict[str, Callable[[Any], tuple[float, ...]]] = {
+    "enrich": enrich_priority,
+    "outreach": outreach_priority,
+}
+
+
+def priority_order(items: Sequence[T], priority: Callable[[T], tuple[float, ...]]) -> list[int]:
+    """Indices of `items`, highest priority first; equal priorities keep input order."""
+    keys = [tuple(-p for p in priority(item)) for item in items]
+    return sorted(range(len(items)), key=keys.__getitem__)  # stable: ties keep input order
+
+
+def run_prioritized(
+    stage: str,
+    items: Sequence[T],
+    run: Callable[[list[T]], list[Any]],
+) -> list[Any]:
+    """Call `run` with `items` in priority order for `stage`.
+
+    For enrichment, whose output is one item per input, the results are put
+    back in input order. For other stages they stay in priority order.
+    """
+    priority = PRIORITIES.get(stage)
+    if priority is None or len(items) < 2:
+        return run(list(items))
+    order = priority_order(items, priority)
+    out = run([items[i] for i in order])
+    if stage != "enrich":
+        return out
+    restored: list[Any] = [None] * len(items)
+    for i, result in zip(order, out):
+        restored[i] = result
+    return restored
@@ -0,0 +1,161 @@
+"""Process-pool sharding for the CPU-heavy pipeline stages.
+
+Regex extraction, pydantic validation, scoring and outreach templating all run
+under the GIL. With `Settings.processes > 1` the pipeline deals each stage's
+input round-robin into shards, runs them in a pool of worker processes and
+interleaves the results back, so output is identical to a single-process run.
+Dealing rather than slicing matters when the input is in priority order (see
+`autoleadgen.scheduling`): every shard starts with top-ranked items, so a
+deadline that cuts all shards short still leaves the best items done.
+
+Shards cross the process boundary as JSON bytes produced by pydantic's Rust
+serializer (`TypeAdapter.dump_json` / `validate_json`), which is both smaller
+and cheaper than pickling model instances.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import cache
+from typing import Any, Callable, Sequence, TypeVar
+
+from pydantic import TypeAdapter
+
+from .config import Settings
+from .deadline import Deadline
+from .models import EnrichedLead, Lead, OutreachMessage, QualifiedLead
+
+
+T = TypeVar("T")
+
+
+def split_shards(items: Sequence[T], shards: int) -> list[Sequence[T]]:
+    """Deal `items` round-robin into at most `shards` shards: item i goes to shard i % shards."""
+    shards = max(1, min(shards, len(items)))
+    return [items[i::shards] for i in range(shards)]
+
+
+def merge_shards(outputs: Sequence[Sequence[T]]) -> list[T]:
+    """Undo `split_shards` on per-shard outputs.
+
+    Each output lines up with its shard's input, possibly cut short (a stage
+    stopped by its deadline returns a prefix). Like an unsharded stage, the
+    merge is a prefix of the input order: it stops at the first position a
+    shard didn't reach, dropping later outputs of the other shards.
+    """
+    merged: list[T] = []
+    for k in range(max((len(o) for o in outputs), default=0)):
+        for o in outputs:
+            if k >= len(o):
+                return merged
+            merged.append(o[k])
+    return merged
+
+
+def _enrich(
+    settings: Settings, leads: list[Lead], stats: dict[str, Any], deadline: Deadline | None
+) -> list[EnrichedLead]:
+    from .agents import EnrichmentAgent
+
+    return EnrichmentAgent(settings).enrich_batch(leads, stats, deadline=deadline)
+
+
+def _qualify(
+    settings: Settings, leads: list[EnrichedLead], stats: dict[str, Any], deadline: Deadline | None
+) -> list[QualifiedLead]:
+    from .agents import QualificationAgent
+
+    return QualificationAgent(settings).qualify(leads)
+
+
+def _outreach(
+    settings: Settings, leads: list[QualifiedLead], stats: dict[str, Any], deadline: Deadline | None
+) -> list[OutreachMessage]:
+    from .agents import OutreachAgent
+
+    return OutreachAgent(settings).generate(leads, deadline=deadline)
+
+
+# stage -> (input model, output model, stage function)
+_STAGES: dict[str, tuple[type, type, Callable[[Settings, Any, dict[str, Any], Deadline | None], list[Any]]]] = {
+    "enrich": (Lead, EnrichedLead, _enrich),
+    "qualify": (EnrichedLead, QualifiedLead, _qualify),
+    "outreach": (QualifiedLead, OutreachMessage, _outreach),
+}
+
+
+@cache
+def _adapter(model: type) -> TypeAdapter[Any]:
+    return TypeAdapter(list[model])  # type: ignore[valid-type]
+
+
+def _run_shard(
+    stage: str, settings: Settings, payload: bytes, deadline: Deadline | None
+) -> tuple[bytes, dict[str, Any]]:
+    from .tools import http
+
+    in_model, out_model, fn = _STAGES[stage]
+    # Limits are per process; each worker enforces the configured caps itself.
+    http.set_host_limits(settings.host_concurrency, settings.host_limits)
+    stats: dict[str, Any] = {}
+    out = fn(settings, _adapter(in_model).validate_json(payload), stats, deadline)
+    return _adapter(out_model).dump_json(out), stats
+
+
+def _merge_stats(into: dict[str, Any], shard: dict[str, Any]) -> None:
+    for key, value in shard.items():
+        into[key] = into.get(key, 0) + value if isinstance(value, (int, float)) else value
+
+
+@dataclass
+class ProcessSharder:
+    processes: int
+    min_shard_size: int = 32
+    _pool: ProcessPoolExecutor | None = field(default=None, init=False, repr=False)
+
+    def run(
+        self,
+        stage: str,
+        settings: Settings,
+        items: list[Any],
+        stats: dict[str, Any] | None = None,
+        deadline: Deadline | None = None,
+    ) -> list[Any]:
+        """Run `stage` over `items`, sharded across processes when it pays off.
+
+        Numeric counters a stage reports into `stats` are summed across shards.
+        """
+        in_model, out_model, fn = _STAGES[stage]
+        stats = stats if stats is not None else {}
+        shards = min(self.processes, len(items) // max(1, self.min_shard_size))
+        if shards <= 1:
+            return fn(settings, items, stats, deadline)
+
+        pool = self._get_pool()
+        futures = [
+            pool.submit(_run_shard, stage, settings, _adapter(in_model).dump_json(shard), deadline)
+            for shard in split_shards(items, shards)
+        ]
+        outputs: list[list[Any]] = []
+        for f in futures:
+            payload, shard_stats = f.result()
+            outputs.append(_adapter(out_model).validate_json(payload))
+            _merge_stats(stats, shard_stats)
+        return merge_shards(outputs)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn, not fork: the pipeline may already be running threads
+            # (worker mode, HTTP pools) that must not be duplicated mid-lock.
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.processes,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._pool
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
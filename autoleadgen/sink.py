@@ -0,0 +1,125 @@
+"""Streaming JSON Lines output for downstream loaders.
+
+`JsonlSink` writes one JSON object per record to a file or stdout, optionally
+gzip- or zstd-compressed. Each line is the model's fields plus a leading
+``"record"`` key (``"qualified_lead"`` or ``"outreach"``)::
+
+    {"record":"qualified_lead","company_name":"Sunrise Care",...,"tier":"High"}
+
+Lines are serialized by pydantic's Rust serializer straight to bytes, with
+no intermediate dicts. The pipeline writes qualified leads once
+qualification finishes, then outreach messages batch by batch
+(`Settings.output_batch_size`) while the outreach stage runs. The sink
+writes and flushes every `batch_size` records (a sync flush for compressed
+output), so ``autoleadgen --jsonl - | loader`` starts loading while outreach
+is still running, and a large stage never builds its whole output in one
+buffer.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import sys
+import zlib
+from pathlib import Path
+from typing import IO, Any, Iterable
+
+from pydantic import BaseModel
+
+
+COMPRESSIONS = ("gzip", "zstd")
+
+_SUFFIXES = {".gz": "gzip", ".gzip": "gzip", ".zst": "zstd", ".zstd": "zstd"}
+
+
+def infer_compression(target: str | Path) -> str | None:
+    return _SUFFIXES.get(Path(str(target)).suffix.lower())
+
+
+class JsonlSink:
+    def __init__(
+        self,
+        stream: IO[bytes],
+        *,
+        compression: str | None = None,
+        close_stream: bool = False,
+        batch_size: int = 1000,
+    ) -> None:
+        if compression is not None and compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown compression {compression!r}; expected one of {COMPRESSIONS}")
+        self.records = 0
+        self.batch_size = max(1, batch_size)
+        self._raw = stream
+        self._close_raw = close_stream
+        self._out: Any = stream
+        self._compression = compression
+        if compression == "gzip":
+            self._out = gzip.GzipFile(fileobj=stream, mode="wb", compresslevel=6)
+        elif compression == "zstd":
+            self._out = _zstd_writer(stream)
+
+    @classmethod
+    def open(cls, target: str | Path, *, compression: str | None = None, batch_size: int = 1000) -> "JsonlSink":
+        """Open `target` for writing; ``"-"`` is stdout. Compression defaults from the file suffix."""
+        if str(target) == "-":
+            return cls(sys.stdout.buffer, compression=compression, batch_size=batch_size)
+        path = Path(target)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return cls(
+            path.open("wb"),
+            compression=compression if compression is not None else infer_compression(path),
+            close_stream=True,
+            batch_size=batch_size,
+        )
+
+    def write(self, record: str, items: Iterable[BaseModel]) -> int:
+        """Write `items` as `record` lines, flushing every `batch_size` through to the target."""
+        prefix = b'{"record":' + json.dumps(record).encode("utf-8")
+        written = 0
+        lines: list[bytes] = []
+        for item in items:
+            body = item.__pydantic_serializer__.to_json(item)
+            lines.append(prefix + (b"," + body[1:] if body != b"{}" else b"}") + b"\n")
+            if len(lines) >= self.batch_size:
+                written += self._write_lines(lines)
+                lines = []
+        if lines:
+            written += self._write_lines(lines)
+        return written
+
+    def _write_lines(self, lines: list[bytes]) -> int:
+        self._out.write(b"".join(lines))
+        self.flush()
+        self.records += len(lines)
+        return len(lines)
+
+    def flush(self) -> None:
+        if self._compression == "gzip":
+            self._out.flush(zlib.Z_SYNC_FLUSH)
+        else:
+            self._out.flush()
+        if self._out is not self._raw:
+            self._raw.flush()
+
+    def close(self) -> None:
+        if self._out is not self._raw:
+            # Ends the compressed stream; the underlying file (maybe stdout) stays open.
+            self._out.close()
+        self._raw.flush()
+        if self._close_raw:
+            self._raw.close()
+
+    def __enter__(self) -> "JsonlSink":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def _zstd_writer(stream: IO[bytes]) -> Any:
+    try:
+        import zstandard
+    except ImportError as e:  # pragma: no cover - depends on the environment
+        raise RuntimeError("zstd output requires the 'zstandard' package (pip install zstandard)") from e
+    return zstandard.ZstdCompressor(level=3).stream_writer(stream, closefd=False)
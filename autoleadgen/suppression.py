@@ -0,0 +1,183 @@
+"""Cross-run "already contacted" suppression.
+
+Every lead that gets an outreach email is recorded in
+``<data_dir>/suppression.sqlite3`` under its normalized keys:
+
+- ``email``: the address, lower-cased;
+- ``domain``: the website host without ``www.``, plus the email's domain
+  unless it's a free-mail provider (gmail.com and the like). Pages on shared
+  platforms (Facebook, Google Sites, Wix, Linktree...) are keyed on host and
+  path instead, since the host alone is shared by unrelated businesses;
+- ``phone``: the last ten digits.
+
+A later lead matching any key contacted within the cooldown is suppressed.
+The pipeline drops those right after dedupe, so they never reach enrichment,
+Firecrawl, or outreach generation, and checks again before outreach, when
+enrichment may have found an already-contacted email. Keys are the table's
+primary key (a covering index, no row lookups) and each batch is checked
+with a few ``IN (...)`` queries, so the cost per lead stays constant as the
+index grows.
+"""
+
+from __future__ import annotations
+
+import csv
+import re
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Sequence
+from urllib.parse import urlsplit
+
+from .config import Settings
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS contacted (
+    kind TEXT NOT NULL,
+    value TEXT NOT NULL,
+    contacted_at REAL NOT NULL,
+    PRIMARY KEY (kind, value)
+) WITHOUT ROWID;
+"""
+_BATCH = 500
+
+# Many unrelated businesses share these; their domain identifies nobody.
+_FREE_MAIL = frozenset(
+    {
+        "gmail.com", "googlemail.com", "yahoo.com", "hotmail.com", "outlook.com", "live.com", "msn.com",
+        "aol.com", "icloud.com", "me.com", "comcast.net", "att.net", "sbcglobal.net", "verizon.net",
+        "proton.me", "protonmail.com",
+    }
+)
+# Hosts (and their subdomains) whose pages belong to many unrelated businesses.
+_SHARED_HOSTS = frozenset(
+    {
+        "facebook.com", "fb.com", "instagram.com", "linkedin.com", "twitter.com", "x.com", "tiktok.com",
+        "youtube.com", "yelp.com", "google.com", "goo.gl", "business.site", "linktr.ee", "wixsite.com",
+        "wix.com", "squarespace.com", "weebly.com", "godaddysites.com", "blogspot.com", "wordpress.com",
+        "carrd.co", "nextdoor.com",
+    }
+)
+
+
+def _is_shared_host(host: str) -> bool:
+    parts = host.split(".")
+    return any(".".join(parts[i:]) in _SHARED_HOSTS for i in range(len(parts) - 1))
+
+
+def _site_key(website: str) -> str | None:
+    """The website's host, or host + path on a shared platform (None if that path is empty)."""
+    url = website.strip()
+    parsed = urlsplit(url if "://" in url else f"http://{url}")
+    host = (parsed.hostname or "").lower().removeprefix("www.")
+    if not host:
+        return None
+    if not _is_shared_host(host):
+        return host
+    path = parsed.path.strip("/").lower()
+    return f"{host}/{path}" if path else None
+
+
+def contact_keys(email: str | None = None, website: str | None = None, phone: str | None = None) -> set[tuple[str, str]]:
+    """Normalized ``(kind, value)`` keys identifying a business."""
+    keys: set[tuple[str, str]] = set()
+    if email and "@" in email:
+        address = email.strip().lower()
+        keys.add(("email", address))
+        mail_domain = address.rsplit("@", 1)[1]
+        if mail_domain not in _FREE_MAIL:
+            keys.add(("domain", mail_domain))
+    site = _site_key(website) if website else None
+    if site:
+        keys.add(("domain", site))
+    digits = re.sub(r"\D", "", phone or "")
+    if len(digits) >= 10:
+        keys.add(("phone", digits[-10:]))
+    return keys
+
+
+def lead_contact_keys(lead: Any) -> set[tuple[str, str]]:
+    return contact_keys(lead.email, lead.website, lead.phone)
+
+
+class SuppressionIndex:
+    def __init__(self, path: Path, *, cooldown_s: float) -> None:
+        self.path = Path(path)
+        self.cooldown_s = cooldown_s
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+        finally:
+            conn.close()
+
+    def suppressed(self, leads: Sequence[Any], *, now: float | None = None) -> list[bool]:
+        """For each lead, whether any of its keys was contacted within the cooldown."""
+        keys = [lead_contact_keys(lead) for lead in leads]
+        recent = self._recent(set().union(*keys), (now if now is not None else time.time()) - self.cooldown_s)
+        return [not k.isdisjoint(recent) for k in keys]
+
+    def record(self, leads: Iterable[Any], *, at: float | None = None) -> int:
+        """Mark `leads` as contacted at `at` (default: now); returns the number of keys written."""
+        return self._write(set().union(*(lead_contact_keys(lead) for lead in leads)), at)
+
+    def import_outreach_csv(self, path: Path, *, at: float | None = None) -> int:
+        """Backfill from an ``outreach_*.csv`` written by earlier runs (its ``to_email`` column)."""
+        with Path(path).open(newline="", encoding="utf-8") as f:
+            keys = set().union(*(contact_keys(email=row.get("to_email")) for row in csv.DictReader(f)))
+        # Without a recorded send time, the file's age is the best estimate.
+        return self._write(keys, at if at is not None else Path(path).stat().st_mtime)
+
+    def _write(self, keys: set[tuple[str, str]], at: float | None) -> int:
+        if not keys:
+            return 0
+        at = at if at is not None else time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN")
+            # Keep the latest contact time when a key is recorded again.
+            conn.executemany(
+                "INSERT INTO contacted (kind, value, contacted_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (kind, value) DO UPDATE SET contacted_at = max(contacted_at, excluded.contacted_at)",
+                [(kind, value, at) for kind, value in keys],
+            )
+            conn.execute("COMMIT")
+        return len(keys)
+
+    def _recent(self, keys: set[tuple[str, str]], since: float) -> set[tuple[str, str]]:
+        found: set[tuple[str, str]] = set()
+        by_kind: dict[str, list[str]] = {}
+        for kind, value in keys:
+            by_kind.setdefault(kind, []).append(value)
+        with self._connect() as conn:
+            for kind, values in by_kind.items():
+                for start in range(0, len(values), _BATCH):
+                    batch = values[start : start + _BATCH]
+                    marks = ",".join("?" * len(batch))
+                    for (value,) in conn.execute(
+                        f"SELECT value FROM contacted WHERE kind = ? AND value IN ({marks}) AND contacted_at >= ?",
+                        (kind, *batch, since),
+                    ):
+                        found.add((kind, value))
+        return found
+
+
+def open_suppression_index(settings: Settings) -> SuppressionIndex | None:
+    """The contact history when suppression is enabled (`settings.suppress_contacted`)."""
+    if not settings.suppress_contacted:
+        return None
+    return open_contact_history(settings)
+
+
+def open_contact_history(settings: Settings) -> SuppressionIndex:
+    """The contact history under `settings.data_dir`, whether or not suppression is enabled."""
+    return SuppressionIndex(
+        settings.data_dir / "suppression.sqlite3", cooldown_s=settings.contact_cooldown_days * 86400
+    )
@@ -0,0 +1,128 @@
+"""Deterministic synthetic leads for offline load testing.
+
+`generate_leads(n, seed=...)` returns the same `n` leads for the same seed,
+shaped like real directory data rather than the two mock leads the scraper
+falls back to:
+
+- roughly `duplicate_rate` of rows re-list an earlier business. A repeat may
+  be exact, may differ only in the name's case or spacing, or may be a second
+  listing with the same phone. `dedupe_by_company_and_phone` catches these;
+- phones come in several formats: ``(555) 010-0001``, ``555-010-0001``,
+  ``555.010.0001``, ``+1 555 010 0001`` and ``5550100001``;
+- phone, address, website, rating and review count are each missing at
+  realistic rates;
+- websites are plain-HTTP ``*.test`` hosts. Chains share a domain across
+  locations, and some hosts have a ``www.`` prefix or no scheme.
+
+With `ScraperAgent` and ``LEAD_SOURCE=synthetic``, ``--limit`` leads come
+from here instead of Yelp. Pair it with `autoleadgen.webfarm.FakeWebFarm` to
+serve those websites locally.
+"""
+
+from __future__ import annotations
+
+import random
+import re
+from typing import Iterator
+
+from .models import Lead
+
+
+_PREFIXES = (
+    "Sunrise", "Golden Years", "Silver Oaks", "Evergreen", "Harbor View", "Maple Grove", "Pacific",
+    "Brookdale", "Serenity", "Heritage", "Willow Creek", "Cedar Ridge", "Bright Horizons", "Oak Meadow",
+    "Sunset Hills", "Providence", "Valley Vista", "Rosewood", "Lakeside", "Summit",
+)
+_KINDS = (
+    "Senior Care", "Nursing Home", "Assisted Living", "Home Health", "Hospice", "Memory Care",
+    "Care Center", "Senior Living", "Rehabilitation Center", "Adult Day Care",
+)
+_STREETS = ("Main St", "Oak Ave", "Sunset Blvd", "Elm St", "Park Ave", "Lincoln Way", "Broadway", "Maple Dr")
+_CHAINS = ("brightstar-care", "comfort-keepers", "visiting-angels", "home-instead", "right-at-home")
+
+
+def _phone(rng: random.Random, digits: str) -> str:
+    a, b, c = digits[:3], digits[3:6], digits[6:]
+    style = rng.random()
+    if style < 0.55:
+        return f"({a}) {b}-{c}"
+    if style < 0.75:
+        return f"{a}-{b}-{c}"
+    if style < 0.85:
+        return f"{a}.{b}.{c}"
+    if style < 0.95:
+        return f"+1 {a} {b} {c}"
+    return digits
+
+
+def _slug(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+
+def iter_leads(
+    n: int,
+    *,
+    seed: int = 0,
+    location: str = "Los Angeles, CA",
+    duplicate_rate: float = 0.08,
+) -> Iterator[Lead]:
+    """Yield `n` synthetic leads; identical for identical arguments."""
+    rng = random.Random(seed)
+    city = location.split(",")[0].strip()
+    recent: list[Lead] = []
+
+    for i in range(n):
+        if recent and rng.random() < duplicate_rate:
+            yield _duplicate(rng, rng.choice(recent))
+            continue
+
+        name = f"{rng.choice(_PREFIXES)} {rng.choice(_KINDS)} {city} {i}"
+        digits = f"{rng.randint(200, 999)}{i % 1000:03d}{(i // 1000) % 10000:04d}"
+
+        website: str | None = None
+        roll = rng.random()
+        if roll < 0.06:
+            website = f"http://{rng.choice(_CHAINS)}.test/locations/{i}"
+        elif roll < 0.78:
+            host = f"{_slug(name)}.test"
+            form = rng.random()
+            if form < 0.15:
+                host = f"www.{host}"
+            website = host if form > 0.95 else f"http://{host}"
+
+        rating = None if rng.random() < 0.1 else round(rng.triangular(1.0, 5.0, 4.3) * 2) / 2
+        lead = Lead(
+            company_name=name,
+            phone=None if rng.random() < 0.1 else _phone(rng, digits),
+            address=None if rng.random() < 0.15 else f"{rng.randint(10, 9999)} {rng.choice(_STREETS)}, {location}",
+            location=location,
+            website=website,
+            rating=rating,
+            review_count=None if rating is None else min(5000, int(rng.paretovariate(1.2) * 5)),
+            source="synthetic",
+        )
+        recent.append(lead)
+        if len(recent) > 500:
+            recent.pop(0)
+        yield lead
+
+
+def _duplicate(rng: random.Random, lead: Lead) -> Lead:
+    kind = rng.random()
+    if kind < 0.4:
+        return lead.model_copy()
+    if kind < 0.75:
+        # Same business, sloppier name: only case/whitespace differ.
+        return lead.model_copy(update={"company_name": f"{lead.company_name.upper()} "})
+    # Second listing (e.g. a satellite office) sharing the main phone number.
+    return lead.model_copy(update={"company_name": f"{lead.company_name} Annex", "address": None})
+
+
+def generate_leads(
+    n: int,
+    *,
+    seed: int = 0,
+    location: str = "Los Angeles, CA",
+    duplicate_rate: float = 0.08,
+) -> list[Lead]:
+    return list(iter_leads(n, seed=seed, location=location, duplicate_rate=duplicate_rate))
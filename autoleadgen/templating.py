@@ -0,0 +1,141 @@
+"""File-based outreach templates, compiled once and rendered in bulk.
+
+Template files live in ``<templates_dir>/<vertical>/`` and look like::
+
+    Subject: Quick question for {company_name}
+
+    Hi {owner_name|there},
+    ...
+
+``{field}`` substitutes a `QualifiedLead` field (empty when missing),
+``{field|fallback}`` substitutes `fallback` when the field is empty, and
+``{{``/``}}`` are literal braces.
+
+For each lead the most specific template wins: ``tier-<tier>.txt``, then
+``source-<source>.txt``, then ``default.txt`` (names are lower-cased).
+Templates are parsed into constant text and field slots a single time per
+process (`load_template_set` is cached), so rendering is a list join over
+precomputed segments with no parsing, formatting or LLM calls per lead.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterable
+
+from .models import OutreachMessage, QualifiedLead
+
+
+DEFAULT_TEMPLATES_DIR = Path(__file__).resolve().parent / "outreach_templates"
+
+_TOKEN_RE = re.compile(r"\{\{|\}\}|\{([A-Za-z_][A-Za-z0-9_]*)(?:\|([^{}]*))?\}|[{}]")
+_FIELDS = frozenset(QualifiedLead.model_fields)
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    # Constant text between slots: len(literals) == len(slots) + 1.
+    literals: tuple[str, ...]
+    # (field name, fallback) per slot.
+    slots: tuple[tuple[str, str], ...]
+
+    def render(self, values: dict[str, Any]) -> str:
+        if not self.slots:
+            return self.literals[0]
+        parts = [self.literals[0]]
+        for (name, fallback), literal in zip(self.slots, self.literals[1:]):
+            value = values.get(name)
+            parts.append(str(value) if value not in (None, "") else fallback)
+            parts.append(literal)
+        return "".join(parts)
+
+
+def compile_template(text: str) -> CompiledTemplate:
+    literals: list[str] = []
+    slots: list[tuple[str, str]] = []
+    buf: list[str] = []
+    pos = 0
+    for m in _TOKEN_RE.finditer(text):
+        buf.append(text[pos : m.start()])
+        pos = m.end()
+        token = m.group(0)
+        if token in ("{{", "}}"):
+            buf.append(token[0])
+            continue
+        name = m.group(1)
+        if name is None:
+            raise ValueError(f"Unbalanced brace at offset {m.start()} in template")
+        if name not in _FIELDS:
+            raise ValueError(f"Unknown template field {name!r}")
+        literals.append("".join(buf))
+        buf = []
+        slots.append((name, m.group(2) or ""))
+    buf.append(text[pos:])
+    literals.append("".join(buf))
+    return CompiledTemplate(literals=tuple(literals), slots=tuple(slots))
+
+
+@dataclass(frozen=True)
+class OutreachTemplate:
+    name: str
+    subject: CompiledTemplate
+    body: CompiledTemplate
+
+    @classmethod
+    def parse(cls, name: str, text: str) -> "OutreachTemplate":
+        head, sep, body = text.partition("\n\n")
+        if not sep or not head.startswith("Subject:"):
+            raise ValueError(f"Template {name!r} must start with a 'Subject:' line followed by a blank line")
+        return cls(
+            name=name,
+            subject=compile_template(head[len("Subject:") :].strip()),
+            body=compile_template(body.rstrip("\n")),
+        )
+
+
+@dataclass(frozen=True)
+class TemplateSet:
+    templates: dict[str, OutreachTemplate]
+    # Content hash of the template files; changes whenever any copy changes.
+    version: str = ""
+
+    def select(self, lead: QualifiedLead) -> OutreachTemplate:
+        for key in (f"tier-{lead.tier}".lower(), f"source-{lead.source}".lower(), "default"):
+            template = self.templates.get(key)
+            if template is not None:
+                return template
+        raise LookupError("Template set has no 'default' template")
+
+    def render(self, lead: QualifiedLead) -> OutreachMessage:
+        template = self.select(lead)
+        values = lead.__dict__
+        return OutreachMessage(
+            company_name=lead.company_name,
+            to_email=lead.email,
+            subject=template.subject.render(values),
+            body=template.body.render(values),
+        )
+
+    def render_many(self, leads: Iterable[QualifiedLead]) -> list[OutreachMessage]:
+        return [self.render(lead) for lead in leads]
+
+
+@lru_cache(maxsize=None)
+def load_template_set(directory: Path) -> TemplateSet:
+    """Load and compile every ``*.txt`` template in `directory` (cached per path)."""
+    directory = Path(directory)
+    if not directory.is_dir():
+        raise FileNotFoundError(f"Outreach template directory not found: {directory}")
+    templates: dict[str, OutreachTemplate] = {}
+    digest = hashlib.sha256()
+    for path in sorted(directory.glob("*.txt")):
+        text = path.read_text(encoding="utf-8")
+        templates[path.stem.lower()] = OutreachTemplate.parse(path.stem, text)
+        digest.update(f"{path.name}\0{text}\0".encode("utf-8"))
+    if "default" not in templates:
+        raise ValueError(f"{directory} must contain a default.txt template")
+    return TemplateSet(templates=templates, version=digest.hexdigest()[:16])
@@ -0,0 +1,268 @@
+"""Headless-browser fetcher for JavaScript-rendered sites.
+
+`_simple_fetch` only sees the HTML the server sends, which for single-page
+apps is an empty shell. `BrowserPool` renders those pages with Playwright:
+
+- one Chromium instance and at most `concurrency` reusable browser contexts,
+  handed out to callers as they free up;
+- images, fonts and media are aborted at the network layer, since only the
+  DOM text matters for contact extraction;
+- every page gets `page_budget_s` from navigation to returned HTML, or less
+  when the caller passes a smaller `budget_s` (e.g. the time left before its
+  deadline). A page that never reaches network idle is read as-is when its
+  budget runs out, and a page that cannot even finish loading in time yields
+  None.
+
+Playwright's sync API is bound to the thread that started it, but enrichment
+fetches from a thread pool, so the pool runs the async API on its own
+event-loop thread and `fetch` blocks the calling thread on the result.
+Nothing is launched until the first `fetch`; if Playwright or its browser is
+missing, the pool disables itself and `fetch` returns None.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import concurrent.futures
+import importlib.util
+import threading
+from functools import lru_cache
+from typing import Any, Iterable
+
+from ..config import Settings
+
+
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+# Past a caller's budget, time allowed for closing the page before `fetch` gives up on it.
+_CLOSE_GRACE_S = 2.0
+
+_USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+)
+
+
+def playwright_available() -> bool:
+    return importlib.util.find_spec("playwright") is not None
+
+
+class BrowserPool:
+    def __init__(
+        self,
+        *,
+        concurrency: int = 2,
+        page_budget_s: float = 15.0,
+        blocked_resource_types: Iterable[str] = BLOCKED_RESOURCE_TYPES,
+    ) -> None:
+        self.concurrency = max(1, concurrency)
+        self.page_budget_s = page_budget_s
+        self.blocked_resource_types = frozenset(blocked_resource_types)
+        # Set when the browser could not be started; fetch() then returns None.
+        self.unavailable: str | None = None
+        self.renders = 0
+        self.failures = 0
+        self.blocked_requests = 0
+
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        # Owned by the event-loop thread.
+        self._playwright: Any = None
+        self._browser: Any = None
+        self._idle: asyncio.Queue[Any] | None = None
+        self._contexts: list[Any] = []
+        self._created = 0
+
+    def fetch(self, url: str, *, budget_s: float | None = None) -> str | None:
+        """Rendered HTML of `url`, or None if the browser is unavailable or the page failed.
+
+        `budget_s` (seconds, e.g. the time left before the caller's deadline)
+        bounds the whole call: waiting for a free context, then the page,
+        whose own budget is at most `page_budget_s`. Without it, a call may
+        queue for as long as the pool stays busy.
+        """
+        if budget_s is not None and budget_s <= 0:
+            return None
+        loop = self._ensure_started()
+        if loop is None:
+            return None
+        future = asyncio.run_coroutine_threadsafe(self._render(url, budget_s), loop)
+        try:
+            html = future.result(timeout=budget_s + _CLOSE_GRACE_S if budget_s is not None else None)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            html = None
+        with self._lock:
+            if html is None:
+                self.failures += 1
+            else:
+                self.renders += 1
+        return html
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "browser_renders": self.renders,
+                "browser_failures": self.failures,
+                "browser_blocked_requests": self.blocked_requests,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None or thread is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result(timeout=30)
+        except Exception:
+            pass
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=30)
+        loop.close()
+
+    # -- event-loop thread -------------------------------------------------
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop | None:
+        with self._lock:
+            if self.unavailable is not None:
+                return None
+            if self._loop is not None:
+                return self._loop
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="autoleadgen-browser", daemon=True)
+            thread.start()
+            try:
+                asyncio.run_coroutine_threadsafe(self._start(), loop).result(timeout=60)
+            except Exception as e:
+                self.unavailable = f"{type(e).__name__}: {e}"
+                try:
+                    asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result(timeout=30)
+                except Exception:
+                    pass
+                loop.call_soon_threadsafe(loop.stop)
+                thread.join(timeout=30)
+                loop.close()
+                return None
+            self._loop, self._thread = loop, thread
+            return loop
+
+    async def _start(self) -> None:
+        from playwright.async_api import async_playwright
+
+        self._playwright = await async_playwright().start()
+        self._browser = await self._playwright.chromium.launch(headless=True)
+        self._idle = asyncio.Queue()
+
+    async def _shutdown(self) -> None:
+        for ctx in self._contexts:
+            try:
+                await ctx.close()
+            except Exception:
+                pass
+        self._contexts.clear()
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def _acquire(self) -> Any:
+        assert self._idle is not None
+        # Single-threaded loop: no await between the check and the increment.
+        if self._idle.empty() and self._created < self.concurrency:
+            self._created += 1
+            try:
+                ctx = await self._new_context()
+            except BaseException:
+                self._created -= 1
+                raise
+            self._contexts.append(ctx)
+            return ctx
+        return await self._idle.get()
+
+    async def _acquire_within(self, timeout_s: float | None) -> Any:
+        """`_acquire`, raising TimeoutError if no context frees up within `timeout_s`."""
+        if timeout_s is None:
+            return await self._acquire()
+        # Not asyncio.wait_for: before Python 3.12 it can drop a context acquired
+        # just as the timeout fires, shrinking the pool for good.
+        task = asyncio.ensure_future(self._acquire())
+        done, _ = await asyncio.wait({task}, timeout=timeout_s)
+        if task not in done:
+            task.cancel()
+            try:
+                ctx = await task
+            except asyncio.CancelledError:
+                raise TimeoutError("no browser context became free in time") from None
+            assert self._idle is not None
+            self._idle.put_nowait(ctx)  # acquired as time ran out: give it back
+            raise TimeoutError("no browser context became free in time")
+        return task.result()
+
+    async def _new_context(self) -> Any:
+        ctx = await self._browser.new_context(user_agent=_USER_AGENT, service_workers="block")
+        ctx.set_default_timeout(self.page_budget_s * 1000)
+        if self.blocked_resource_types:
+            await ctx.route("**/*", self._route)
+        return ctx
+
+    async def _route(self, route: Any) -> None:
+        if route.request.resource_type in self.blocked_resource_types:
+            with self._lock:
+                self.blocked_requests += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _render(self, url: str, budget_s: float | None = None) -> str | None:
+        loop = asyncio.get_running_loop()
+        caller_deadline = loop.time() + budget_s if budget_s is not None else None
+        try:
+            ctx = await self._acquire_within(budget_s)
+        except Exception:
+            return None
+        page = None
+        try:
+            page = await ctx.new_page()
+            # The page budget starts once a context is ours; queueing for one is not the
+            # page's fault, but it does count against the caller's own budget.
+            deadline = loop.time() + self.page_budget_s
+            if caller_deadline is not None:
+                deadline = min(deadline, caller_deadline)
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                return None
+            await page.goto(url, wait_until="domcontentloaded", timeout=timeout * 1000)
+            remaining = deadline - loop.time()
+            if remaining > 0:
+                try:
+                    await page.wait_for_load_state("networkidle", timeout=remaining * 1000)
+                except Exception:
+                    pass  # still busy at the deadline: take the DOM as it is
+            return await page.content()
+        except Exception:
+            return None
+        finally:
+            if page is not None:
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+            assert self._idle is not None
+            self._idle.put_nowait(ctx)
+
+
+@lru_cache(maxsize=None)
+def _open(concurrency: int, page_budget_s: float) -> BrowserPool:
+    pool = BrowserPool(concurrency=concurrency, page_budget_s=page_budget_s)
+    atexit.register(pool.close)
+    return pool
+
+
+def open_browser_pool(settings: Settings) -> BrowserPool | None:
+    """The browser pool configured by `settings`, shared per process; None when disabled."""
+    if not settings.use_browser or not playwright_available():
+        return None
+    return _open(max(1, settings.browser_concurrency), float(settings.browser_page_budget_s))
@@ -1,36 +1,194 @@
 from __future__ import annotations
 
+import json
+import logging
 import os
 import re
-from typing import Any
-
-import requests
+from typing import TYPE_CHECKING, Any, Callable, Hashable, TypeVar
+from urllib.parse import urlsplit
 
 from ..models import EnrichedLead
-from ..utils import find_emails_in_text, generate_email_guesses
+from ..routing import FETCH, FIRECRAWL, looks_js_rendered
+from ..utils import extract_domain, find_emails_in_text, generate_email_guesses
+from . import http
+
+if TYPE_CHECKING:
+    from ..pagestore import PageStore
+    from ..routing import EnrichmentRouter
+    from .browser import BrowserPool
 
 
 _FIRECRAWL_URL = "https://api.firecrawl.dev/v2/scrape"
 
+T = TypeVar("T")
+
+_log = logging.getLogger(__name__)
+
+
+def _stored(what: str, fn: Callable[[], T], default: T) -> T:
+    """Run a page-store call; a broken store (disk full, locked database...) must not fail enrichment."""
+    try:
+        return fn()
+    except Exception as e:
+        _log.warning("Page store %s failed: %s: %s", what, type(e).__name__, e)
+        return default
+
+
+def _simple_fetch(url: str, store: PageStore | None = None) -> str | None:
+    """GET `url`, served from / saved to `store` when given.
+
+    Stored pages younger than the store's TTL are returned without a request;
+    older ones are revalidated with If-None-Match / If-Modified-Since.
+    """
+    headers = {"User-Agent": "Mozilla/5.0"}
+    cached = _stored("read", lambda: store.get(url), None) if store is not None else None
+    if store is not None and cached is not None:
+        if store.is_fresh(cached) and (text := _stored("read", lambda: store.read_text(cached), None)) is not None:
+            return text
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
 
-def _simple_fetch(url: str) -> str | None:
     try:
-        resp = requests.get(url, timeout=20, headers={"User-Agent": "Mozilla/5.0"})
+        resp = http.get(url, timeout=20, headers=headers)
+        if store is not None and cached is not None and resp.status_code == 304:
+            if (text := _stored("read", lambda: store.read_text(cached), None)) is not None:
+                _stored("write", lambda: store.touch(url), None)
+                return text
+            # Blob missing locally: fetch the full page unconditionally.
+            resp = http.get(url, timeout=20, headers={"User-Agent": "Mozilla/5.0"})
         resp.raise_for_status()
-        return resp.text
     except Exception:
         return None
 
+    if store is not None:
+        etag, last_modified = resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+        _stored("write", lambda: store.put(url, resp.text, etag=etag, last_modified=last_modified), None)
+    return resp.text
+
+
+def _firecrawl_scrape(url: str, api_key: str, store: PageStore | None = None) -> dict[str, Any]:
+    # Firecrawl has no conditional requests; a fresh stored response skips the paid call entirely.
+    key = f"firecrawl:{url}"
+    cached = _stored("read", lambda: store.get(key), None) if store is not None else None
+    if store is not None and cached is not None and store.is_fresh(cached):
+        if (text := _stored("read", lambda: store.read_text(cached), None)) is not None:
+            return json.loads(text)
+
+    headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+    payload: dict[str, Any] = {
+        "url": url,
+        "onlyMainContent": False,
+        "maxAge": 172800000,
+        "formats": [
+            "markdown",
+            {
+                "type": "json",
+                "prompt": (
+                    "Extract contact information from this business site. "
+                    "Return JSON with keys: emails (array of strings), owner_name (string), phone (string)."
+                ),
+            },
+        ],
+    }
+
+    resp = http.post(_FIRECRAWL_URL, json=payload, headers=headers, timeout=30)
+    resp.raise_for_status()
+    data: dict[str, Any] = resp.json()
+    if store is not None and data.get("success"):
+        _stored("write", lambda: store.put(key, json.dumps(data)), None)
+    return data
+
+
+def _render(url: str, browser: BrowserPool, store: PageStore | None = None) -> str | None:
+    # Rendering costs seconds of browser time; a fresh stored render is reused like a Firecrawl response.
+    key = f"rendered:{url}"
+    cached = _stored("read", lambda: store.get(key), None) if store is not None else None
+    if store is not None and cached is not None and store.is_fresh(cached):
+        if (text := _stored("read", lambda: store.read_text(cached), None)) is not None:
+            return text
+
+    # Never render past this thread's deadline; with none set, the pool's page budget applies.
+    left = http.remaining_s()
+    if left is not None and left <= 0:
+        return None
+    html = browser.fetch(url, budget_s=left)
+    if store is not None and html is not None:
+        _stored("write", lambda: store.put(key, html), None)
+    return html
+
+
+def _page_key(website: str) -> str:
+    """`website` as a SingleFlight key.
+
+    The host is lower-cased without ``www.``, and the fragment and trailing
+    slash are dropped. Paths and queries are kept, so a chain's
+    ``/locations/N`` pages stay distinct.
+    """
+    url = website.strip()
+    parts = urlsplit(url if "://" in url else f"http://{url}")
+    host = (parts.netloc or "").lower().removeprefix("www.")
+    path = parts.path.rstrip("/")
+    return f"{host}{path}?{parts.query}" if parts.query else f"{host}{path}"
+
+
+def _once(pages: http.SingleFlight | None, key: Hashable, fn: Callable[[], T]) -> T:
+    return pages.do(key, fn) if pages is not None else fn()
+
+
+def _timed(router: EnrichmentRouter | None, path: str, site: str, fn: Callable[[], T]) -> T:
+    return router.timed(path, site, fn) if router is not None else fn()
+
+
+def _apply_page(lead: EnrichedLead, html: str | None, website: str) -> EnrichedLead:
+    """Fill email/owner_name from a fetched page, falling back to guessed addresses.
+
+    An address read off the site's own page counts as verified, whichever
+    path fetched it (the same evidence as a Firecrawl extraction); only
+    guessed addresses are unverified.
+    """
+    emails = find_emails_in_text(html or "")
+
+    owner_name = guess_owner_name(html)
+    if owner_name and not lead.owner_name:
+        lead = lead.model_copy(update={"owner_name": owner_name})
+
+    if emails and not lead.email:
+        return lead.model_copy(update={"email": emails[0], "email_verified": True})
+
+    if not lead.email:
+        guesses = generate_email_guesses(website)
+        if guesses:
+            return lead.model_copy(update={"email": guesses[0], "email_verified": False})
+
+    return lead
+
 
 def enrich_lead_contact_info(
     lead: EnrichedLead,
     *,
     api_key: str | None = None,
+    pages: http.SingleFlight | None = None,
+    store: PageStore | None = None,
+    router: EnrichmentRouter | None = None,
+    browser: BrowserPool | None = None,
 ) -> EnrichedLead:
     """Try to enrich a lead with email/owner_name.
 
     - If FIRECRAWL_API_KEY is present, use Firecrawl JSON extraction.
     - Otherwise, fall back to a basic HTTP fetch + regex email extraction.
+
+    Pass a run-scoped `pages` SingleFlight so leads sharing a page (keyed by
+    its normalized URL, see `_page_key`) and enriched concurrently fetch it
+    once; with a `store`, later leads get the stored copy.
+    With a `store`, fetched content is kept for later stages and reused or
+    revalidated (304) on the next run instead of downloaded again.
+    With a `router` (and a Firecrawl key), domains likely to be static are
+    tried with the cheap fetch first and only escalate to Firecrawl when the
+    page has no email or looks JavaScript-rendered.
+    With a `browser`, the fallback renders the site headlessly when the plain
+    fetch failed or returned a JavaScript shell without emails.
     """
     api_key = api_key or os.getenv("FIRECRAWL_API_KEY")
 
@@ -38,31 +196,35 @@ def enrich_lead_contact_info(
     if not website:
         # Nothing to scrape; keep as-is.
         return lead
+    site = extract_domain(website) or website
+    # Routing learns per domain, but a chain's location pages are fetched (and coalesced) per URL.
+    page = _page_key(website)
+
+    def fetch_page() -> str | None:
+        return _once(pages, ("fetch", page), lambda: _timed(router, FETCH, site, lambda: _simple_fetch(website, store)))
+
+    html: str | None = None
+    fetched = False
+    if api_key and router is not None and router.plan(site) == FETCH:
+        html, fetched = fetch_page(), True
+        found = bool(find_emails_in_text(html or ""))
+        router.record(FETCH, site, found=found, js_rendered=looks_js_rendered(html))
+        if found:
+            router.resolved_cheaply(site)
+            return _apply_page(lead, html, website)
+        router.escalated(site)
 
     # Firecrawl path
     if api_key:
         try:
-            headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
-            payload: dict[str, Any] = {
-                "url": website,
-                "onlyMainContent": False,
-                "maxAge": 172800000,
-                "formats": [
-                    "markdown",
-                    {
-                        "type": "json",
-                        "prompt": (
-                            "Extract contact information from this business site. "
-                            "Return JSON with keys: emails (array of strings), owner_name (string), phone (string)."
-                        ),
-                    },
-                ],
-            }
-
-            resp = requests.post(_FIRECRAWL_URL, json=payload, headers=headers, timeout=30)
-            resp.raise_for_status()
-            data: dict[str, Any] = resp.json()
+            data: dict[str, Any] = _once(
+                pages,
+                ("firecrawl", page),
+                lambda: _timed(router, FIRECRAWL, site, lambda: _firecrawl_scrape(website, api_key, store)),
+            )
             if not data.get("success"):
+                if router is not None:
+                    router.record(FIRECRAWL, site, found=False)
                 return lead.model_copy(update={"enrichment_notes": f"Firecrawl unsuccessful: {data.get('error')!s}"})
 
             d = data.get("data") or {}
@@ -78,6 +240,8 @@ def enrich_lead_contact_info(
                     emails.append(str(e))
             emails.extend(find_emails_in_text(markdown))
             emails = sorted(set([e.strip() for e in emails if e and "@" in e]))
+            if router is not None:
+                router.record(FIRECRAWL, site, found=bool(emails))
 
             owner_name = None
             if isinstance(json_data, dict):
@@ -95,22 +259,25 @@ def enrich_lead_contact_info(
 
             return lead
         except Exception as e:
+            if router is not None:
+                router.record(FIRECRAWL, site, found=False)
             # fall through to basic scraping
             lead = lead.model_copy(update={"enrichment_notes": f"Firecrawl failed; fallback used: {e}"})
 
     # Fallback path: fetch + regex emails
-    html = _simple_fetch(website)
-    emails = find_emails_in_text(html or "")
-
-    if emails and not lead.email:
-        return lead.model_copy(update={"email": emails[0], "email_verified": False})
-
-    if not lead.email:
-        guesses = generate_email_guesses(website)
-        if guesses:
-            return lead.model_copy(update={"email": guesses[0], "email_verified": False})
-
-    return lead
+    if not fetched:
+        html = fetch_page()
+    out_of_time = (left := http.remaining_s()) is not None and left <= 0
+    if (
+        browser is not None
+        and not out_of_time
+        and not find_emails_in_text(html or "")
+        and (html is None or looks_js_rendered(html))
+    ):
+        rendered = _once(pages, ("browser", page), lambda: _render(website, browser, store))
+        if rendered is not None:
+            html = rendered
+    return _apply_page(lead, html, website)
 
 
 _OWNER_PATTERNS = [
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Callable, Hashable, Iterable, Iterator, TypeVar
+from urllib.parse import urlsplit
+
+
+T = TypeVar("T")
+
+_local = threading.local()
+_limiter: "RateLimiter | None" = None
+_host_limits: tuple[int | None, dict[str, int]] = (None, {})
+_host_slots: dict[str, threading.BoundedSemaphore] = {}
+_host_lock = threading.Lock()
+
+
+class RateLimiter:
+    """Thread-safe token bucket shared by every outbound request in the process."""
+
+    def __init__(self, rate_per_s: float, burst: int | None = None) -> None:
+        if rate_per_s <= 0:
+            raise ValueError("rate_per_s must be positive")
+        self.rate_per_s = rate_per_s
+        self.capacity = float(burst if burst is not None else max(1, int(rate_per_s)))
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: float | None = None) -> bool:
+        """Take a token, waiting for one; False (nothing taken) if that would exceed `timeout` seconds."""
+        give_up_at = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate_per_s)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait_s = (1 - self._tokens) / self.rate_per_s
+            if give_up_at is not None and now + wait_s > give_up_at:
+                return False
+            time.sleep(wait_s)
+
+
+class SingleFlight:
+    """Coalesce concurrent calls by key: the first caller runs `fn`, callers
+    with the same key arriving while it runs get its result (or exception)
+    instead of repeating the work.
+
+    A result is dropped once its last waiter has it, so memory is bounded by
+    the calls in flight, not by everything fetched so far; a later call with
+    the same key runs `fn` again (the page store makes that cheap).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # key -> (call, callers still waiting on it)
+        self._calls: dict[Hashable, tuple[Future[Any], int]] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            call, waiters = self._calls.get(key, (None, 0))
+            owner = call is None
+            if call is None:
+                call = Future()
+            self._calls[key] = (call, waiters + 1)
+        if owner:
+            try:
+                call.set_result(fn())
+            except BaseException as e:
+                call.set_exception(e)
+        try:
+            return call.result()
+        finally:
+            with self._lock:
+                _, waiters = self._calls[key]
+                if waiters == 1:
+                    del self._calls[key]
+                else:
+                    self._calls[key] = (call, waiters - 1)
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+
+def set_rate_limit(rate_per_s: float | None, *, burst: int | None = None) -> None:
+    """Install (or clear, with None/0) the process-wide request rate limit."""
+    global _limiter
+    _limiter = RateLimiter(rate_per_s, burst) if rate_per_s else None
+
+
+def set_host_limits(default: int | None, overrides: Iterable[tuple[str, int]] = ()) -> None:
+    """Cap concurrent in-flight requests per host, process-wide.
+
+    `default` applies to every host (None = unlimited); `overrides` maps
+    specific hosts (e.g. ``api.firecrawl.dev``) to their own cap. Requests
+    over the cap wait for a slot, within their `deadline`.
+    """
+    global _host_limits
+    limits = (default, {host.lower(): n for host, n in overrides})
+    with _host_lock:
+        # Keep the semaphores (and requests holding them) when nothing changed.
+        if limits != _host_limits:
+            _host_limits = limits
+            _host_slots.clear()
+
+
+def _host_slot(url: str) -> threading.BoundedSemaphore | None:
+    default, overrides = _host_limits
+    if default is None and not overrides:
+        return None
+    host = (urlsplit(url).hostname or "").lower()
+    limit = overrides.get(host, default)
+    if not limit or limit <= 0:
+        return None
+    with _host_lock:
+        slot = _host_slots.get(host)
+        if slot is None:
+            slot = _host_slots[host] = threading.BoundedSemaphore(limit)
+        return slot
+
+
+def get_session() -> Any:
+    """Return this thread's pooled `requests.Session`.
+
+    Sessions keep TCP/TLS connections alive between calls, which matters for
+    long-running workers that hit the same hosts job after job. One session per
+    thread sidesteps the fact that `requests.Session` isn't documented as
+    thread-safe.
+    """
+    session = getattr(_local, "session", None)
+    if session is None:
+        import requests
+
+        session = requests.Session()
+        _local.session = session
+    return session
+
+
+@contextmanager
+def deadline(at: float | None) -> Iterator[None]:
+    """Within the block, requests made by this thread must finish by `at` (epoch seconds).
+
+    Per-call timeouts are capped to the time left, and requests started after
+    `at` fail immediately with `TimeoutError`.
+    """
+    previous = getattr(_local, "deadline", None)
+    _local.deadline = at
+    try:
+        yield
+    finally:
+        _local.deadline = previous
+
+
+def remaining_s() -> float | None:
+    """Seconds left before this thread's `deadline`, or None without one."""
+    at = getattr(_local, "deadline", None)
+    return None if at is None else at - time.time()
+
+
+def request(method: str, url: str, **kwargs: Any) -> Any:
+    left = remaining_s()
+    if left is not None and left <= 0:
+        raise TimeoutError(f"Deadline passed before {method} {url}")
+    slot = _host_slot(url)
+    if slot is not None:
+        if not slot.acquire(timeout=max(0.0, left) if left is not None else None):
+            raise TimeoutError(f"Deadline passed waiting for a connection slot for {method} {url}")
+    try:
+        # Neither the slot nor the rate limiter may hold a request past its deadline.
+        if _limiter is not None:
+            left = remaining_s()
+            if not _limiter.acquire(timeout=max(0.0, left) if left is not None else None):
+                raise TimeoutError(f"Deadline would pass waiting for the rate limit before {method} {url}")
+        left = remaining_s()
+        if left is not None:
+            if left <= 0:
+                raise TimeoutError(f"Deadline passed before {method} {url}")
+            timeout = kwargs.get("timeout")
+            if timeout is None or isinstance(timeout, (int, float)):
+                kwargs["timeout"] = left if timeout is None else min(timeout, left)
+        return get_session().request(method, url, **kwargs)
+    finally:
+        if slot is not None:
+            slot.release()
+
+
+def get(url: str, **kwargs: Any) -> Any:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs: Any) -> Any:
+    return request("POST", url, **kwargs)
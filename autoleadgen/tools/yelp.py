@@ -3,9 +3,8 @@ from __future__ import annotations
 import os
 from typing import Any
 
-import requests
-
 from ..models import Lead
+from . import http
 
 
 _API_HOST = "https://api.yelp.com"
@@ -27,7 +26,7 @@ def search_yelp_businesses(
     headers = {"Authorization": f"Bearer {api_key}"}
     params = {"term": term, "location": location, "limit": max(1, min(limit, 50))}
 
-    resp = requests.get(url, headers=headers, params=params, timeout=20)
+    resp = http.get(url, headers=headers, params=params, timeout=20)
     resp.raise_for_status()
     payload: dict[str, Any] = resp.json()
 
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import re
-from typing import Iterable
+from typing import Iterable, TypeVar
 from urllib.parse import urlparse
 
-from .models import EnrichedLead, QualifiedLead
+from .models import EnrichedLead, Lead, QualifiedLead
 
 
+L = TypeVar("L", bound=Lead)
+
 _EMAIL_RE = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b")
 
 
@@ -43,10 +45,14 @@ def find_emails_in_text(text: str | None) -> list[str]:
     return [e for e in emails if not any(s in e.lower() for s in skip)]
 
 
-def score_lead(lead: EnrichedLead) -> QualifiedLead:
-    score = 0
-    reasons: list[str] = []
+# Bump whenever score_lead's weights or tiers change: incremental runs
+# (see autoleadgen.incremental) re-score every stored lead on a new version.
+SCORING_VERSION = 1
 
+
+def _scrape_time_points(lead: Lead) -> int:
+    """`score_lead` points for the fields known before enrichment."""
+    score = 0
     if lead.company_name:
         score += 25
     if lead.phone:
@@ -55,16 +61,23 @@ def score_lead(lead: EnrichedLead) -> QualifiedLead:
         score += 15
     if lead.website:
         score += 10
-    if lead.email:
-        score += 20
-        if lead.email_verified:
-            score += 5
     if lead.rating is not None:
         score += min(10, int(round(lead.rating * 2)))  # 0..10
     if lead.review_count is not None:
         score += min(10, int(lead.review_count / 20))  # 0..10
+    return score
+
+
+def _email_points(lead: Lead) -> int:
+    if not lead.email:
+        return 0
+    return 25 if getattr(lead, "email_verified", False) else 20
 
-    score = max(0, min(score, 100))
+
+def score_lead(lead: EnrichedLead) -> QualifiedLead:
+    reasons: list[str] = []
+
+    score = max(0, min(_scrape_time_points(lead) + _email_points(lead), 100))
 
     if score >= 80:
         tier = "High"
@@ -91,10 +104,21 @@ def score_lead(lead: EnrichedLead) -> QualifiedLead:
     )
 
 
-def dedupe_by_company_and_phone(leads: Iterable[EnrichedLead]) -> list[EnrichedLead]:
+def prescore_lead(lead: Lead) -> int:
+    """Best `score_lead` score `lead` can reach, from scrape-time fields only.
+
+    Uses the same weights, assuming enrichment finds a verified email for any
+    lead with a website to look at. Cheap enough to rank a whole batch before
+    enriching it.
+    """
+    email = _email_points(lead) if lead.email else (25 if lead.website else 0)
+    return max(0, min(_scrape_time_points(lead) + email, 100))
+
+
+def dedupe_by_company_and_phone(leads: Iterable[L]) -> list[L]:
     seen_company: set[str] = set()
     seen_phone: set[str] = set()
-    out: list[EnrichedLead] = []
+    out: list[L] = []
 
     for lead in leads:
         company_key = (lead.company_name or "").strip().lower()
@@ -0,0 +1,167 @@
+"""A local fake web farm for offline enrichment load tests.
+
+`FakeWebFarm` is a small threaded HTTP server that acts as a forward proxy
+for plain-HTTP sites. Point ``HTTP_PROXY`` at it (see `proxy_env`) and every
+``http://<anything>/`` URL that enrichment fetches is answered locally. No
+DNS is used, so the synthetic ``*.test`` hosts from `autoleadgen.synthetic`
+work offline, and each keeps its own domain for per-domain coalescing and
+routing.
+
+The page a host gets is derived from a hash of the seed and host name, so a
+farm is reproducible:
+
+====================  =====  ===============================================
+kind                  share  response
+====================  =====  ===============================================
+``email``             45 %   static page, contact email and often an owner
+``mailto``            15 %   email only inside a ``mailto:`` link
+``no_email``          15 %   static page without any address
+``spa``               10 %   JavaScript shell (what a SPA serves to curl)
+``not_found``          5 %   404
+``error``              5 %   500
+``slow``               5 %   email page after `slow_s` seconds
+====================  =====  ===============================================
+
+Every response waits `latency_s` first. Pages carry an ETag and honour
+If-None-Match, so page-store revalidation (HTTP 304) is exercised too.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import urlsplit
+
+
+_KINDS = (
+    (45, "email"),
+    (60, "mailto"),
+    (75, "no_email"),
+    (85, "spa"),
+    (90, "not_found"),
+    (95, "error"),
+    (100, "slow"),
+)
+_OWNERS = ("Maria Lopez", "James Carter", "Linda Nguyen", "Robert Kim", "Susan Patel", "David Green")
+
+
+class FakeWebFarm:
+    def __init__(
+        self,
+        *,
+        seed: int = 0,
+        latency_s: float = 0.0,
+        slow_s: float = 2.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.seed = seed
+        self.latency_s = latency_s
+        self.slow_s = slow_s
+        self.requests = 0
+        self.not_modified = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def proxy_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def proxy_env(self) -> dict[str, str]:
+        """Environment that routes `requests` traffic for http:// URLs through the farm."""
+        return {"HTTP_PROXY": self.proxy_url, "http_proxy": self.proxy_url, "NO_PROXY": "", "no_proxy": ""}
+
+    def page_kind(self, host: str) -> str:
+        bucket = int.from_bytes(hashlib.sha256(f"{self.seed}:{host}".encode()).digest()[:4], "big") % 100
+        return next(kind for limit, kind in _KINDS if bucket < limit)
+
+    def render(self, host: str) -> tuple[int, bytes]:
+        """Status and body served for `host`."""
+        kind = self.page_kind(host)
+        name = host.removeprefix("www.").removesuffix(".test").replace("-", " ").title()
+        domain = host.removeprefix("www.")
+        if kind == "not_found":
+            return 404, b"<html><body><h1>Not Found</h1></body></html>"
+        if kind == "error":
+            return 500, b"<html><body><h1>Internal Server Error</h1></body></html>"
+        if kind == "spa":
+            return 200, (
+                f'<html><head><title>{name}</title></head><body><div id="root"></div>'
+                '<script src="/static/js/main.js"></script></body></html>'
+            ).encode()
+
+        digest = hashlib.sha256(f"{self.seed}:{host}:owner".encode()).digest()
+        owner = _OWNERS[digest[0] % len(_OWNERS)] if digest[1] % 3 else None
+        contact = {
+            "email": f"<p>Questions? Email us at info@{domain} or call today.</p>",
+            "mailto": f'<p><a href="mailto:admissions@{domain}">Contact admissions</a></p>',
+            "no_email": "<p>Call us to schedule a tour.</p>",
+            "slow": f"<p>Email: office@{domain}</p>",
+        }[kind]
+        owner_html = f"<p>Administrator: {owner}</p>" if owner else ""
+        return 200, (
+            f"<html><head><title>{name}</title></head><body><h1>{name}</h1>"
+            "<p>Compassionate care for your loved ones, 24 hours a day.</p>"
+            f"{owner_html}{contact}</body></html>"
+        ).encode()
+
+    def start(self) -> "FakeWebFarm":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-web-farm", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeWebFarm":
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        farm = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:  # noqa: N802
+                host = (urlsplit(self.path).hostname or self.headers.get("Host", "")).split(":")[0].lower()
+                with farm._lock:
+                    farm.requests += 1
+                if farm.latency_s:
+                    time.sleep(farm.latency_s)
+                if farm.page_kind(host) == "slow":
+                    time.sleep(farm.slow_s)
+
+                status, body = farm.render(host)
+                etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+                if status == 200 and self.headers.get("If-None-Match") == etag:
+                    with farm._lock:
+                        farm.not_modified += 1
+                    self._send(304, b"", etag)
+                else:
+                    self._send(status, body, etag if status == 200 else None)
+
+            def _send(self, status: int, body: bytes, etag: str | None) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                if etag:
+                    self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        return Handler
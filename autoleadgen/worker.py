@@ -0,0 +1,272 @@
+"""Long-running worker mode.
+
+Instead of one cold CLI process per pipeline run, a worker keeps a single
+`LeadGenerationPipeline` (compiled graph, pooled HTTP sessions, caches) alive
+and pulls jobs from a local SQLite queue, running several concurrently under a
+process-wide request rate limit. Each job writes its CSVs and a `summary.json`
+to its own directory under `<data_dir>/jobs/<job_id>/`.
+
+A running job holds a lease that its worker renews while the job runs. If
+the worker dies, the lease lapses after `lease_s` and the next `claim`
+puts the job back in the queue.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from .pipeline import LeadGenerationPipeline
+from .tools import http
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    query TEXT,
+    location TEXT,
+    "limit" INTEGER,
+    enrich INTEGER NOT NULL DEFAULT 1,
+    qualify INTEGER NOT NULL DEFAULT 1,
+    generate_campaigns INTEGER NOT NULL DEFAULT 1,
+    status TEXT NOT NULL DEFAULT 'queued',
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    heartbeat_at TEXT,
+    finished_at TEXT,
+    error TEXT,
+    summary TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status_id ON jobs (status, id);
+"""
+
+
+def _now(offset_s: float = 0.0) -> str:
+    return (datetime.now(UTC) + timedelta(seconds=offset_s)).isoformat(timespec="seconds")
+
+
+@dataclass(frozen=True)
+class Job:
+    id: int
+    query: str | None = None
+    location: str | None = None
+    limit: int | None = None
+    enrich: bool = True
+    qualify: bool = True
+    generate_campaigns: bool = True
+    status: str = "queued"
+    error: str | None = None
+    summary: dict[str, Any] | None = None
+
+
+class JobQueue:
+    """SQLite-backed job queue, safe to share between threads and processes.
+
+    Every operation opens its own short-lived connection, and claiming a job
+    happens inside a `BEGIN IMMEDIATE` transaction so two workers never pick up
+    the same row. A running job not renewed by `heartbeat` for `lease_s`
+    seconds is requeued by the next `claim`.
+    """
+
+    def __init__(self, path: Path, *, lease_s: float = 600.0) -> None:
+        self.path = Path(path)
+        self.lease_s = lease_s
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "heartbeat_at" not in columns:  # queues created before leases
+                conn.execute("ALTER TABLE jobs ADD COLUMN heartbeat_at TEXT")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+        finally:
+            conn.close()
+
+    def enqueue(
+        self,
+        *,
+        query: str | None = None,
+        location: str | None = None,
+        limit: int | None = None,
+        enrich: bool = True,
+        qualify: bool = True,
+        generate_campaigns: bool = True,
+    ) -> int:
+        with self._connect() as conn:
+            cur = conn.execute(
+                'INSERT INTO jobs (query, location, "limit", enrich, qualify, generate_campaigns, created_at)'
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (query, location, limit, int(enrich), int(qualify), int(generate_campaigns), _now()),
+            )
+            return int(cur.lastrowid)
+
+    def claim(self) -> Job | None:
+        """Atomically mark the oldest queued job as running and return it.
+
+        Running jobs whose lease lapsed (their worker died) are requeued first.
+        """
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "UPDATE jobs SET status = 'queued', started_at = NULL, heartbeat_at = NULL"
+                    " WHERE status = 'running' AND COALESCE(heartbeat_at, started_at) < ?",
+                    (_now(-self.lease_s),),
+                )
+                row = conn.execute("SELECT * FROM jobs WHERE status = 'queued' ORDER BY id LIMIT 1").fetchone()
+                if row is not None:
+                    now = _now()
+                    conn.execute(
+                        "UPDATE jobs SET status = 'running', started_at = ?, heartbeat_at = ? WHERE id = ?",
+                        (now, now, row["id"]),
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return _row_to_job(row, status="running") if row is not None else None
+
+    def heartbeat(self, job_ids: Iterable[int]) -> None:
+        """Renew the lease of running jobs `job_ids`."""
+        ids = list(job_ids)
+        if not ids:
+            return
+        with self._connect() as conn:
+            conn.execute(
+                f"UPDATE jobs SET heartbeat_at = ? WHERE status = 'running' AND id IN ({','.join('?' * len(ids))})",
+                (_now(), *ids),
+            )
+
+    def complete(self, job_id: int, summary: dict[str, Any]) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'done', finished_at = ?, summary = ? WHERE id = ?",
+                (_now(), json.dumps(summary), job_id),
+            )
+
+    def fail(self, job_id: int, error: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', finished_at = ?, error = ? WHERE id = ?",
+                (_now(), error[:2000], job_id),
+            )
+
+    def get(self, job_id: int) -> Job | None:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _row_to_job(row) if row is not None else None
+
+    def counts(self) -> dict[str, int]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        return {r["status"]: int(r["n"]) for r in rows}
+
+
+def _row_to_job(row: sqlite3.Row, *, status: str | None = None) -> Job:
+    return Job(
+        id=int(row["id"]),
+        query=row["query"],
+        location=row["location"],
+        limit=row["limit"],
+        enrich=bool(row["enrich"]),
+        qualify=bool(row["qualify"]),
+        generate_campaigns=bool(row["generate_campaigns"]),
+        status=status or row["status"],
+        error=row["error"],
+        summary=json.loads(row["summary"]) if row["summary"] else None,
+    )
+
+
+@dataclass
+class Worker:
+    pipeline: LeadGenerationPipeline
+    queue: JobQueue
+    concurrency: int = 4
+    rate_limit_per_s: float | None = None
+    poll_interval_s: float = 1.0
+
+    def __post_init__(self) -> None:
+        self._stop = threading.Event()
+
+    def stop(self) -> None:
+        """Stop claiming new jobs; in-flight jobs are allowed to finish."""
+        self._stop.set()
+
+    def run(self, *, drain: bool = False) -> int:
+        """Process jobs until stopped (or, with `drain`, until the queue is empty).
+
+        Returns the number of jobs processed.
+        """
+        http.set_rate_limit(self.rate_limit_per_s)
+        processed = 0
+        in_flight: dict[Future[None], int] = {}
+        # Renew leases well before they lapse, but not on every poll.
+        heartbeat_every = max(self.poll_interval_s, self.queue.lease_s / 4)
+        last_heartbeat = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=max(1, self.concurrency), thread_name_prefix="autoleadgen-job") as pool:
+            while True:
+                while not self._stop.is_set() and len(in_flight) < max(1, self.concurrency):
+                    job = self.queue.claim()
+                    if job is None:
+                        break
+                    in_flight[pool.submit(self.run_job, job)] = job.id
+
+                if not in_flight:
+                    if self._stop.is_set() or drain:
+                        break
+                    self._stop.wait(self.poll_interval_s)
+                    continue
+
+                done, _ = wait(in_flight, timeout=self.poll_interval_s, return_when=FIRST_COMPLETED)
+                for future in done:
+                    del in_flight[future]
+                processed += len(done)
+                if in_flight and time.monotonic() - last_heartbeat >= heartbeat_every:
+                    self.queue.heartbeat(in_flight.values())
+                    last_heartbeat = time.monotonic()
+
+        return processed
+
+    def run_job(self, job: Job) -> None:
+        output_dir = self.pipeline.settings.data_dir / "jobs" / str(job.id)
+        started = time.perf_counter()
+        try:
+            result = self.pipeline.execute(
+                query=job.query,
+                location=job.location,
+                limit=job.limit,
+                enrich=job.enrich,
+                qualify=job.qualify,
+                generate_campaigns=job.generate_campaigns,
+                output_dir=output_dir,
+            )
+        except Exception as e:
+            self.queue.fail(job.id, f"{type(e).__name__}: {e}")
+            return
+
+        summary = {
+            "job": {k: v for k, v in asdict(job).items() if k not in {"status", "error", "summary"}},
+            "leads": len(result.leads),
+            "enriched_leads": len(result.enriched_leads),
+            "qualified_leads": len(result.qualified_leads),
+            "outreach": len(result.outreach),
+            "stats": result.stats,
+            "elapsed_s": round(time.perf_counter() - started, 3),
+        }
+        (output_dir / "summary.json").write_text(json.dumps(summary, indent=2), encoding="utf-8")
+        self.queue.complete(job.id, summary)
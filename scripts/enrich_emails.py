@@ -1,31 +1,35 @@
 from __future__ import annotations
 
 import argparse
-import pandas as pd
+from pathlib import Path
 
+from autoleadgen.bulk import enrich_csv
 from autoleadgen.config import load_settings
-from autoleadgen.models import EnrichedLead
-from autoleadgen.tools.firecrawl import enrich_lead_contact_info
 
 
 def main() -> int:
     p = argparse.ArgumentParser(description="Enrich a CSV of leads with emails")
     p.add_argument("--input", required=True)
     p.add_argument("--output", required=True)
-    p.add_argument("--max", type=int, default=50)
+    p.add_argument("--max", type=int, default=50, help="Max input rows to process (0 = all)")
+    p.add_argument("--chunk-size", type=int, default=500, help="Rows read, enriched and written per chunk")
+    p.add_argument("--no-resume", action="store_true", help="Overwrite --output instead of resuming it")
     args = p.parse_args()
 
-    settings = load_settings()
-    df = pd.read_csv(args.input)
-    df = df.head(args.max)
-
-    out_rows = []
-    for _, row in df.iterrows():
-        lead = EnrichedLead(**{k: (None if pd.isna(v) else v) for k, v in row.to_dict().items()})
-        out_rows.append(enrich_lead_contact_info(lead, api_key=settings.firecrawl_api_key).model_dump())
-
-    pd.DataFrame(out_rows).to_csv(args.output, index=False)
-    print(f"Wrote {len(out_rows)} enriched leads to {args.output}")
+    result = enrich_csv(
+        Path(args.input),
+        Path(args.output),
+        settings=load_settings(),
+        chunk_size=args.chunk_size,
+        max_rows=args.max or None,
+        resume=not args.no_resume,
+    )
+
+    if result.rows_resumed:
+        print(f"Resumed after {result.rows_resumed} previously written rows")
+    print(f"Wrote {result.rows_enriched} enriched leads to {args.output}")
+    if result.rows_invalid:
+        print(f"Passed through {result.rows_invalid} invalid rows unchanged")
     return 0
 
 
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import argparse
+import os
+import resource
+import tempfile
+import time
+from dataclasses import replace
+from pathlib import Path
+
+from autoleadgen.config import load_settings
+from autoleadgen.pipeline import LeadGenerationPipeline
+from autoleadgen.webfarm import FakeWebFarm
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Load-test the full pipeline offline on synthetic leads")
+    p.add_argument("--leads", type=int, default=100_000)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--latency-ms", type=float, default=20.0, help="Added to every fake-site response")
+    p.add_argument("--slow-s", type=float, default=2.0, help="Response time of the 'slow' sites")
+    p.add_argument("--concurrency", type=int, default=32, help="Concurrent site fetches")
+    p.add_argument("--processes", type=int, default=1)
+    p.add_argument("--no-enrich", action="store_true")
+    p.add_argument("--no-langgraph", action="store_true")
+    p.add_argument("--data-dir", default=None, help="Project root for data/ (default: a temporary directory)")
+    args = p.parse_args()
+
+    root = Path(args.data_dir) if args.data_dir else Path(tempfile.mkdtemp(prefix="autoleadgen-load-"))
+    settings = replace(
+        load_settings(),
+        lead_source="synthetic",
+        synthetic_seed=args.seed,
+        project_root=root,
+        # Stay offline and free: no paid APIs, and no browser (it doesn't use HTTP_PROXY).
+        firecrawl_api_key=None,
+        outreach_llm="template",
+        use_browser=False,
+        use_langgraph=not args.no_langgraph,
+        enrich_concurrency=args.concurrency,
+        processes=args.processes,
+    )
+
+    with FakeWebFarm(seed=args.seed, latency_s=args.latency_ms / 1000, slow_s=args.slow_s) as farm:
+        os.environ.update(farm.proxy_env())
+        pipeline = LeadGenerationPipeline(settings)
+        started = time.perf_counter()
+        try:
+            result = pipeline.execute(limit=args.leads, enrich=not args.no_enrich, output_dir=root / "data")
+        finally:
+            pipeline.close()
+        elapsed = time.perf_counter() - started
+
+    with_email = sum(1 for l in result.enriched_leads if l.email)
+    verified = sum(1 for l in result.enriched_leads if l.email_verified)
+    high = sum(1 for l in result.qualified_leads if l.tier == "High")
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    print(f"Leads: {len(result.leads)} ({len(result.enriched_leads)} after dedupe)")
+    print(f"Emails: {with_email} ({verified} verified)")
+    print(f"High tier: {high}")
+    print(f"Outreach messages: {len(result.outreach)}")
+    print(f"Site requests: {farm.requests} ({farm.not_modified} not modified)")
+    print(f"Elapsed: {elapsed:.1f}s ({len(result.leads) / elapsed:.0f} leads/s)")
+    print(f"Peak RSS: {peak_mb:.0f} MB")
+    print(f"Outputs: {root / 'data'}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
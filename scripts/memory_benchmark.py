@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import argparse
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+from dataclasses import replace
+from pathlib import Path
+
+from autoleadgen.config import load_settings
+from autoleadgen.pipeline import LeadGenerationPipeline
+from autoleadgen.webfarm import FakeWebFarm
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Measure pipeline peak memory on synthetic leads (offline)")
+    p.add_argument("--leads", type=int, default=100_000)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--engine", choices=["sequential", "langgraph", "both"], default="both")
+    p.add_argument(
+        "--enrich-leads",
+        type=int,
+        default=5_000,
+        help="Also measure a run with enrichment (against a local fake web farm) on this many leads; 0 to skip",
+    )
+    args = p.parse_args()
+
+    engines = ["sequential", "langgraph"] if args.engine == "both" else [args.engine]
+    root = Path(tempfile.mkdtemp(prefix="autoleadgen-mem-"))
+    base = replace(
+        load_settings(),
+        lead_source="synthetic",
+        synthetic_seed=args.seed,
+        project_root=root,
+        outreach_llm="template",
+        use_browser=False,
+    )
+    # Import-time allocations (LangGraph, templates) would otherwise count toward the first run.
+    LeadGenerationPipeline(replace(base, use_langgraph=True)).execute(limit=10, enrich=False, output_dir=root / "warmup")
+
+    print(f"{'engine':<12}{'enrich':<8}{'leads':>9}{'peak MB':>10}{'held MB':>10}{'seconds':>9}")
+    for engine in engines:
+        settings = replace(base, use_langgraph=engine == "langgraph")
+        # Without enrichment the numbers measure data handling, not fetching.
+        _measure(settings, engine, args.leads, enrich=False, output_dir=root / engine)
+        if args.enrich_leads:
+            # Fetched pages must not pile up in memory as the run goes on (they live in the page store).
+            with FakeWebFarm(seed=args.seed, slow_s=0.05) as farm:
+                os.environ.update(farm.proxy_env())
+                _measure(settings, engine, args.enrich_leads, enrich=True, output_dir=root / f"{engine}-enrich")
+    return 0
+
+
+def _measure(settings, engine: str, leads: int, *, enrich: bool, output_dir: Path) -> None:
+    pipeline = LeadGenerationPipeline(settings)
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = pipeline.execute(limit=leads, enrich=enrich, output_dir=output_dir)
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    label = "yes" if enrich else "no"
+    print(f"{engine:<12}{label:<8}{len(result.leads):>9}{peak / 2**20:>10.0f}{held / 2**20:>10.0f}{elapsed:>9.1f}")
+    pipeline.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
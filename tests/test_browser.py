@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from dataclasses import replace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from autoleadgen.config import Settings
+from autoleadgen.models import EnrichedLead
+from autoleadgen.pagestore import PageStore
+from autoleadgen.tools import firecrawl, http
+from autoleadgen.tools import browser as browser_module
+from autoleadgen.tools.browser import BrowserPool, open_browser_pool
+
+SPA = (
+    b'<html><body><div id="root"></div>'
+    b'<img src="/logo.png">'
+    b"<script>document.getElementById('root').innerHTML = 'Write to ' + 'admissions' + '@spa-care.test';</script>"
+    b"</body></html>"
+)
+STATIC = "<html><body><p>Call or email front-desk@static-care.test</p></body></html>"
+
+
+class FakeBrowser:
+    def __init__(self, html: str | None) -> None:
+        self.html = html
+        self.calls: list[str] = []
+        self.budgets: list[float | None] = []
+
+    def fetch(self, url: str, *, budget_s: float | None = None) -> str | None:
+        self.calls.append(url)
+        self.budgets.append(budget_s)
+        return self.html
+
+
+def test_fallback_renders_js_shell(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(firecrawl, "_simple_fetch", lambda url, store=None: SPA.decode())
+    browser = FakeBrowser("<div id='root'>Write to admissions@spa-care.test</div>")
+    store = PageStore(tmp_path / "pages")
+    lead = EnrichedLead(company_name="SPA Care", website="https://spa-care.test")
+
+    enriched = firecrawl.enrich_lead_contact_info(lead, api_key="", browser=browser, store=store)
+
+    assert browser.calls == ["https://spa-care.test"]
+    assert enriched.email == "admissions@spa-care.test"
+    assert "admissions@spa-care.test" in (store.page_text("https://spa-care.test") or "")
+
+    # A fresh stored render is reused without touching the browser again.
+    firecrawl.enrich_lead_contact_info(lead, api_key="", browser=browser, store=store)
+    assert browser.calls == ["https://spa-care.test"]
+
+
+def test_fallback_skips_browser_for_static_pages(monkeypatch) -> None:
+    monkeypatch.setattr(firecrawl, "_simple_fetch", lambda url, store=None: STATIC)
+    browser = FakeBrowser(None)
+
+    enriched = firecrawl.enrich_lead_contact_info(
+        EnrichedLead(company_name="Static Care", website="https://static-care.test"), api_key="", browser=browser
+    )
+
+    assert browser.calls == []
+    assert enriched.email == "front-desk@static-care.test" and enriched.email_verified
+
+
+def test_render_is_capped_by_the_thread_deadline() -> None:
+    browser = FakeBrowser("<p>ok</p>")
+
+    with http.deadline(time.time() + 3):
+        assert firecrawl._render("https://spa-care.test", browser) == "<p>ok</p>"
+    with http.deadline(time.time() - 1):
+        assert firecrawl._render("https://late-care.test", browser) is None
+    firecrawl._render("https://spa-care.test", browser)
+
+    assert browser.calls == ["https://spa-care.test", "https://spa-care.test"]
+    assert 0 < browser.budgets[0] <= 3 and browser.budgets[1] is None
+
+
+def test_open_browser_pool_respects_settings() -> None:
+    assert open_browser_pool(replace(Settings(), use_browser=False)) is None
+
+
+@pytest.fixture
+def fixture_site():
+    hits: list[str] = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802
+            hits.append(self.path)
+            if self.path == "/slow":
+                time.sleep(5)
+            body = SPA if self.path in ("/", "/slow") else b""
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html" if body else "image/png")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", hits
+    server.shutdown()
+
+
+def test_browser_pool_renders_local_fixture(fixture_site) -> None:
+    pytest.importorskip("playwright")
+    base, hits = fixture_site
+    pool = BrowserPool(concurrency=2, page_budget_s=2.0)
+    try:
+        html = pool.fetch(f"{base}/")
+        if pool.unavailable:
+            pytest.skip(f"browser not installed: {pool.unavailable.splitlines()[0]}")
+
+        assert html is not None and "admissions@spa-care.test" in html
+        assert "/logo.png" not in hits  # images are aborted before reaching the server
+        assert pool.stats()["browser_blocked_requests"] >= 1
+
+        started = time.monotonic()
+        assert pool.fetch(f"{base}/slow") is None
+        assert time.monotonic() - started < 4.5
+    finally:
+        pool.close()
+
+
+def test_saturated_pool_gives_up_within_the_callers_budget(monkeypatch) -> None:
+    pool = BrowserPool(concurrency=1)
+
+    async def saturated() -> None:
+        pool._idle = asyncio.Queue()
+        pool._created = pool.concurrency  # the only context is busy
+        with pytest.raises(TimeoutError):
+            await pool._acquire_within(0.05)
+        pool._idle.put_nowait("ctx")
+        assert await pool._acquire_within(0.05) == "ctx"
+
+    asyncio.run(saturated())
+
+    # fetch() itself doesn't block past the budget, whatever the event loop is doing.
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    async def stuck(url: str, budget_s: float | None = None) -> str:
+        await asyncio.sleep(5)
+        return "<p>late</p>"
+
+    monkeypatch.setattr(browser_module, "_CLOSE_GRACE_S", 0.05)
+    monkeypatch.setattr(pool, "_ensure_started", lambda: loop)
+    monkeypatch.setattr(pool, "_render", stuck)
+    try:
+        started = time.monotonic()
+        assert pool.fetch("https://busy.test", budget_s=0.1) is None
+        assert time.monotonic() - started < 1
+        assert pool.stats()["browser_failures"] == 1
+    finally:
+        # Let the cancelled render unwind before stopping the loop.
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0.01), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import csv
+from pathlib import Path
+
+from autoleadgen.bulk import FIELDNAMES, enrich_csv
+from autoleadgen.config import Settings
+
+
+def _write_input(path: Path, n: int) -> None:
+    with path.open("w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=["company_name", "phone", "rating", "website", "crm_id"])
+        w.writeheader()
+        for i in range(n):
+            w.writerow({"company_name": f"Lead {i}" if i != 3 else "", "phone": f"555-{i:04d}", "rating": "4.5", "crm_id": i})
+
+
+def _read(path: Path) -> list[dict[str, str]]:
+    with path.open(newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def test_enrich_csv_streams_in_chunks_and_keeps_row_order(tmp_path: Path) -> None:
+    src, dst = tmp_path / "in.csv", tmp_path / "out.csv"
+    _write_input(src, 7)
+
+    result = enrich_csv(src, dst, settings=Settings(project_root=tmp_path), chunk_size=3)
+
+    rows = _read(dst)
+    assert list(rows[0]) == FIELDNAMES
+    assert [r["phone"] for r in rows] == [f"555-{i:04d}" for i in range(7)]
+    assert (result.rows_enriched, result.rows_invalid) == (6, 1)
+    assert "invalid input row" in rows[3]["enrichment_notes"]
+
+
+def test_enrich_csv_resumes_after_last_complete_row(tmp_path: Path) -> None:
+    src, dst = tmp_path / "in.csv", tmp_path / "out.csv"
+    _write_input(src, 10)
+    enrich_csv(src, dst, settings=Settings(project_root=tmp_path), chunk_size=4, max_rows=4)
+    with dst.open("a", encoding="utf-8") as f:
+        f.write("Lead 4,,,")  # torn row from an interrupted run
+
+    result = enrich_csv(src, dst, settings=Settings(project_root=tmp_path), chunk_size=4)
+
+    assert result.rows_resumed == 4
+    assert [r["phone"] for r in _read(dst)] == [f"555-{i:04d}" for i in range(10)]
+
+
+def test_resume_trims_a_row_torn_inside_a_multiline_field(tmp_path: Path) -> None:
+    src, dst = tmp_path / "in.csv", tmp_path / "out.csv"
+    _write_input(src, 6)
+    with dst.open("w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=FIELDNAMES)
+        w.writeheader()
+        w.writerow({"company_name": "Lead 0", "phone": "555-0000", "enrichment_notes": "line one\nline two"})
+        # Interrupted after the line break inside a quoted field: looks like a whole line.
+        f.write('Lead 1,,555-0001,,,,,,,,"partial\r\n')
+
+    result = enrich_csv(src, dst, settings=Settings(project_root=tmp_path), chunk_size=4)
+
+    rows = _read(dst)
+    assert result.rows_resumed == 1
+    assert rows[0]["enrichment_notes"] == "line one\nline two"
+    assert [r["phone"] for r in rows] == [f"555-{i:04d}" for i in range(6)]
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import pytest
+
+from autoleadgen.agents import EnrichmentAgent
+from autoleadgen.agents.enrichment import BUDGET_EXHAUSTED_NOTE
+from autoleadgen.config import Settings
+from autoleadgen.deadline import Deadline, RunBudget
+from autoleadgen.models import Lead
+from autoleadgen.pipeline import LeadGenerationPipeline
+from autoleadgen.tools import firecrawl, http
+
+
+def test_enrichment_stops_starting_fetches_at_deadline(monkeypatch, tmp_path: Path) -> None:
+    def slow_fetch(url: str, store=None) -> str:
+        time.sleep(0.2)
+        return f"<p>hello@{url.split('/')[2]}</p>"
+
+    monkeypatch.setattr(firecrawl, "_simple_fetch", slow_fetch)
+    leads = [Lead(company_name=f"Care {i}", website=f"https://care{i}.test") for i in range(10)]
+    settings = Settings(enrich_concurrency=1, use_page_store=False, use_browser=False, project_root=tmp_path)
+    stats: dict = {}
+
+    started = time.monotonic()
+    enriched = EnrichmentAgent(settings).enrich_batch(leads, stats, deadline=Deadline.after(0.5))
+
+    assert time.monotonic() - started < 1.0
+    assert [e.company_name for e in enriched] == [l.company_name for l in leads]
+    skipped = [e for e in enriched if e.enrichment_notes == BUDGET_EXHAUSTED_NOTE]
+    assert 0 < len(skipped) < len(leads)
+    assert all(e.email is None for e in skipped)
+    assert stats["enrich_budget_skipped"] == len(skipped)
+
+
+def test_http_deadline_caps_timeouts(monkeypatch) -> None:
+    seen: list[float] = []
+
+    class FakeSession:
+        def request(self, method, url, **kwargs):
+            seen.append(kwargs["timeout"])
+
+    monkeypatch.setattr(http, "get_session", lambda: FakeSession())
+
+    with http.deadline(time.time() + 2):
+        http.get("https://example.test", timeout=30)
+    http.get("https://example.test", timeout=30)
+    assert seen[0] <= 2 and seen[1] == 30
+
+    with http.deadline(time.time() - 1), pytest.raises(TimeoutError):
+        http.get("https://example.test", timeout=30)
+
+
+@pytest.mark.parametrize("use_langgraph", [False, True])
+def test_pipeline_finishes_with_partial_output_when_out_of_time(tmp_path: Path, use_langgraph: bool) -> None:
+    pipeline = LeadGenerationPipeline(
+        Settings(use_langgraph=use_langgraph, use_page_store=False, use_browser=False, project_root=tmp_path)
+    )
+
+    result = pipeline.execute(limit=5, output_dir=tmp_path, deadline_s=0)
+
+    with_site = [l for l in result.enriched_leads if l.website]
+    assert with_site and all(l.enrichment_notes == BUDGET_EXHAUSTED_NOTE for l in with_site)
+    assert result.stats["enrich_budget_skipped"] == len(with_site)
+    # Qualification and template outreach still cover every lead.
+    assert len(result.qualified_leads) == len(result.enriched_leads)
+    assert len(result.outreach) == len(result.qualified_leads)
+
+
+def test_stage_budget_is_capped_by_run_deadline() -> None:
+    budget = RunBudget.start(1.0, {"enrich": 60.0})
+    enrich = budget.for_stage("enrich")
+    assert enrich is not None and enrich.at == budget.deadline.at
+    assert RunBudget.start(None, {"outreach": 5.0}).for_stage("enrich") is None
+    with pytest.raises(ValueError):
+        RunBudget.start(None, {"qualify": 1.0})
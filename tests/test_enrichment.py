@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+
+from autoleadgen.agents import EnrichmentAgent
+from autoleadgen.config import Settings
+from autoleadgen.models import EnrichedLead, Lead
+from autoleadgen.pipeline import LeadGenerationPipeline
+from autoleadgen.tools import firecrawl, http
+
+
+def test_enrich_batch_fetches_each_page_once(monkeypatch) -> None:
+    calls: list[str] = []
+    lock = threading.Lock()
+
+    def fake_fetch(url: str, store=None) -> str:
+        with lock:
+            calls.append(url)
+        time.sleep(0.05)  # keep the first fetch in flight while the others arrive
+        path = url.split("#")[0].rstrip("/").rsplit("/", 1)[-1]
+        return f"<p>Reach us at office-{path}@sunrise-care.net</p>"
+
+    monkeypatch.setattr(firecrawl, "_simple_fetch", fake_fetch)
+    # The same page under different spellings is fetched once; each chain location is its own page.
+    sites = [
+        "https://www.sunrise-care.net/loc/1",
+        "https://sunrise-care.net/loc/1/",
+        "https://Sunrise-Care.net/loc/1",
+        "https://www.sunrise-care.net/loc/2",
+        "https://www.sunrise-care.net/loc/2#contact",
+        "https://other.net",
+    ]
+    leads = [Lead(company_name=f"Care #{i}", website=site) for i, site in enumerate(sites)]
+
+    enriched = EnrichmentAgent(Settings(enrich_concurrency=4, use_page_store=False)).enrich_batch(leads)
+
+    assert len(calls) == 3
+    assert [e.company_name for e in enriched] == [l.company_name for l in leads]
+    assert [e.email for e in enriched[:5]] == [f"office-{n}@sunrise-care.net" for n in (1, 1, 1, 2, 2)]
+
+
+def test_pipeline_dedupes_before_enrichment(monkeypatch, tmp_path: Path) -> None:
+    dupes = [
+        Lead(company_name="Golden Years", phone="(555) 200-0001", website="https://golden.net"),
+        Lead(company_name="golden years ", phone="(555) 200-0002", website="https://golden.net"),
+        Lead(company_name="Golden Years Annex", phone="(555) 200-0001", website="https://annex.net"),
+    ]
+    seen: list[list[str]] = []
+
+    def fake_enrich(self, leads, stats=None, **_):
+        seen.append([l.company_name for l in leads])
+        return [EnrichedLead(**l.model_dump()) for l in leads]
+
+    monkeypatch.setattr("autoleadgen.agents.ScraperAgent.discover_leads", lambda self, **_: dupes)
+    monkeypatch.setattr(EnrichmentAgent, "enrich_batch", fake_enrich)
+
+    for use_langgraph in (False, True):
+        pipeline = LeadGenerationPipeline(Settings(use_langgraph=use_langgraph))
+        result = pipeline.execute(generate_campaigns=False, output_dir=tmp_path)
+        assert [e.company_name for e in result.enriched_leads] == ["Golden Years"]
+
+    assert seen == [["Golden Years"], ["Golden Years"]]
+
+
+def test_single_flight_shares_in_flight_calls_and_then_forgets_them() -> None:
+    flight = http.SingleFlight()
+    calls: list[int] = []
+    started = threading.Event()
+
+    def slow() -> int:
+        calls.append(1)
+        started.set()
+        time.sleep(0.05)
+        return len(calls)
+
+    first = threading.Thread(target=flight.do, args=("page", slow))
+    first.start()
+    started.wait()
+    assert flight.do("page", slow) == 1  # joined the call in flight
+    first.join()
+
+    # Nothing is held once every waiter has its result; a later call runs again.
+    assert len(flight) == 0
+    assert flight.do("page", slow) == 2
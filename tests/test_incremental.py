@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+
+from autoleadgen.config import Settings
+from autoleadgen.incremental import IncrementalCache
+from autoleadgen.models import EnrichedLead, OutreachMessage, QualifiedLead
+from autoleadgen.pipeline import LeadGenerationPipeline
+from autoleadgen.sharding import merge_shards, split_shards
+from autoleadgen.templating import DEFAULT_TEMPLATES_DIR, load_template_set
+from autoleadgen.utils import score_lead
+
+
+def test_unchanged_leads_are_skipped_on_rerun(tmp_path: Path) -> None:
+    templates = tmp_path / "templates"
+    shutil.copytree(DEFAULT_TEMPLATES_DIR, templates)
+    settings = Settings(use_langgraph=False, incremental=True, project_root=tmp_path, outreach_templates_dir=templates)
+    run = lambda s: LeadGenerationPipeline(s).execute(enrich=False, output_dir=tmp_path / "out")  # noqa: E731
+
+    first = run(settings)
+    second = run(settings)
+
+    n = len(first.qualified_leads)
+    assert first.stats == {"qualify_skipped": 0, "outreach_skipped": 0}
+    assert second.stats == {"qualify_skipped": n, "outreach_skipped": n}
+    assert second.qualified_leads == first.qualified_leads
+    assert second.outreach == first.outreach
+
+    # Editing template copy invalidates outreach, but not scoring.
+    default = templates / "senior_care" / "default.txt"
+    default.write_text(default.read_text(encoding="utf-8").replace("Best,", "Cheers,"), encoding="utf-8")
+    load_template_set.cache_clear()
+    third = run(settings)
+    assert third.stats == {"qualify_skipped": n, "outreach_skipped": 0}
+    assert "Cheers," in third.outreach[0].body
+
+
+def test_changed_lead_inputs_are_recomputed(tmp_path: Path) -> None:
+    cache = IncrementalCache(tmp_path / "inc.sqlite3")
+    calls: list[int] = []
+
+    def compute(leads: list[EnrichedLead]) -> list[QualifiedLead]:
+        calls.append(len(leads))
+        return [score_lead(l) for l in leads]
+
+    leads = [EnrichedLead(company_name=f"Lead {i}", phone=f"555-{i}") for i in range(3)]
+    cache.run("qualify", "v1", leads, compute, QualifiedLead)
+    leads[1] = leads[1].model_copy(update={"email": "new@lead.test"})
+
+    rerun = cache.run("qualify", "v1", leads, compute, QualifiedLead)
+    bumped = cache.run("qualify", "v2", leads, compute, QualifiedLead)
+
+    assert calls == [3, 1, 3]
+    assert rerun.skipped == 2 and bumped.skipped == 0
+    assert rerun.outputs[1].email == "new@lead.test"
+
+
+def test_deadline_cut_sharded_run_caches_each_output_under_its_own_lead(tmp_path: Path) -> None:
+    cache = IncrementalCache(tmp_path / "inc.sqlite3")
+    leads = [QualifiedLead(company_name=f"Lead {i}", phone=f"555-{i}") for i in range(9)]
+    render = lambda l: OutreachMessage(company_name=l.company_name, subject=l.company_name, body="Hi")  # noqa: E731
+
+    def cut_short(misses: list[QualifiedLead]) -> list[OutreachMessage]:
+        # Three shards stopped by the deadline after 3, 1 and 2 of their leads.
+        shards = split_shards(misses, 3)
+        return merge_shards([[render(l) for l in shard[:n]] for shard, n in zip(shards, (3, 1, 2))])
+
+    first = cache.run("outreach", "v1", leads, cut_short, OutreachMessage)
+    second = cache.run("outreach", "v1", leads, lambda misses: [render(l) for l in misses], OutreachMessage)
+
+    assert [m.company_name for m in first.outputs] == ["Lead 0", "Lead 1", "Lead 2", "Lead 3"]
+    assert second.skipped == 4
+    assert [m.subject for m in second.outputs] == [l.company_name for l in leads]
+
+
+def test_outputs_that_dont_match_their_input_are_not_cached(tmp_path: Path) -> None:
+    cache = IncrementalCache(tmp_path / "inc.sqlite3")
+    leads = [QualifiedLead(company_name=f"Lead {i}") for i in range(3)]
+
+    def skewed(misses: list[QualifiedLead]) -> list[OutreachMessage]:
+        # Off by one: the first output belongs to the second lead.
+        return [OutreachMessage(company_name=l.company_name, subject="s", body="b") for l in misses[1:]]
+
+    assert cache.run("outreach", "v1", leads, skewed, OutreachMessage).outputs == []
+    assert cache.run("outreach", "v1", leads, skewed, OutreachMessage).skipped == 0
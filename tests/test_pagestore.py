@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from autoleadgen.pagestore import PageStore
+from autoleadgen.tools.firecrawl import _simple_fetch
+
+PAGE = b"<html><body><script>x()</script><p>Owner: Maria Lopez</p> care@sunrise.test</body></html>"
+
+
+@pytest.fixture
+def site():
+    hits: list[tuple[str, int]] = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802
+            if self.headers.get("If-None-Match") == '"v1"':
+                hits.append((self.path, 304))
+                self.send_response(304)
+                self.end_headers()
+                return
+            hits.append((self.path, 200))
+            self.send_response(200)
+            self.send_header("ETag", '"v1"')
+            self.send_header("Content-Length", str(len(PAGE)))
+            self.end_headers()
+            self.wfile.write(PAGE)
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", hits
+    server.shutdown()
+
+
+def test_fresh_pages_skip_network_and_stale_ones_revalidate(site, tmp_path: Path) -> None:
+    base, hits = site
+    store = PageStore(tmp_path, ttl_s=3600)
+
+    assert _simple_fetch(f"{base}/", store) == PAGE.decode()
+    assert _simple_fetch(f"{base}/", store) == PAGE.decode()
+    assert hits == [("/", 200)]
+
+    store.ttl_s = 0
+    assert _simple_fetch(f"{base}/", store) == PAGE.decode()
+    assert hits == [("/", 200), ("/", 304)]
+
+
+def test_identical_content_is_stored_once(site, tmp_path: Path) -> None:
+    base, _ = site
+    store = PageStore(tmp_path)
+    _simple_fetch(f"{base}/a", store)
+    _simple_fetch(f"{base}/b", store)
+
+    assert store.get(f"{base}/a").content_hash == store.get(f"{base}/b").content_hash  # type: ignore[union-attr]
+    assert len(list((tmp_path / "blobs").rglob("*.z"))) == 1
+    assert store.page_text(f"{base}/a") == "Owner: Maria Lopez care@sunrise.test"
+
+
+def test_broken_store_does_not_fail_the_fetch(site, tmp_path: Path, monkeypatch, caplog) -> None:
+    base, hits = site
+    store = PageStore(tmp_path)
+
+    def broken(*args, **kwargs):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(store, "get", broken)
+    monkeypatch.setattr(store, "put", broken)
+
+    assert _simple_fetch(f"{base}/", store) == PAGE.decode()
+    assert hits == [("/", 200)]
+    assert "database is locked" in caplog.text
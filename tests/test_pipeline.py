@@ -42,3 +42,21 @@ def test_pipeline_langgraph_runs_without_keys(tmp_path: Path) -> None:
 
     assert len(result.leads) > 0
     assert len(result.enriched_leads) == len(result.leads)
+
+
+def test_result_keeps_one_object_per_lead(tmp_path: Path) -> None:
+    for use_langgraph in (False, True):
+        out_dir = tmp_path / str(use_langgraph)
+        pipeline = LeadGenerationPipeline(
+            Settings(use_langgraph=use_langgraph, lead_source="synthetic", project_root=tmp_path)
+        )
+
+        result = pipeline.execute(limit=50, enrich=False, output_dir=out_dir)
+
+        assert all(e is q for e, q in zip(result.enriched_leads, result.qualified_leads, strict=True))
+        # The enriched CSV still has only the enriched columns.
+        header = next(out_dir.glob("enriched_leads_*.csv")).read_text(encoding="utf-8").splitlines()[0]
+        assert "email_verified" in header and "tier" not in header
+        # So does the result's own dump.
+        dumped = result.model_dump()["enriched_leads"][0]
+        assert "email_verified" in dumped and "tier" not in dumped
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import numpy as np
+
+from autoleadgen.agents import OutreachAgent
+from autoleadgen.config import Settings
+from autoleadgen.models import QualifiedLead
+from autoleadgen.retrieval import BM25Index, load_or_build_snippet_index
+
+DOCS = [
+    ("memory-care#0", "Memory care facility in Pasadena doubled tour bookings with local search ads."),
+    ("hospice#0", "A hospice network cut intake admin time by 40% using automated referrals."),
+    ("dental#0", "Dental clinic grew new patient visits through review campaigns."),
+]
+
+
+def test_search_batch_ranks_matching_documents_first() -> None:
+    index = BM25Index.build(DOCS)
+
+    hits = index.search_batch(["hospice intake referrals", "pasadena memory care", "unrelated zebra"], k=2)
+
+    assert [h.doc_id for h in hits[0]] == ["hospice#0"]
+    assert hits[1][0].doc_id == "memory-care#0"
+    assert hits[1][0].text == DOCS[0][1]
+    assert hits[2] == []
+
+
+def test_saved_index_loads_memory_mapped_with_identical_results(tmp_path: Path) -> None:
+    built = BM25Index.build(DOCS)
+    built.save(tmp_path / "idx")
+
+    loaded = BM25Index.load(tmp_path / "idx")
+
+    assert isinstance(loaded._post_weight, np.memmap)
+    queries = ["memory care ads", "dental reviews", "hospice"]
+    assert loaded.search_batch(queries) == built.search_batch(queries)
+
+
+def test_groq_outreach_prompt_includes_retrieved_case_studies(tmp_path: Path, monkeypatch) -> None:
+    studies = tmp_path / "case_studies"
+    studies.mkdir()
+    (studies / "wins.md").write_text("\n\n".join(text for _, text in DOCS), encoding="utf-8")
+    prompts: list[str] = []
+
+    def fake_complete(self, *, system: str, user: str, temperature: float = 0.2) -> str:
+        prompts.append(user)
+        return '{"subject": "Hi", "body": "Hello"}'
+
+    monkeypatch.setattr("autoleadgen.llms.groq.GroqChat.complete", fake_complete)
+    settings = Settings(
+        outreach_llm="groq", groq_api_key="test", case_studies_dir=studies, project_root=tmp_path, rag_top_k=1
+    )
+
+    OutreachAgent(settings).generate([QualifiedLead(company_name="Sunrise Hospice", location="Pasadena")])
+
+    assert load_or_build_snippet_index(studies, settings.index_dir / "case_studies").doc_ids == [
+        "wins#0",
+        "wins#1",
+        "wins#2",
+    ]
+    assert "Relevant case studies" in prompts[0]
+    assert prompts[0].count("\n- ") == 1
+
+
+def test_snippet_index_rebuilds_when_sources_change(tmp_path: Path) -> None:
+    studies, index_dir = tmp_path / "case_studies", tmp_path / "idx"
+    studies.mkdir()
+    wins = studies / "wins.md"
+    wins.write_text("Hospice intake.", encoding="utf-8")
+    assert load_or_build_snippet_index(studies, index_dir).doc_ids == ["wins#0"]
+
+    # An older file copied in (mtime before the index) still counts.
+    (studies / "old.txt").write_text("Dental reviews.", encoding="utf-8")
+    os.utime(studies / "old.txt", (0, 0))
+    assert load_or_build_snippet_index(studies, index_dir).doc_ids == ["old#0", "wins#0"]
+
+    (studies / "old.txt").unlink()
+    assert load_or_build_snippet_index(studies, index_dir).doc_ids == ["wins#0"]
+
+    # Another directory with the same file names doesn't reuse the index.
+    other = tmp_path / "other"
+    other.mkdir()
+    (other / "wins.md").write_text("Memory care.\n\nPasadena ads.", encoding="utf-8")
+    os.utime(other / "wins.md", ns=(wins.stat().st_mtime_ns, wins.stat().st_mtime_ns))
+    assert load_or_build_snippet_index(other, index_dir).doc_ids == ["wins#0", "wins#1"]
+
+
+def test_rebuild_leaves_an_already_loaded_index_intact(tmp_path: Path) -> None:
+    studies, index_dir = tmp_path / "case_studies", tmp_path / "idx"
+    studies.mkdir()
+    (studies / "wins.md").write_text("Hospice intake doubled.", encoding="utf-8")
+    before = load_or_build_snippet_index(studies, index_dir)
+
+    (studies / "wins.md").write_text("Dental reviews tripled after the new landing page launched.", encoding="utf-8")
+    after = load_or_build_snippet_index(studies, index_dir)
+
+    assert before.text(0) == "Hospice intake doubled."
+    assert before.search("hospice", k=1)[0].doc_id == "wins#0"
+    assert after.text(0).startswith("Dental reviews")
+    # Only the current generation is left on disk.
+    assert len([p for p in index_dir.iterdir() if p.is_dir()]) == 1
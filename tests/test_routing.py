@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import time
+from dataclasses import replace
+from pathlib import Path
+
+from autoleadgen.agents import EnrichmentAgent
+from autoleadgen.config import Settings
+from autoleadgen.models import Lead
+from autoleadgen.routing import FETCH, FIRECRAWL, DomainOutcome, RoutingHistory, looks_js_rendered
+from autoleadgen.tools import firecrawl
+
+STATIC = "<html><body><h1>Sunrise Care</h1><p>Email office@sunrise-care.net for tours.</p></body></html>"
+SPA = '<html><body><div id="root"></div><script src="/app.js"></script></body></html>'
+FIRECRAWL_OK = {"success": True, "data": {"markdown": "Contact: hello@spa-care.net", "json": {}}}
+
+
+def _settings(tmp_path: Path) -> Settings:
+    return Settings(firecrawl_api_key="fc-test", use_page_store=False, project_root=tmp_path)
+
+
+def _patch(monkeypatch, pages: dict[str, str], *, fetch_s: float = 0.0) -> list[tuple[str, str]]:
+    calls: list[tuple[str, str]] = []
+
+    def fake_fetch(url: str, store=None) -> str | None:
+        calls.append((FETCH, url))
+        time.sleep(fetch_s)
+        return pages.get(url)
+
+    def fake_scrape(url: str, api_key: str, store=None) -> dict:
+        calls.append((FIRECRAWL, url))
+        return FIRECRAWL_OK
+
+    monkeypatch.setattr(firecrawl, "_simple_fetch", fake_fetch)
+    monkeypatch.setattr(firecrawl, "_firecrawl_scrape", fake_scrape)
+    return calls
+
+
+def test_static_site_resolves_without_firecrawl(monkeypatch, tmp_path: Path) -> None:
+    calls = _patch(monkeypatch, {"https://sunrise-care.net": STATIC}, fetch_s=0.1)
+    stats: dict = {}
+
+    [lead] = EnrichmentAgent(_settings(tmp_path)).enrich_batch(
+        [Lead(company_name="Sunrise Care", website="https://sunrise-care.net")], stats
+    )
+
+    assert calls == [(FETCH, "https://sunrise-care.net")]
+    assert lead.email == "office@sunrise-care.net" and lead.email_verified
+    assert stats["firecrawl_calls_avoided"] == 1
+    assert stats["est_cost_saved_usd"] == 0.005
+    # No Firecrawl call measured this run: the default 8s estimate minus the 0.1s fetch.
+    assert 7.8 <= stats["est_latency_saved_s"] <= 7.9
+
+
+def test_escalates_and_learns_js_rendered_domains(monkeypatch, tmp_path: Path) -> None:
+    calls = _patch(monkeypatch, {"https://spa-care.net": SPA})
+    agent = EnrichmentAgent(_settings(tmp_path))
+    leads = [Lead(company_name="SPA Care", website="https://spa-care.net")]
+
+    stats: dict = {}
+    [lead] = agent.enrich_batch(leads, stats)
+    assert calls == [(FETCH, "https://spa-care.net"), (FIRECRAWL, "https://spa-care.net")]
+    assert lead.email == "hello@spa-care.net"
+    assert stats["firecrawl_escalations"] == 1 and stats["firecrawl_calls_avoided"] == 0
+
+    # Next run remembers the domain needs a browser and skips the wasted fetch.
+    calls.clear()
+    stats = {}
+    agent.enrich_batch(leads, stats)
+    assert calls == [(FIRECRAWL, "https://spa-care.net")]
+    assert stats["firecrawl_direct"] == 1
+
+
+def test_firecrawl_routed_domains_are_reprobed_periodically(monkeypatch, tmp_path: Path) -> None:
+    calls = _patch(monkeypatch, {"https://spa-care.net": STATIC})  # the site has since gone static
+    history = RoutingHistory(tmp_path / "data" / "routing.sqlite3")
+    history.merge(
+        [DomainOutcome("spa-care.net", fetch_attempts=1, firecrawl_attempts=9, firecrawl_hits=9, js_rendered=True)]
+    )
+    agent = EnrichmentAgent(_settings(tmp_path))
+    leads = [Lead(company_name="SPA Care", website="https://spa-care.net")]
+
+    agent.enrich_batch(leads, {})
+    assert calls == [(FIRECRAWL, "https://spa-care.net")]
+
+    # The tenth Firecrawl attempt is replaced by a cheap fetch, which clears the JS flag.
+    calls.clear()
+    stats: dict = {}
+    [lead] = agent.enrich_batch(leads, stats)
+    assert calls == [(FETCH, "https://spa-care.net")]
+    assert lead.email == "office@sunrise-care.net"
+    assert stats["fetch_reprobes"] == 1 and stats["firecrawl_calls_avoided"] == 1
+    assert history.get("spa-care.net").js_rendered is False
+
+    calls.clear()
+    agent.enrich_batch(leads, {})
+    assert calls == [(FETCH, "https://spa-care.net")]
+
+
+def test_routing_disabled_keeps_firecrawl_first(monkeypatch, tmp_path: Path) -> None:
+    calls = _patch(monkeypatch, {"https://sunrise-care.net": STATIC})
+    settings = replace(_settings(tmp_path), enrich_routing=False)
+    stats: dict = {}
+
+    EnrichmentAgent(settings).enrich_batch([Lead(company_name="Sunrise", website="https://sunrise-care.net")], stats)
+
+    assert calls == [(FIRECRAWL, "https://sunrise-care.net")]
+    assert stats == {}
+
+
+def test_looks_js_rendered() -> None:
+    assert looks_js_rendered(SPA)
+    assert not looks_js_rendered(STATIC)
+    assert not looks_js_rendered(None)
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+from autoleadgen.agents.enrichment import BUDGET_EXHAUSTED_NOTE
+from autoleadgen.config import Settings
+from autoleadgen.deadline import RunBudget
+from autoleadgen.models import EnrichedLead, Lead, QualifiedLead
+from autoleadgen.pipeline import LeadGenerationPipeline
+from autoleadgen.scheduling import PRIORITIES, priority_order, run_prioritized
+from autoleadgen.tools import firecrawl
+from autoleadgen.utils import prescore_lead, score_lead
+
+
+def _lead(name: str, rating: float | None, reviews: int | None, website: str | None = "https://x.test") -> Lead:
+    return Lead(
+        company_name=name, phone="555", address="1 Main St", website=website, rating=rating, review_count=reviews
+    )
+
+
+def test_prescore_is_the_best_reachable_score() -> None:
+    lead = _lead("Sunrise", 4.5, 120)
+    best = score_lead(EnrichedLead(**{**lead.model_dump(), "email": "a@x.test", "email_verified": True}))
+
+    assert prescore_lead(lead) == best.quality_score
+    assert prescore_lead(_lead("No Site", 4.5, 120, website=None)) < best.quality_score
+
+
+def test_priority_order_ranks_by_priority_and_keeps_ties_stable() -> None:
+    items = [3, 9, 1, 9, 5]
+    assert priority_order(items, lambda x: (x,)) == [1, 3, 4, 0, 2]
+
+
+def test_strong_leads_outrank_each_other_past_the_score_cap() -> None:
+    leads = [_lead("Good", 4.5, 120), _lead("Best", 4.9, 400)]
+    assert prescore_lead(leads[0]) == prescore_lead(leads[1]) == 100
+    assert priority_order(leads, PRIORITIES["enrich"]) == [1, 0]
+
+
+def test_outreach_comes_out_best_first() -> None:
+    leads = [
+        QualifiedLead(company_name="Low", quality_score=40),
+        QualifiedLead(company_name="High", quality_score=90, email_verified=True),
+        QualifiedLead(company_name="Mid", quality_score=70),
+    ]
+    out = run_prioritized("outreach", leads, lambda ordered: [l.company_name for l in ordered])
+    assert out == ["High", "Mid", "Low"]
+
+
+def test_budget_limited_enrichment_spends_budget_on_promising_leads(monkeypatch, tmp_path: Path) -> None:
+    def slow_fetch(url: str, store=None) -> str:
+        time.sleep(0.15)
+        return f"<p>owner@{url.split('/')[2]}</p>"
+
+    monkeypatch.setattr(firecrawl, "_simple_fetch", slow_fetch)
+    # Scraper order puts the weak listings first.
+    leads = [_lead(f"Weak {i}", 1.0, 0, f"https://weak{i}.test") for i in range(6)] + [
+        _lead(f"Strong {i}", 4.8, 300, f"https://strong{i}.test") for i in range(3)
+    ]
+    settings = Settings(
+        prioritize=True,
+        enrich_concurrency=1,
+        use_page_store=False,
+        use_browser=False,
+        project_root=tmp_path,
+    )
+    pipeline = LeadGenerationPipeline(settings)
+    stats: dict = {}
+
+    enriched = pipeline._run_stage("enrich", leads, stats, RunBudget.start(None, {"enrich": 0.4}))
+
+    assert [e.company_name for e in enriched] == [l.company_name for l in leads]
+    done = {e.company_name for e in enriched if e.enrichment_notes != BUDGET_EXHAUSTED_NOTE}
+    assert done and done <= {"Strong 0", "Strong 1", "Strong 2"}
+    assert all(score_lead(e).tier == "High" for e in enriched if e.company_name in done)
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from autoleadgen.config import Settings
+from autoleadgen.models import EnrichedLead
+from autoleadgen.sharding import ProcessSharder, merge_shards, split_shards
+
+
+def _leads(n: int) -> list[EnrichedLead]:
+    return [
+        EnrichedLead(
+            company_name=f"Care Home {i}",
+            phone=f"(555) 010-{i:04d}" if i % 3 else None,
+            website=f"https://care{i}.example.net" if i % 2 else None,
+            rating=(i % 10) / 2,
+            review_count=i * 7,
+        )
+        for i in range(n)
+    ]
+
+
+def test_split_shards_deals_items_round_robin() -> None:
+    shards = split_shards(list(range(10)), 3)
+    # Priority-ordered input: every shard starts with one of the top items.
+    assert [list(s) for s in shards] == [[0, 3, 6, 9], [1, 4, 7], [2, 5, 8]]
+    assert merge_shards(shards) == list(range(10))
+    assert split_shards([1], 4) == [[1]]
+    # Shards cut short by a deadline merge to an in-order prefix, up to the first gap.
+    assert merge_shards([[0, 3], [1], [2, 5, 8]]) == [0, 1, 2, 3]
+    assert merge_shards([[0], [], [2]]) == [0]
+
+
+def test_sharded_stages_match_single_process_output() -> None:
+    settings = Settings()
+    leads = _leads(40)
+    inline = ProcessSharder(processes=1)
+    sharded = ProcessSharder(processes=3, min_shard_size=5)
+    try:
+        qualified = sharded.run("qualify", settings, leads)
+        assert qualified == inline.run("qualify", settings, leads)
+        assert sharded.run("outreach", settings, qualified) == inline.run("outreach", settings, qualified)
+    finally:
+        sharded.close()
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import io
+import json
+import zlib
+from pathlib import Path
+
+import pytest
+
+from autoleadgen.agents import OutreachAgent
+from autoleadgen.config import Settings
+from autoleadgen.models import OutreachMessage, QualifiedLead
+from autoleadgen.pipeline import LeadGenerationPipeline
+from autoleadgen.sink import JsonlSink, infer_compression
+
+
+def _lines(data: bytes) -> list[dict]:
+    return [json.loads(line) for line in data.decode("utf-8").splitlines()]
+
+
+def test_writes_one_tagged_object_per_record() -> None:
+    buf = io.BytesIO()
+    sink = JsonlSink(buf)
+
+    sink.write("qualified_lead", [QualifiedLead(company_name="Sunrise", tier="High", quality_score=90)])
+    sink.write("outreach", [OutreachMessage(company_name="Sunrise", subject="Hi", body="Hello")])
+
+    rows = _lines(buf.getvalue())
+    assert [r["record"] for r in rows] == ["qualified_lead", "outreach"]
+    assert rows[0]["tier"] == "High" and rows[1]["subject"] == "Hi"
+    assert sink.records == 2
+
+
+def test_gzip_output_is_readable_before_close() -> None:
+    buf = io.BytesIO()
+    sink = JsonlSink(buf, compression="gzip")
+    sink.write("qualified_lead", [QualifiedLead(company_name=f"Lead {i}") for i in range(3)])
+
+    # A consumer reading the stream mid-run sees every flushed record.
+    partial = zlib.decompressobj(16 + zlib.MAX_WBITS).decompress(buf.getvalue())
+    assert [r["company_name"] for r in _lines(partial)] == ["Lead 0", "Lead 1", "Lead 2"]
+
+    sink.write("outreach", [OutreachMessage(company_name="Lead 0", subject="s", body="b")])
+    sink.close()
+    assert len(_lines(zlib.decompress(buf.getvalue(), 16 + zlib.MAX_WBITS))) == 4
+
+
+def test_zstd_output_round_trips(tmp_path: Path) -> None:
+    zstandard = pytest.importorskip("zstandard")
+    path = tmp_path / "out.jsonl.zst"
+    assert infer_compression(path) == "zstd"
+
+    with JsonlSink.open(path) as sink:
+        sink.write("qualified_lead", [QualifiedLead(company_name="Sunrise")])
+
+    data = zstandard.ZstdDecompressor().stream_reader(path.open("rb")).read()
+    assert _lines(data)[0]["company_name"] == "Sunrise"
+
+
+def test_pipeline_streams_records_without_csvs(tmp_path: Path) -> None:
+    buf = io.BytesIO()
+    out_dir = tmp_path / "out"
+    pipeline = LeadGenerationPipeline(Settings(use_langgraph=False, project_root=tmp_path))
+
+    result = pipeline.execute(limit=5, enrich=False, output_dir=out_dir, sink=JsonlSink(buf), write_csv=False)
+
+    rows = _lines(buf.getvalue())
+    kinds = [r["record"] for r in rows]
+    assert kinds == ["qualified_lead"] * len(result.qualified_leads) + ["outreach"] * len(result.outreach)
+    assert not out_dir.exists()
+
+
+def test_outreach_streams_while_the_stage_runs(tmp_path: Path, monkeypatch) -> None:
+    events: list[str] = []
+    generate = OutreachAgent.generate
+
+    def tracking_generate(self, leads, **kwargs):
+        events.append(f"generate {len(leads)}")
+        return generate(self, leads, **kwargs)
+
+    class TrackingSink(JsonlSink):
+        def write(self, record, items):
+            n = super().write(record, items)
+            events.append(f"write {record} {n}")
+            return n
+
+    monkeypatch.setattr(OutreachAgent, "generate", tracking_generate)
+    settings = Settings(use_langgraph=False, lead_source="synthetic", output_batch_size=4, project_root=tmp_path)
+
+    LeadGenerationPipeline(settings).execute(
+        limit=10, enrich=False, sink=TrackingSink(io.BytesIO()), write_csv=False
+    )
+
+    outreach = [e for e in events if not e.startswith("write qualified_lead")]
+    assert outreach[:4] == ["generate 4", "write outreach 4", "generate 4", "write outreach 4"]
+    assert outreach[-1].startswith("write outreach")
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+# Cumulative `-X importtime` budget for `import autoleadgen.cli`, in microseconds.
+# Generous on purpose: the point is to catch a heavy dependency sneaking back
+# into the import path, not to benchmark the machine running the suite.
+CLI_IMPORT_BUDGET_US = int(os.getenv("AUTOLEADGEN_CLI_IMPORT_BUDGET_US", "150000"))
+
+HEAVY_MODULES = ("requests", "langgraph", "crewai", "pydantic", "autoleadgen.llms.groq")
+
+
+def _importtime(statement: str) -> dict[str, int]:
+    """Return {module: cumulative_us} for a fresh interpreter running `statement`."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:") :].split("|"))
+        if cumulative.isdigit():
+            timings[name] = int(cumulative)
+    return timings
+
+
+@pytest.mark.parametrize("statement", ["import autoleadgen", "import autoleadgen.cli"])
+def test_light_imports_skip_heavy_dependencies(statement: str) -> None:
+    loaded = _importtime(statement)
+    assert not [m for m in HEAVY_MODULES if m in loaded]
+
+
+def test_pipeline_import_defers_network_and_llm_clients() -> None:
+    loaded = _importtime("import autoleadgen.pipeline")
+    assert not [m for m in ("requests", "langgraph", "crewai", "autoleadgen.llms.groq") if m in loaded]
+
+
+def test_cli_import_within_budget() -> None:
+    loaded = _importtime("import autoleadgen.cli")
+    assert loaded["autoleadgen.cli"] <= CLI_IMPORT_BUDGET_US
+
+
+def test_lazy_exports_resolve_on_first_access() -> None:
+    import autoleadgen.agents as agents
+
+    assert agents.__all__ == ["EnrichmentAgent", "OutreachAgent", "QualificationAgent", "ScraperAgent"]
+    assert "OutreachAgent" in dir(agents)
+    assert agents.OutreachAgent is vars(agents)["OutreachAgent"]  # cached after the first access
+    with pytest.raises(AttributeError, match="Nope"):
+        agents.Nope  # noqa: B018
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import csv
+from pathlib import Path
+
+from autoleadgen.config import Settings
+from autoleadgen.models import Lead, QualifiedLead
+from autoleadgen.pipeline import LeadGenerationPipeline
+from autoleadgen.suppression import SuppressionIndex, contact_keys
+from autoleadgen.webfarm import FakeWebFarm
+
+DAY = 86400.0
+
+
+def test_contact_keys_normalize_email_domain_and_phone() -> None:
+    keys = contact_keys("Info@Sunrise-Care.com ", "https://www.sunrise-care.com/about", "+1 (555) 010-0001")
+    assert keys == {("email", "info@sunrise-care.com"), ("domain", "sunrise-care.com"), ("phone", "5550100001")}
+    # A free-mail domain identifies nobody.
+    assert contact_keys("owner@gmail.com") == {("email", "owner@gmail.com")}
+
+
+def test_shared_platform_pages_are_keyed_on_their_path() -> None:
+    assert contact_keys(website="https://www.facebook.com/SunriseHomeCare/") == {
+        ("domain", "facebook.com/sunrisehomecare")
+    }
+    assert contact_keys(website="https://m.facebook.com/GoldenYears") == {("domain", "m.facebook.com/goldenyears")}
+    assert contact_keys(website="sites.google.com/view/oak-meadow") == {("domain", "sites.google.com/view/oak-meadow")}
+    assert contact_keys(website="https://linktr.ee") == set()
+
+
+def test_any_matching_key_suppresses_within_cooldown(tmp_path: Path) -> None:
+    index = SuppressionIndex(tmp_path / "s.sqlite3", cooldown_s=30 * DAY)
+    index.record([Lead(company_name="Sunrise", website="sunrise-care.com", phone="555-010-0001")], at=100 * DAY)
+
+    candidates = [
+        Lead(company_name="Sunrise Annex", phone="(555) 010-0001"),
+        Lead(company_name="Sunrise West", website="http://sunrise-care.com/west"),
+        Lead(company_name="Sunrise", email="hello@sunrise-care.com"),
+        Lead(company_name="Golden Years", website="goldenyears.com", phone="555-999-0000"),
+    ]
+    assert index.suppressed(candidates, now=110 * DAY) == [True, True, True, False]
+    assert index.suppressed(candidates, now=131 * DAY) == [False, False, False, False]
+
+
+def test_import_outreach_csv_backfills_recipients(tmp_path: Path) -> None:
+    path = tmp_path / "outreach_20250101_000000.csv"
+    with path.open("w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=["body", "company_name", "subject", "to_email"])
+        w.writeheader()
+        w.writerow({"company_name": "Sunrise", "to_email": "info@sunrise-care.com", "subject": "s", "body": "b"})
+        w.writerow({"company_name": "No Email", "to_email": "", "subject": "s", "body": "b"})
+    index = SuppressionIndex(tmp_path / "s.sqlite3", cooldown_s=30 * DAY)
+
+    assert index.import_outreach_csv(path) == 2
+    assert index.suppressed([Lead(company_name="x", website="sunrise-care.com")]) == [True]
+
+
+def test_second_run_skips_leads_emailed_by_the_first(tmp_path: Path, monkeypatch) -> None:
+    settings = Settings(
+        use_langgraph=False,
+        use_browser=False,
+        lead_source="synthetic",
+        suppress_contacted=True,
+        project_root=tmp_path,
+    )
+    pipeline = LeadGenerationPipeline(settings)
+
+    with FakeWebFarm(seed=1, slow_s=0.1) as farm:
+        for key, value in farm.proxy_env().items():
+            monkeypatch.setenv(key, value)
+        first = pipeline.execute(limit=40, output_dir=tmp_path / "out")
+        second = pipeline.execute(limit=40, output_dir=tmp_path / "out")
+
+    emailed = {m.company_name for m in first.outreach if m.to_email}
+    assert emailed and first.stats["suppressed"] == 0
+    assert second.stats["suppressed"] >= len(emailed)
+    assert not emailed & {l.company_name for l in second.qualified_leads}
+
+
+def test_outreach_rechecks_found_emails_and_records_only_emailed_leads(tmp_path: Path) -> None:
+    settings = Settings(use_langgraph=False, suppress_contacted=True, project_root=tmp_path)
+    pipeline = LeadGenerationPipeline(settings)
+    index = SuppressionIndex(settings.data_dir / "suppression.sqlite3", cooldown_s=90 * DAY)
+    # Contacted before under an address only enrichment finds (no website or phone on the listing).
+    index.record([Lead(company_name="Sunrise", email="owner@sunrise-care.com")])
+    leads = [
+        QualifiedLead(company_name="Sunrise", email="owner@sunrise-care.com"),
+        QualifiedLead(company_name="Evergreen", email="hi@evergreen-a.com", phone="555-010-0001"),
+        # Same name, different business, no email: gets no sendable message.
+        QualifiedLead(company_name="Evergreen", phone="555-010-0002"),
+    ]
+    stats: dict = {}
+
+    messages = pipeline._run_outreach(leads, stats, None)
+
+    assert [m.to_email for m in messages] == ["hi@evergreen-a.com", None]
+    assert stats["suppressed"] == 1
+    assert index.suppressed([Lead(company_name="x", phone="555-010-0001")]) == [True]
+    assert index.suppressed([Lead(company_name="x", phone="555-010-0002")]) == [False]
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from autoleadgen.config import Settings
+from autoleadgen.pipeline import LeadGenerationPipeline
+from autoleadgen.synthetic import generate_leads
+from autoleadgen.tools.firecrawl import _simple_fetch
+from autoleadgen.utils import dedupe_by_company_and_phone
+from autoleadgen.webfarm import FakeWebFarm
+
+
+def test_generation_is_deterministic_per_seed() -> None:
+    assert generate_leads(200, seed=7) == generate_leads(200, seed=7)
+    assert generate_leads(200, seed=7) != generate_leads(200, seed=8)
+
+
+def test_generated_leads_look_like_directory_data() -> None:
+    leads = generate_leads(5000, seed=1)
+    unique = dedupe_by_company_and_phone(leads)
+
+    assert 0.04 < 1 - len(unique) / len(leads) < 0.12
+    assert 0.05 < sum(l.phone is None for l in leads) / len(leads) < 0.15
+    assert 0.15 < sum(l.website is None for l in leads) / len(leads) < 0.3
+    formats = Counter(("(" in p, "-" in p, "." in p, p.startswith("+1")) for l in leads if (p := l.phone))
+    assert len(formats) >= 4
+    # Chains share one domain across their locations.
+    assert any(l.website and "/locations/" in l.website for l in leads)
+
+
+@pytest.fixture
+def farm(monkeypatch):
+    with FakeWebFarm(seed=3) as farm:
+        for key, value in farm.proxy_env().items():
+            monkeypatch.setenv(key, value)
+        yield farm
+
+
+def test_farm_serves_every_host_offline(farm: FakeWebFarm) -> None:
+    hosts = [f"site-{i}.test" for i in range(40)]
+    kinds = {farm.page_kind(h) for h in hosts}
+    pages = {h: _simple_fetch(f"http://{h}/") for h in hosts if farm.page_kind(h) != "slow"}
+
+    assert {"email", "no_email", "spa"} <= kinds
+    assert all((pages[h] is None) == (farm.page_kind(h) in ("not_found", "error")) for h in pages)
+    assert farm.requests == len(pages)
+
+
+def test_execute_end_to_end_against_farm(farm: FakeWebFarm, tmp_path: Path) -> None:
+    farm.slow_s = 0.2
+    settings = Settings(
+        lead_source="synthetic",
+        use_langgraph=False,
+        use_browser=False,
+        enrich_concurrency=16,
+        project_root=tmp_path,
+    )
+    pipeline = LeadGenerationPipeline(settings)
+
+    try:
+        result = pipeline.execute(limit=300, output_dir=tmp_path / "out")
+    finally:
+        pipeline.close()
+
+    assert len(result.leads) == 300
+    assert len(result.enriched_leads) < 300  # duplicates removed before enrichment
+    found = [l for l in result.enriched_leads if l.email and not l.email.startswith(("contact@", "hello@", "admin@"))]
+    assert len(found) > len(result.enriched_leads) // 4
+    assert len(result.outreach) == len(result.qualified_leads)
+    assert sorted(p.name.split("_")[0] for p in (tmp_path / "out").iterdir()) == [
+        "enriched", "leads", "outreach", "qualified"
+    ]
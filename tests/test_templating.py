@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from autoleadgen.agents import OutreachAgent
+from autoleadgen.config import Settings
+from autoleadgen.models import QualifiedLead
+from autoleadgen.templating import compile_template, load_template_set
+
+
+def test_compile_template_precomputes_segments() -> None:
+    t = compile_template("Hi {owner_name|there}, {{literal}} for {company_name}.")
+    assert t.literals == ("Hi ", ", {literal} for ", ".")
+    assert t.render({"owner_name": None, "company_name": "Acme"}) == "Hi there, {literal} for Acme."
+    assert t.render({"owner_name": "Ana", "company_name": "Acme"}) == "Hi Ana, {literal} for Acme."
+
+    with pytest.raises(ValueError):
+        compile_template("{not_a_field}")
+
+
+def test_templates_selected_by_tier_then_source_then_default(tmp_path: Path) -> None:
+    vertical = tmp_path / "dental"
+    vertical.mkdir()
+    (vertical / "default.txt").write_text("Subject: Hello {company_name}\n\nDefault body\n")
+    (vertical / "tier-high.txt").write_text("Subject: Priority {company_name}\n\nHigh body\n")
+    (vertical / "source-yelp.txt").write_text("Subject: Saw you on Yelp\n\nYelp body\n")
+    agent = OutreachAgent(Settings(outreach_vertical="dental", outreach_templates_dir=tmp_path))
+
+    messages = agent.generate(
+        [
+            QualifiedLead(company_name="A", tier="High", source="yelp"),
+            QualifiedLead(company_name="B", tier="Low", source="yelp"),
+            QualifiedLead(company_name="C", tier="Low", source="mock", email="c@c.test"),
+        ]
+    )
+
+    assert [(m.subject, m.body) for m in messages] == [
+        ("Priority A", "High body"),
+        ("Saw you on Yelp", "Yelp body"),
+        ("Hello C", "Default body"),
+    ]
+    assert messages[2].to_email == "c@c.test"
+    assert load_template_set(vertical) is load_template_set(vertical)
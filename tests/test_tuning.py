@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import io
+import json
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from autoleadgen import cli, pipeline
+from autoleadgen.agents import OutreachAgent
+from autoleadgen.config import Settings, load_settings, parse_host_limits
+from autoleadgen.deadline import Deadline
+from autoleadgen.models import QualifiedLead
+from autoleadgen.sink import JsonlSink
+from autoleadgen.tools import http
+
+
+def _write_config(tmp_path: Path, text: str) -> Path:
+    path = tmp_path / "autoleadgen.toml"
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_config_file_then_env_then_flags(tmp_path: Path, monkeypatch, capsys) -> None:
+    config = _write_config(
+        tmp_path,
+        """
+processes = 4
+
+[execution]
+enrich_concurrency = 32
+host_limits = { "api.firecrawl.dev" = 4 }
+
+[outreach]
+outreach_llm = "groq"
+outreach_concurrency = 3
+""",
+    )
+    monkeypatch.setenv("ENRICH_CONCURRENCY", "16")
+
+    settings = load_settings(config)
+    assert (settings.processes, settings.enrich_concurrency) == (4, 16)
+    assert settings.host_limits == (("api.firecrawl.dev", 4),)
+
+    argv = ["--config", str(config), "--outreach-concurrency", "6", "--host-limit", "API.Groq.com=2"]
+    argv += ["--concurrency", "3"]
+    assert cli.main([*argv, "--dry-run", "--json"]) == 0
+    plan = json.loads(capsys.readouterr().out)
+    assert plan["processes"] == 4
+    assert plan["stages"]["enrich"]["threads_per_process"] == 16
+    assert plan["stages"]["outreach"]["llm_concurrency"] == 6
+    assert plan["http"]["host_limits"] == {"api.firecrawl.dev": 4, "api.groq.com": 2}
+    assert plan["worker"]["concurrency"] == 3
+
+
+@pytest.mark.parametrize("installed", [False, True])
+def test_dry_run_plan_reflects_queue_flag_and_playwright(
+    tmp_path: Path, monkeypatch, capsys, installed: bool
+) -> None:
+    monkeypatch.setattr(pipeline, "playwright_available", lambda: installed)
+    config = _write_config(tmp_path, "[execution]\nuse_browser = true\nbrowser_concurrency = 3\n")
+    queue = tmp_path / "shared" / "jobs.sqlite3"
+    assert cli.main(["--config", str(config), "--queue", str(queue), "--dry-run", "--json"]) == 0
+    plan = json.loads(capsys.readouterr().out)
+    assert plan["stages"]["enrich"]["browser_pages"] == (3 if installed else 0)
+    assert plan["worker"]["queue"] == str(queue)
+
+
+def test_config_file_rejects_unknown_settings(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="enrich_concurency"):
+        load_settings(_write_config(tmp_path, "[execution]\nenrich_concurency = 8\n"))
+    with pytest.raises(ValueError):
+        parse_host_limits("api.firecrawl.dev:4")
+
+
+@pytest.mark.parametrize(
+    "text, key",
+    [
+        ('processes = "4"', "processes"),
+        ("[execution]\nuse_browser = 1", "use_browser"),
+        ("rate_limit_per_s = true", "rate_limit_per_s"),
+        ('[execution]\nhost_limits = { "api.firecrawl.dev" = "four" }', "api.firecrawl.dev"),
+    ],
+)
+def test_config_file_values_must_match_setting_types(tmp_path: Path, text: str, key: str) -> None:
+    with pytest.raises(ValueError, match=key):
+        load_settings(_write_config(tmp_path, text + "\n"))
+
+
+def test_config_file_coerces_compatible_values(tmp_path: Path, monkeypatch) -> None:
+    config = _write_config(tmp_path, f'contact_cooldown_days = 30\ncase_studies_dir = "{tmp_path}"\n')
+    settings = load_settings(config)
+    assert settings.contact_cooldown_days == 30.0 and isinstance(settings.contact_cooldown_days, float)
+    assert settings.case_studies_dir == tmp_path
+
+    # A malformed HOST_LIMITS falls back like any other unparsable env value.
+    monkeypatch.setenv("HOST_LIMITS", "foo=abc")
+    assert load_settings().host_limits == ()
+    with pytest.raises(ValueError, match="'foo'"):
+        parse_host_limits("foo=abc")
+
+
+def test_host_limit_caps_in_flight_requests(monkeypatch) -> None:
+    active = peak = 0
+    lock = threading.Lock()
+
+    class Session:
+        def request(self, method: str, url: str, **kwargs):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+
+    monkeypatch.setattr(http, "get_session", lambda: Session())
+    http.set_host_limits(None, [("slow.test", 2)])
+    try:
+        threads = [threading.Thread(target=http.get, args=("http://slow.test/",)) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert peak == 2
+
+        # A request can't wait for a slot past its deadline.
+        slot = http._host_slot("http://slow.test/")
+        assert slot is not None
+        slot.acquire()
+        slot.acquire()
+        with http.deadline(time.time() + 0.05), pytest.raises(TimeoutError):
+            http.get("http://slow.test/")
+        slot.release()
+        slot.release()
+    finally:
+        http.set_host_limits(None)
+
+
+def test_rate_limit_wait_respects_the_deadline(monkeypatch) -> None:
+    calls: list[str] = []
+
+    class Session:
+        def request(self, method: str, url: str, **kwargs):
+            calls.append(url)
+
+    monkeypatch.setattr(http, "get_session", lambda: Session())
+    http.set_rate_limit(1, burst=1)
+    try:
+        http.get("http://a.test/")
+        started = time.monotonic()
+        # The next token is a second away, past a 0.1s deadline: fail now rather than sleep.
+        with http.deadline(time.time() + 0.1), pytest.raises(TimeoutError):
+            http.get("http://b.test/")
+        assert time.monotonic() - started < 0.05
+        assert calls == ["http://a.test/"]
+    finally:
+        http.set_rate_limit(None)
+
+
+def test_sink_flushes_in_batches() -> None:
+    class Counting(io.BytesIO):
+        writes = 0
+
+        def write(self, data: bytes) -> int:  # type: ignore[override]
+            Counting.writes += 1
+            return super().write(data)
+
+    buf = Counting()
+    sink = JsonlSink(buf, batch_size=4)
+
+    assert sink.write("qualified_lead", [QualifiedLead(company_name=f"Lead {i}") for i in range(10)]) == 10
+    assert Counting.writes == 3
+    assert len(buf.getvalue().splitlines()) == 10
+
+
+def test_concurrent_llm_outreach_keeps_order_and_deadline_prefix(monkeypatch) -> None:
+    def fake_complete(self, *, system: str, user: str, temperature: float = 0.2) -> str:
+        company = user.split("Company: ", 1)[1].split("\n", 1)[0]
+        time.sleep(0.03 if company == "Lead 7" else 0.01)
+        return json.dumps({"subject": company, "body": "Hello"})
+
+    monkeypatch.setattr("autoleadgen.llms.groq.GroqChat.complete", fake_complete)
+    agent = OutreachAgent(Settings(outreach_llm="groq", groq_api_key="test", outreach_concurrency=4))
+    leads = [QualifiedLead(company_name=f"Lead {i}") for i in range(12)]
+
+    assert [m.subject for m in agent.generate(leads)] == [l.company_name for l in leads]
+    messages = agent.generate(leads, deadline=Deadline.after(0.025))
+    assert [m.subject for m in messages] == [l.company_name for l in leads[: len(messages)]]
+    assert len(messages) < len(leads)
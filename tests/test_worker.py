@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+from pathlib import Path
+
+from autoleadgen.config import Settings
+from autoleadgen.pipeline import LeadGenerationPipeline
+from autoleadgen.worker import JobQueue, Worker, _now
+
+
+def test_worker_drains_queue_and_writes_per_job_results(tmp_path: Path) -> None:
+    pipeline = LeadGenerationPipeline(Settings(use_langgraph=True, project_root=tmp_path))
+    queue = JobQueue(tmp_path / "jobs.sqlite3")
+    first = queue.enqueue(query="nursing home", location="Austin, TX", limit=5, enrich=False)
+    second = queue.enqueue(location="Boston, MA", enrich=False, generate_campaigns=False)
+
+    processed = Worker(pipeline=pipeline, queue=queue, concurrency=2, poll_interval_s=0.05).run(drain=True)
+
+    assert processed == 2
+    assert queue.counts() == {"done": 2}
+    for job_id in (first, second):
+        job = queue.get(job_id)
+        assert job is not None and job.summary is not None
+        summary = json.loads((tmp_path / "data" / "jobs" / str(job_id) / "summary.json").read_text())
+        assert summary["leads"] == job.summary["leads"] > 0
+    assert queue.get(second).summary["outreach"] == 0  # type: ignore[union-attr]
+
+
+def test_claim_never_hands_out_the_same_job_twice(tmp_path: Path) -> None:
+    queue = JobQueue(tmp_path / "jobs.sqlite3")
+    ids = {queue.enqueue(location=f"City {i}") for i in range(3)}
+
+    claimed = [queue.claim() for _ in range(4)]
+
+    assert claimed[-1] is None
+    assert {j.id for j in claimed if j is not None} == ids
+
+
+def test_jobs_of_a_dead_worker_are_requeued_when_their_lease_lapses(tmp_path: Path) -> None:
+    queue = JobQueue(tmp_path / "jobs.sqlite3", lease_s=60)
+    job_id = queue.enqueue(location="Austin, TX")
+    assert queue.claim().id == job_id  # type: ignore[union-attr]
+    assert queue.claim() is None
+
+    with sqlite3.connect(queue.path) as conn:
+        conn.execute("UPDATE jobs SET started_at = ?, heartbeat_at = ?", (_now(-120), _now(-120)))
+    queue.heartbeat([job_id])  # a live worker renews in time
+    assert queue.claim() is None
+
+    with sqlite3.connect(queue.path) as conn:
+        conn.execute("UPDATE jobs SET heartbeat_at = ?", (_now(-61),))
+    requeued = queue.claim()
+    assert requeued is not None and requeued.id == job_id
+    assert queue.counts() == {"running": 1}